@@ -0,0 +1,151 @@
+import heapq
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+
+# All-pairs shortest paths for the Dijkstra visualizer. Dense graphs use
+# Floyd-Warshall with one whole-matrix NumPy update per pivot; sparse ones
+# run a heap Dijkstra from every source, with the sources split over a
+# process pool. Both give (dist, pred) as V x V matrices: dist[s, t] is the
+# distance from s to t (inf when unreachable) and pred[s, t] the vertex
+# before t on that path (-1 for t == s or no path). Dijkstra rows break ties
+# by (dist, id) like the step engine, so row s equals the dist/prev a full
+# run from s ends with.
+
+APSP_MAX_VERTICES = int(os.environ.get("APSP_MAX_VERTICES", "4000"))
+APSP_WORKERS = int(os.environ.get("APSP_WORKERS", "0")) or (os.cpu_count() or 1)
+METHODS = ["Auto", "Floyd-Warshall", "Dijkstra"]
+
+
+class APSPError(ValueError):
+    pass
+
+
+def floyd_warshall(g, progress=None):
+    n = len(g)
+    D = np.full((n, n), np.inf)
+    src = np.repeat(np.arange(n), np.diff(g.offsets))
+    w = np.ones(g.n_edges) if g.weights is None else g.weights
+    np.minimum.at(D, (src, g.indices), w)
+    pred = np.where(np.isfinite(D), np.arange(n, dtype=np.int32)[:, None], -1).astype(np.int32)
+    np.fill_diagonal(D, 0.0)
+    np.fill_diagonal(pred, -1)
+    every = max(1, n // 50)
+    for k in range(n):
+        cand = D[:, k, None] + D[None, k, :]
+        better = cand < D
+        np.copyto(D, cand, where=better)
+        np.copyto(pred, np.broadcast_to(pred[k].copy(), (n, n)), where=better)
+        if progress is not None and k % every == 0:
+            progress(k / n)
+    return D, pred
+
+
+# CSR arrays as lists, set once per worker process by the pool initializer.
+_GRAPH = None
+
+
+def _init(offsets, indices, weights):
+    global _GRAPH
+    n_arcs = len(indices)
+    _GRAPH = (offsets.tolist(), indices.tolist(), [1.0] * n_arcs if weights is None else weights.tolist())
+
+
+def _dijkstra_rows(sources):
+    off, idx, wt = _GRAPH
+    n = len(off) - 1
+    D = np.full((len(sources), n), np.inf)
+    P = np.full((len(sources), n), -1, dtype=np.int32)
+    for r, s in enumerate(sources):
+        dist = [math.inf] * n
+        prev = [-1] * n
+        done = [False] * n
+        dist[s] = 0.0
+        heap = [(0.0, s)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if done[u]:
+                continue
+            done[u] = True
+            for j in range(off[u], off[u + 1]):
+                v = idx[j]
+                if done[v]:
+                    continue
+                c = d + wt[j]
+                if c < dist[v]:
+                    dist[v] = c
+                    prev[v] = u
+                    heapq.heappush(heap, (c, v))
+        D[r] = dist
+        P[r] = prev
+    return D, P
+
+
+def dijkstra_all(g, workers=APSP_WORKERS, progress=None):
+    n = len(g)
+    D = np.empty((n, n))
+    P = np.empty((n, n), dtype=np.int32)
+    chunks = [c.tolist() for c in np.array_split(np.arange(n), max(1, min(n, 4 * max(1, workers))))]
+    args = (g.offsets, g.indices, g.weights)
+
+    def collect(results):
+        for i, (c, (d, p)) in enumerate(zip(chunks, results)):
+            if c:
+                D[c[0]:c[-1] + 1] = d
+                P[c[0]:c[-1] + 1] = p
+            if progress is not None:
+                progress((i + 1) / len(chunks))
+
+    if workers > 1 and n >= 64:
+        try:
+            with ProcessPoolExecutor(workers, initializer=_init, initargs=args) as pool:
+                collect(pool.map(_dijkstra_rows, chunks))
+            return D, P
+        except (OSError, BrokenProcessPool):
+            pass
+    _init(*args)
+    collect(map(_dijkstra_rows, chunks))
+    return D, P
+
+
+# Rough cost of each method in seconds: n^3 NumPy element updates against a
+# Python heap Dijkstra per source shared by the workers.
+def choose_method(g, workers=APSP_WORKERS):
+    n, m = len(g), g.n_edges
+    fw = n ** 3 * 5.5e-9
+    dj = n * (m + n * math.log2(n + 1)) * 1.5e-7 / max(1, workers)
+    return "Floyd-Warshall" if fw <= dj else "Dijkstra"
+
+
+# (dist, pred, info) for g; info has the method used, seconds and bytes.
+# progress, if given, is called with the fraction done.
+def all_pairs(g, method="Auto", workers=APSP_WORKERS, progress=None):
+    n = len(g)
+    if n > APSP_MAX_VERTICES:
+        raise APSPError(f"{n:,} vertices is above the all-pairs limit of {APSP_MAX_VERTICES:,} (APSP_MAX_VERTICES)")
+    if method == "Auto":
+        method = choose_method(g, workers)
+    if method not in METHODS[1:]:
+        raise APSPError(f"unknown method {method!r}")
+    t = time.perf_counter()
+    if method == "Floyd-Warshall":
+        D, P = floyd_warshall(g, progress)
+    else:
+        D, P = dijkstra_all(g, workers, progress)
+    info = {"method": method, "seconds": time.perf_counter() - t, "bytes": D.nbytes + P.nbytes}
+    return D, P, info
+
+
+# Vertex ids on the shortest s -> t path, [] when t is unreachable.
+def shortest_path(pred, s, t):
+    if s == t:
+        return [s]
+    if pred[s, t] < 0:
+        return []
+    path = [t]
+    while path[-1] != s and len(path) <= len(pred):
+        path.append(int(pred[s, path[-1]]))
+    return path[::-1]
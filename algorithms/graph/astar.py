@@ -0,0 +1,321 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from algorithms.graph.dijkstra import DijkstraVisualizer
+from algorithms.graph.engine import (
+    HEURISTICS, bidi_path, compare_searches, heuristic, init_astar, init_bidijkstra, intern,
+    run_astar, run_bidijkstra, step_astar, step_bidijkstra, tree_path,
+)
+from components.graphStyle import GRAPH_LAYOUT_CONFIG
+from components.trace_cache import trace_key
+
+# Goal-directed searches on the Dijkstra visualizer's input, drawing and
+# controls: A* and bidirectional Dijkstra from the start vertex to a goal
+# vertex. Both stop once the goal's distance is settled, and a comparison
+# panel runs plain Dijkstra, A* and bidirectional Dijkstra on the same graph
+# and query to count vertices expanded, edges relaxed and heap operations
+# side by side.
+
+
+def _num(a, at):
+    return [f"{a[i]:.2f}" if i >= 0 and np.isfinite(a[i]) else "∞" for i in at]
+
+
+def _name(names, prev, at):
+    return [names[prev[i]] if i >= 0 and prev[i] >= 0 else "-" for i in at]
+
+
+class _GoalSearchVisualizer(DijkstraVisualizer):
+    def __init__(self):
+        super().__init__()
+        self._h = None
+
+    def _goal(self, V):
+        g = intern(V).get(st.session_state.get(f"{self.ns}_goal_sel"))
+        return g if g is not None else (len(V) - 1 if V else None)
+
+    def _kind(self):
+        return st.session_state.get(f"{self.ns}_heuristic", HEURISTICS[0])
+
+    # Vertex coordinates for the heuristic: the generator's own (grid cells,
+    # geometric points) when it has them, else the drawn layout; None above
+    # the draw limit, where no layout is computed.
+    def _coords(self, V, G):
+        s = st.session_state
+        gen = s.get(f"{self.ns}_generated")
+        if s.get("sb_src") == "Generate" and gen and gen[1] and gen[1][2].get("coords") is not None:
+            return gen[1][2]["coords"], "generator coordinates"
+        if len(V) <= GRAPH_LAYOUT_CONFIG["max_draw_vertices"]:
+            return self._layout(V, G), "drawn layout"
+        return None, None
+
+    # Goal vertex and heuristic; h is kept per graph, goal and kind.
+    def _target_controls(self, V, G):
+        s = st.session_state
+        if s.get(f"{self.ns}_goal_sel") not in V:
+            s[f"{self.ns}_goal_sel"] = V[-1]
+        c1, c2 = st.columns(2)
+        c1.selectbox("Goal vertex", V, key=f"{self.ns}_goal_sel")
+        c2.selectbox("Heuristic", HEURISTICS, key=f"{self.ns}_heuristic")
+        goal, kind = self._goal(V), self._kind()
+        key = trace_key("h", s.get(f"{self.ns}_gkey"), G.offsets, G.indices, G.weights, goal, kind)
+        cached = s.get(f"{self.ns}_h")
+        if cached is None or cached[0] != key:
+            P, source = self._coords(V, G) if kind != "Zero" else (None, "")
+            cached = s[f"{self.ns}_h"] = (key, heuristic(P, goal, kind, G), source)
+        self._h, source = cached[1], cached[2]
+        if source is None:
+            st.caption(f"No coordinates above {GRAPH_LAYOUT_CONFIG['max_draw_vertices']:,} vertices; h = 0")
+        elif source:
+            st.caption(f"h = {kind} distance on the {source}, scaled to stay a lower bound")
+
+    # Vertices of the path found, once the search has finished.
+    def _path(self):
+        return []
+
+    # Search tree so far; the path found once finished.
+    def _tree(self):
+        path = self._path() if st.session_state[f"{self.ns}_fin"] else []
+        if path:
+            return np.stack([path[:-1], path[1:]], 1)
+        return self._search_tree()
+
+    def _search_tree(self):
+        return super()._tree()
+
+    def _path_html(self, path, limit=40):
+        names = st.session_state[f"{self.ns}_names"]
+        shown = [f'<span class="vertex">{names[v]}</span>' for v in path]
+        if len(shown) > limit:
+            shown = shown[:limit // 2] + [f"… {len(shown) - limit} more …"] + shown[-(limit // 2):]
+        return " → ".join(shown)
+
+    def _relax_html(self, u, du, relax, d="d"):
+        names = st.session_state[f"{self.ns}_names"]
+        if not relax:
+            return ['<div class="action">No neighbors to relax</div>']
+        out = ['<div style="margin-top:0.5rem">Relaxation:</div>']
+        for r in relax:
+            v = names[r[0]]
+            if len(r) == 1:
+                out.append(f'<div style="color:var(--text-muted);margin-left:1rem">→ {v} already expanded</div>')
+                continue
+            w, old, cand = r[1], r[2], r[3]
+            old_s = "∞" if not np.isfinite(old) else f"{old:.2f}"
+            if cand < old:
+                out.append(f'<div class="action" style="margin-left:1rem">{d}[{v}] > {d}[{u}] + w({u},{v}) ⇒ {old_s} > {du:.2f} + {w:.2f} = {cand:.2f} ✓ update</div>')
+            else:
+                out.append(f'<div class="action" style="margin-left:1rem;color:var(--text-muted)">{d}[{v}] ≤ {d}[{u}] + w({u},{v}) ⇒ {old_s} ≤ {cand:.2f} (no update)</div>')
+        return out
+
+    def _stats_pills(self):
+        stats = st.session_state[f"{self.ns}_stats"]
+        st.markdown(f'''
+            <div class="bfs-meta">
+                <div class="pill"><div class="h">Expanded</div><div class="v">{stats["expanded"]:,}</div></div>
+                <div class="pill"><div class="h">Relaxed</div><div class="v">{stats["relaxed"]:,}</div></div>
+                <div class="pill"><div class="h">Pushes</div><div class="v">{stats["pushes"]:,}</div></div>
+                <div class="pill"><div class="h">Pops</div><div class="v">{stats["pops"]:,}</div></div>
+            </div>
+            ''', unsafe_allow_html=True)
+
+    # Dijkstra, A* and bidirectional Dijkstra run from the start to the goal
+    # on the same graph, counted side by side; kept per graph and query.
+    def _compare_panel(self, V, G):
+        s = st.session_state
+        st.markdown('<div class="frame-title">Search Comparison</div>', unsafe_allow_html=True)
+        if not st.checkbox("Compare with Dijkstra", value=True, key=f"{self.ns}_compare_on"):
+            return
+        query = (intern(V).get(s.get(f"{self.ns}_start")), self._goal(V), self._kind())
+        key = trace_key("compare", s.get(f"{self.ns}_h", (None,))[0], G.offsets, G.indices, G.weights, query)
+        cached = s.get(f"{self.ns}_compare")
+        if cached is None or cached[0] != key:
+            with st.spinner("Running Dijkstra, A* and bidirectional Dijkstra to the goal"):
+                res = compare_searches(G, query[0], query[1], self._h)
+            cached = s[f"{self.ns}_compare"] = (key, res)
+        res = cached[1]
+        rows = {
+            "Nodes expanded": "expanded", "Edges relaxed": "relaxed",
+            "Heap pushes": "pushes", "Heap pops": "pops",
+        }
+        df = pd.DataFrame({
+            name: [f"{r[k]:,}" for k in rows.values()]
+            + [f'{r["pushes"] + r["pops"]:,}', f'{r["dist"]:.2f}' if np.isfinite(r["dist"]) else "∞", f'{r["seconds"]:.3f}s']
+            for name, r in res.items()
+        }, index=list(rows) + ["Heap operations", "Distance", "Time"])
+        st.dataframe(df, use_container_width=True)
+        base = max(res["Dijkstra"]["expanded"], 1)
+        st.caption(
+            f"A* ({query[2]}) expands {res['A*']['expanded'] / base:.0%} and bidirectional Dijkstra "
+            f"{res['Bidirectional']['expanded'] / base:.0%} of the vertices Dijkstra does"
+        )
+
+
+class AStarVisualizer(_GoalSearchVisualizer):
+    KEYS = ("visited", "dist", "f", "prev", "heap", "hpos", "goal", "current", "order", "edges", "stats", "ev", "fin", "step")
+    TITLE = "A* State"
+
+    def __init__(self):
+        super().__init__()
+        self.ns = "astar"
+
+    def _new_state(self, V, start_v):
+        return init_astar(len(V), intern(V).get(start_v), self._goal(V))
+
+    def _step(self, state, G):
+        step_astar(state, G, self._h)
+
+    def _run_all(self, V, G, start):
+        return run_astar(G, start, self._goal(V), self._h)
+
+    def _run_key(self, V):
+        return (self._goal(V), self._kind())
+
+    def _path(self):
+        s = st.session_state
+        goal = s[f"{self.ns}_goal"]
+        if goal is None or not s[f"{self.ns}_visited"][goal]:
+            return []
+        return tree_path(s[f"{self.ns}_prev"], intern(s[f"{self.ns}_names"]).get(s[f"{self.ns}_start"]), goal)
+
+    def _exp_html(self, ev):
+        s = st.session_state
+        names = s[f"{self.ns}_names"]
+        kind = ev[0]
+        if kind == "init":
+            start_v = names[ev[1]] if ev[1] is not None else "N/A"
+            goal_v = names[ev[2]] if ev[2] is not None else "N/A"
+            return f'''<div class="step-content">
+<div class="step-header">Initialization</div>
+<div class="action">Search from <span class="vertex">{start_v}</span> to <span class="vertex">{goal_v}</span></div>
+<div class="action">Set g[start]=0 and g[others]=∞; the heap is ordered by f = g + h</div>
+</div>'''
+        if kind == "goal":
+            d = float(s[f"{self.ns}_dist"][ev[1]])
+            return f'''<div class="step-content"><div class="step-header">Goal reached</div><div class="completion">✓ <span class="vertex">{names[ev[1]]}</span> popped with g={d:.2f}<br><strong>Path:</strong> {self._path_html(self._path())}</div></div>'''
+        if kind == "done":
+            return '<div class="step-content"><div class="step-header">Done</div><div class="completion">✗ Heap empty: the goal is not reachable</div></div>'
+        u = ev[1]
+        g, h = float(s[f"{self.ns}_dist"][u]), float(self._h[u]) if self._h is not None else 0.0
+        exp = [f'<div class="step-content"><div class="step-header">Step {s[f"{self.ns}_step"]}</div>']
+        exp.append(f'<div class="action">Pick min f: <span class="vertex">{names[u]}</span> with g={g:.2f}, h={h:.2f}, f={g + h:.2f}</div>')
+        exp += self._relax_html(names[u], g, ev[2], d="g")
+        exp.append('</div>')
+        return "".join(exp)
+
+    def _state_table(self, V, apsp=None):
+        s = st.session_state
+        names = s[f"{self.ns}_names"]
+        ids = intern(names)
+        at = [ids.get(v, -1) for v in V]
+        vis = s[f"{self.ns}_visited"]
+        dist = s[f"{self.ns}_dist"]
+        h = self._h if self._h is not None and len(self._h) == len(names) else np.zeros(len(names))
+        self._show_table(pd.DataFrame({
+            "Vertex": V,
+            "Expanded": ["✓" if i >= 0 and vis[i] else "-" for i in at],
+            "g": _num(dist, at),
+            "h": _num(h, at),
+            "f": _num(dist + h, at),
+            "Prev": _name(names, s[f"{self.ns}_prev"], at),
+        }))
+
+    def _side_panels(self, V, G, apsp):
+        self._stats_pills()
+        self._heap_panel(key="f", title="Open Set (min-heap on f)")
+        self._compare_panel(V, G)
+
+
+class BidirectionalDijkstraVisualizer(_GoalSearchVisualizer):
+    KEYS = (
+        "visited", "stats", "dist", "prev", "heap", "hpos", "settled",
+        "dist_b", "prev_b", "heap_b", "hpos_b", "settled_b",
+        "goal", "mu", "meet", "current", "order", "edges", "ev", "fin", "step",
+    )
+    TITLE = "Bidirectional Dijkstra State"
+
+    def __init__(self):
+        super().__init__()
+        self.ns = "bidijkstra"
+
+    def _new_state(self, V, start_v):
+        return init_bidijkstra(len(V), intern(V).get(start_v), self._goal(V))
+
+    def _step(self, state, G):
+        step_bidijkstra(state, G)
+
+    def _run_all(self, V, G, start):
+        return run_bidijkstra(G, start, self._goal(V))
+
+    def _run_key(self, V):
+        return (self._goal(V),)
+
+    def _path(self):
+        s = st.session_state
+        state = {k: s[f"{self.ns}_{k}"] for k in ("meet", "prev", "prev_b")}
+        return bidi_path(state, intern(s[f"{self.ns}_names"]).get(s[f"{self.ns}_start"]), s[f"{self.ns}_goal"])
+
+    def _frontier(self):
+        return (st.session_state[f"{self.ns}_hpos"] >= 0) | (st.session_state[f"{self.ns}_hpos_b"] >= 0)
+
+    # Both shortest-path trees, the start's and the goal's.
+    def _search_tree(self):
+        pairs = []
+        for prev in (st.session_state[f"{self.ns}_prev"], st.session_state[f"{self.ns}_prev_b"]):
+            prev = np.asarray(prev)
+            at = np.flatnonzero(prev >= 0)
+            pairs.append(np.stack([prev[at], at], 1))
+        return np.concatenate(pairs)
+
+    def _exp_html(self, ev):
+        s = st.session_state
+        names = s[f"{self.ns}_names"]
+        kind = ev[0]
+        if kind == "init":
+            start_v = names[ev[1]] if ev[1] is not None else "N/A"
+            goal_v = names[ev[2]] if ev[2] is not None else "N/A"
+            return f'''<div class="step-content">
+<div class="step-header">Initialization</div>
+<div class="action">Forward search from <span class="vertex">{start_v}</span>, backward search from <span class="vertex">{goal_v}</span></div>
+<div class="action">Set d→[start]=0, d←[goal]=0 and μ=∞</div>
+</div>'''
+        if kind == "meet":
+            return f'''<div class="step-content"><div class="step-header">Searches met</div><div class="completion">✓ Heap tops add up to at least μ={float(s[f"{self.ns}_mu"]):.2f}, met at <span class="vertex">{names[ev[1]]}</span><br><strong>Path:</strong> {self._path_html(self._path())}</div></div>'''
+        if kind == "done":
+            return '<div class="step-content"><div class="step-header">Done</div><div class="completion">✗ The searches never met: the goal is not reachable</div></div>'
+        u, relax, side = ev[1], ev[2], ev[3]
+        d, key = ("d→", "dist") if side == "forward" else ("d←", "dist_b")
+        du = float(s[f"{self.ns}_{key}"][u])
+        exp = [f'<div class="step-content"><div class="step-header">Step {s[f"{self.ns}_step"]} · {side}</div>']
+        exp.append(f'<div class="action">Pick min of the {side} heap: <span class="vertex">{names[u]}</span> with {d}={du:.2f}</div>')
+        exp += self._relax_html(names[u], du, relax, d=d)
+        mu = float(s[f"{self.ns}_mu"])
+        meet = s[f"{self.ns}_meet"]
+        if meet is not None:
+            exp.append(f'<div style="margin-top:0.5rem;color:var(--text-secondary)">Best meeting so far: μ={mu:.2f} at {names[meet]}</div>')
+        exp.append('</div>')
+        return "".join(exp)
+
+    def _state_table(self, V, apsp=None):
+        s = st.session_state
+        names = s[f"{self.ns}_names"]
+        ids = intern(names)
+        at = [ids.get(v, -1) for v in V]
+        fwd, bwd = s[f"{self.ns}_settled"], s[f"{self.ns}_settled_b"]
+        self._show_table(pd.DataFrame({
+            "Vertex": V,
+            "Settled": [("→" if fwd[i] else "") + ("←" if bwd[i] else "") or "-" if i >= 0 else "-" for i in at],
+            "d→": _num(s[f"{self.ns}_dist"], at),
+            "d←": _num(s[f"{self.ns}_dist_b"], at),
+            "Prev→": _name(names, s[f"{self.ns}_prev"], at),
+            "Prev←": _name(names, s[f"{self.ns}_prev_b"], at),
+        }))
+
+    def _side_panels(self, V, G, apsp):
+        self._stats_pills()
+        c1, c2 = st.columns(2)
+        with c1:
+            self._heap_panel(limit=15, title="Forward Heap")
+        with c2:
+            self._heap_panel(limit=15, heap="heap_b", key="dist_b", title="Backward Heap")
+        self._compare_panel(V, G)
@@ -1,11 +1,21 @@
 import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
-import networkx as nx
 import numpy as np
-import time, copy, random, string, io, os
+import string, io, os
 from matplotlib.backends.backend_pdf import PdfPages
+from algorithms.graph.engine import TAILS, init_bfs, init_bfs_levels, intern, run_bfs, run_bfs_levels, step_bfs, step_bfs_level
+from algorithms.graph.layout import force_layout, update_layout
+from algorithms.graph.matrix import sanitize_adjacency
 from components.graphStyle import COLORS, GRAPH_LAYOUT_CONFIG
+from components.graph_draw import clip_text, draw_graph, draw_graph_lod, edge_styles, vertex_colors
+from components.graph_import import load_generated_graph, load_imported_graph, render_generate_report, render_import_report
+from components.history import StepHistory
+from components.layout_cache import LAYOUTS, layout_key
+from components.matrix_editor import add_vertex, apply_grid_edits, delete_vertex
+from components.player import PLAYER_BATCH, figure_png, player_reached, render_player
+from components.sidebar import render_debug_panel, render_step_scrubber
+from components.trace_cache import TRACES, trace_key
 
 try:
     from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, DataReturnMode
@@ -21,6 +31,16 @@ SAMPLES = {
     "Cross Path": {"P":["Q","R"],"Q":["R"],"R":["S"],"S":[]}
 }
 
+# Step modes: (init, step, run, state keys). Vertex dequeues one vertex per
+# step; Level expands the whole frontier per step (see engine.py), which
+# takes a 100k-vertex graph in a dozen or so steps.
+MODES = {
+    "Vertex": (init_bfs, step_bfs, run_bfs,
+               ("visited", "queue", "inq", "current", "order", "edges", "ev", "fin", "step")),
+    "Level": (init_bfs_levels, step_bfs_level, run_bfs_levels,
+              ("visited", "frontier", "level", "current", "order", "edges", "levels", "ev", "fin", "step")),
+}
+
 class BFSVisualizer:
     def __init__(self):
         self.ns = "bfs"
@@ -38,97 +58,120 @@ class BFSVisualizer:
         return W
 
     def _sanitize(self, df):
-        df = pd.DataFrame(df).copy()
-        cols = [c for c in df.columns if not str(c).startswith("::")]
-        df = df.loc[:, cols]
-        idx = df.index.astype(str).tolist()
-        cols = pd.Index(df.columns).astype(str).tolist()
-        V = sorted(set(idx) | set(cols))
-        if len(V) == 0:
-            return pd.DataFrame(0, index=[], columns=[])
-        df.index = pd.Index(df.index).astype(str)
-        df.columns = pd.Index(df.columns).astype(str)
-        M = df.reindex(index=V, columns=V)
-        M = pd.to_numeric(M.stack(), errors="coerce").unstack()
-        M = M.replace([np.inf, -np.inf], 0).fillna(0.0)
-        M = (M > 0.5).astype(int)
-        for i, v in enumerate(V):
-            M.iloc[i, i] = 0
-        M = ((M + M.T) > 0).astype(int)
-        return M
+        return sanitize_adjacency(df)
 
     def _ensure_state(self, V, start_v, gkey):
         tag = f"{self.ns}_inited"
-        if (not st.session_state.get(tag)) or st.session_state.get(f"{self.ns}_gkey") != gkey or st.session_state.get(f"{self.ns}_start") != start_v:
-            st.session_state[f"{self.ns}_visited"] = {v: False for v in V}
-            st.session_state[f"{self.ns}_queue"] = [start_v] if (start_v in V) else (V[:1] if V else [])
-            st.session_state[f"{self.ns}_current"] = None
-            st.session_state[f"{self.ns}_order"] = []
-            st.session_state[f"{self.ns}_edges"] = []
-            st.session_state[f"{self.ns}_step"] = 0
-            init_queue = st.session_state[f"{self.ns}_queue"]
-            queue_txt = f"<span class='vertex'>{init_queue[0]}</span>" if init_queue else "Empty"
-            st.session_state[f"{self.ns}_exp"] = f'''<div class="step-content">
-<div class="step-header">Initialization</div>
-<div class="action">Starting BFS traversal from vertex <span class="vertex">{start_v if start_v else 'N/A'}</span></div>
-<div style="margin-top:1rem;color:var(--text-secondary)">
-Algorithm: Breadth-First Search explores nodes level by level, visiting all neighbors before moving deeper.
-</div>
-<div class="queue-display">Queue: {queue_txt}</div>
-</div>'''
-            st.session_state[f"{self.ns}_fin"] = False
-            st.session_state[f"{self.ns}_hist"] = []
+        mode = st.session_state.get(f"{self.ns}_mode", "Vertex")
+        if (not st.session_state.get(tag)) or st.session_state.get(f"{self.ns}_gkey") != gkey or st.session_state.get(f"{self.ns}_start") != start_v \
+                or st.session_state.get(f"{self.ns}_run_mode") != mode:
+            st.session_state[f"{self.ns}_run_mode"] = mode
+            self._restore(MODES[mode][0](len(V), intern(V).get(start_v)))
+            st.session_state[f"{self.ns}_names"] = list(V)
+            st.session_state[f"{self.ns}_hist"] = StepHistory(tails=TAILS)
             st.session_state[f"{self.ns}_gkey"] = gkey
             st.session_state[f"{self.ns}_start"] = start_v
             st.session_state[tag] = True
             self._push()
+            st.session_state[f"{self.ns}_pos"] = 0
+
+    # The mode the current run was started in; its engine and state keys.
+    def _engine(self):
+        return MODES[st.session_state.get(f"{self.ns}_run_mode", "Vertex")]
+
+    def _snapshot(self):
+        return {k: st.session_state[f"{self.ns}_{k}"] for k in self._engine()[3]}
 
     def _push(self):
-        h = {
-            "visited": copy.deepcopy(st.session_state[f"{self.ns}_visited"]),
-            "queue": copy.deepcopy(st.session_state[f"{self.ns}_queue"]),
-            "current": st.session_state[f"{self.ns}_current"],
-            "order": copy.deepcopy(st.session_state[f"{self.ns}_order"]),
-            "edges": copy.deepcopy(st.session_state[f"{self.ns}_edges"]),
-            "exp": st.session_state[f"{self.ns}_exp"],
-            "fin": st.session_state[f"{self.ns}_fin"],
-            "step": st.session_state[f"{self.ns}_step"],
-        }
-        st.session_state[f"{self.ns}_hist"].append(h)
+        st.session_state[f"{self.ns}_hist"].append(self._snapshot())
 
     def _restore(self, s):
-        st.session_state[f"{self.ns}_visited"] = copy.deepcopy(s["visited"])
-        st.session_state[f"{self.ns}_queue"] = copy.deepcopy(s["queue"])
-        st.session_state[f"{self.ns}_current"] = s["current"]
-        st.session_state[f"{self.ns}_order"] = copy.deepcopy(s["order"])
-        st.session_state[f"{self.ns}_edges"] = copy.deepcopy(s["edges"])
-        st.session_state[f"{self.ns}_exp"] = s["exp"]
-        st.session_state[f"{self.ns}_fin"] = s["fin"]
-        st.session_state[f"{self.ns}_step"] = s["step"]
-
-    def _graph_from_matrix(self, W):
-        V = list(W.index)
-        G = {u: [] for u in V}
-        for u in V:
-            for v in V:
-                try:
-                    on = (u != v) and (int(W.loc[u, v]) == 1)
-                except Exception:
-                    on = False
-                if on:
-                    G[u].append(v)
-        return G
+        for k in self._engine()[3]:
+            st.session_state[f"{self.ns}_{k}"] = s[k]
+
+    def _goto(self, idx):
+        hist = st.session_state[f"{self.ns}_hist"]
+        idx = max(0, min(int(idx), len(hist) - 1))
+        self._restore(hist[idx])
+        st.session_state[f"{self.ns}_pos"] = idx
+
+    def _advance(self, G):
+        hist = st.session_state[f"{self.ns}_hist"]
+        if st.session_state[f"{self.ns}_pos"] < len(hist) - 1:
+            self._goto(st.session_state[f"{self.ns}_pos"] + 1)
+            return
+        self._bfs_step(G)
+        self._push()
+        st.session_state[f"{self.ns}_pos"] = len(hist) - 1
+
+    # A grid edit keeps the gkey (same vertex names) but changes the graph:
+    # the steps recorded past pos came from the old graph, so they are
+    # dropped and the run carries on from pos on the edited one.
+    def _sync_graph(self, G):
+        s = st.session_state
+        seen = s.get(f"{self.ns}_hist_g")
+        if G is None or (seen is not None and seen[0] is G):
+            return
+        key = trace_key(G.offsets, G.indices, G.weights)
+        if seen is not None and seen[1] != key:
+            s[f"{self.ns}_hist"].truncate(s[f"{self.ns}_pos"] + 1)
+        s[f"{self.ns}_hist_g"] = (G, key)
+
+    def _compile(self, V, G):
+        hist = st.session_state[f"{self.ns}_hist"]
+        if hist.peek("fin"):
+            return
+        pos = st.session_state[f"{self.ns}_pos"]
+        start = intern(V).get(st.session_state[f"{self.ns}_start"])
+        mode = st.session_state[f"{self.ns}_run_mode"]
+        key = trace_key(self.ns, mode, V, G.offsets, G.indices, G.weights, start)
+        st.session_state[f"{self.ns}_hist"] = TRACES.trace(key, lambda: MODES[mode][2](G, start), TAILS)
+        self._goto(pos)
+
+    # Past the recorded history the engine runs in a tight loop on one working
+    # state; only the step landed on is restored and drawn. idx=None runs to
+    # the end.
+    def _seek(self, idx, G):
+        hist = st.session_state[f"{self.ns}_hist"]
+        if idx is None or idx >= len(hist):
+            self._goto(len(hist) - 1)
+            state = self._snapshot()
+            step = self._engine()[1]
+            while (idx is None or len(hist) <= idx) and not state["fin"]:
+                step(state, G)
+                hist.append(state)
+            if idx is None:
+                idx = len(hist) - 1
+        self._goto(idx)
 
     # ---------- One BFS Step ----------
     def _bfs_step(self, G):
-        if st.session_state[f"{self.ns}_fin"]:
-            return
-        st.session_state[f"{self.ns}_step"] += 1
-
-        if not st.session_state[f"{self.ns}_queue"]:
-            st.session_state[f"{self.ns}_fin"] = True
-            order_str = " → ".join(st.session_state[f"{self.ns}_order"])
-            exp = f'''<div class="step-content">
+        state = self._snapshot()
+        self._engine()[1](state, G)
+        self._restore(state)
+
+    # ---------- Step Explanation ----------
+    # Steps only record a small event; the HTML is built for the step on screen.
+    def _exp_html(self, ev):
+        if st.session_state.get(f"{self.ns}_run_mode") == "Level":
+            return self._level_html(ev)
+        kind = ev[0]
+        names = st.session_state[f"{self.ns}_names"]
+        queue = [names[x] for x in st.session_state[f"{self.ns}_queue"]]
+        if kind == "init":
+            start_v = names[ev[1]] if ev[1] is not None else None
+            queue_txt = f"<span class='vertex'>{queue[0]}</span>" if queue else "Empty"
+            return f'''<div class="step-content">
+<div class="step-header">Initialization</div>
+<div class="action">Starting BFS traversal from vertex <span class="vertex">{start_v if start_v else 'N/A'}</span></div>
+<div style="margin-top:1rem;color:var(--text-secondary)">
+Algorithm: Breadth-First Search explores nodes level by level, visiting all neighbors before moving deeper.
+</div>
+<div class="queue-display">Queue: {queue_txt}</div>
+</div>'''
+        if kind == "done":
+            order_str = " → ".join(names[x] for x in st.session_state[f"{self.ns}_order"])
+            return f'''<div class="step-content">
 <div class="step-header">Traversal Complete!</div>
 <div class="completion">
 ✓ All reachable vertices have been visited<br>
@@ -136,48 +179,72 @@ Algorithm: Breadth-First Search explores nodes level by level, visiting all neig
 </div>
 <div class="queue-display">Queue: Empty</div>
 </div>'''
-            st.session_state[f"{self.ns}_exp"] = exp
-            return
-
-        u = st.session_state[f"{self.ns}_queue"].pop(0)
-        st.session_state[f"{self.ns}_current"] = u
 
+        u = names[ev[1]]
         exp_parts = [f'<div class="step-content"><div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>']
-
-        if not st.session_state[f"{self.ns}_visited"][u]:
-            st.session_state[f"{self.ns}_visited"][u] = True
-            st.session_state[f"{self.ns}_order"].append(u)
-
+        if kind == "visit":
             exp_parts.append(f'<div class="action">Dequeued vertex <span class="vertex">{u}</span></div>')
             exp_parts.append(f'<div class="action">Marked <span class="vertex">{u}</span> as visited</div>')
-
-            new_edges = []
-            neighbors = sorted(G[u])
-
-            if neighbors:
+            if ev[2]:
                 exp_parts.append('<div style="margin-top:0.75rem">Exploring neighbors:</div>')
-                for v in neighbors:
-                    if not st.session_state[f"{self.ns}_visited"][v] and v not in st.session_state[f"{self.ns}_queue"]:
-                        st.session_state[f"{self.ns}_queue"].append(v)
-                        new_edges.append((u, v))
+                for v, res in ((names[x], r) for x, r in ev[2]):
+                    if res == "enq":
                         exp_parts.append(f'<div class="action">→ Enqueued <span class="vertex">{v}</span></div>')
-                    elif st.session_state[f"{self.ns}_visited"][v]:
+                    elif res == "vis":
                         exp_parts.append(f'<div style="color:var(--text-muted);margin-left:1rem">→ <span class="vertex">{v}</span> already visited</div>')
                     else:
                         exp_parts.append(f'<div style="color:var(--text-muted);margin-left:1rem">→ <span class="vertex">{v}</span> already in queue</div>')
             else:
                 exp_parts.append('<div style="color:var(--text-muted);margin-top:0.5rem">No neighbors to explore</div>')
-
-            st.session_state[f"{self.ns}_edges"] = new_edges
         else:
             exp_parts.append(f'<div style="color:var(--warning)">Vertex <span class="vertex">{u}</span> was already visited (skipped)</div>')
-            st.session_state[f"{self.ns}_edges"] = []
 
-        qtxt = " ← ".join([f"<span class='vertex'>{x}</span>" for x in st.session_state[f"{self.ns}_queue"]]) if st.session_state[f"{self.ns}_queue"] else "Empty"
+        qtxt = " ← ".join([f"<span class='vertex'>{x}</span>" for x in queue]) if queue else "Empty"
         exp_parts.append(f'<div class="queue-display">Queue: {qtxt}</div>')
         exp_parts.append('</div>')
-
-        st.session_state[f"{self.ns}_exp"] = "".join(exp_parts)
+        return "".join(exp_parts)
+
+    # Level steps: sizes and edge counts, with at most `limit` names listed.
+    def _level_html(self, ev, limit=12):
+        names = st.session_state[f"{self.ns}_names"]
+        levels = st.session_state[f"{self.ns}_levels"]
+        front = np.flatnonzero(st.session_state[f"{self.ns}_frontier"])
+
+        def listed(ids):
+            txt = ", ".join(f"<span class='vertex'>{names[x]}</span>" for x in ids[:limit])
+            return txt + (f" … +{len(ids) - limit:,} more" if len(ids) > limit else "") if len(ids) else "Empty"
+
+        sizes = " → ".join(f"{n:,}" for n, _, _ in levels)
+        if ev[0] == "init":
+            start_v = names[ev[1]] if ev[1] is not None else None
+            return f'''<div class="step-content">
+<div class="step-header">Initialization</div>
+<div class="action">Starting level-synchronous BFS from vertex <span class="vertex">{start_v if start_v else 'N/A'}</span></div>
+<div style="margin-top:1rem;color:var(--text-secondary)">
+Each step expands the whole frontier at once: every edge leaving it is scanned together and the unvisited ends become the next level.
+</div>
+<div class="queue-display">Frontier: {listed(front)}</div>
+</div>'''
+        if ev[0] == "done":
+            scanned = sum(m for _, m, _ in levels)
+            return f'''<div class="step-content">
+<div class="step-header">Traversal Complete!</div>
+<div class="completion">
+✓ Reached {len(st.session_state[f"{self.ns}_order"]):,} vertices in {len(levels)} levels<br>
+<strong>Edges scanned:</strong> {scanned:,}<br>
+<strong>Level sizes:</strong> {sizes}
+</div>
+<div class="queue-display">Frontier: Empty</div>
+</div>'''
+        _, depth, size, scanned, found = ev
+        return f'''<div class="step-content">
+<div class="step-header">Step {st.session_state[f"{self.ns}_step"]} · Level {depth}</div>
+<div class="action">Expanded {size:,} frontier vertices at level {depth}</div>
+<div class="action">Scanned {scanned:,} edges</div>
+<div class="action">Found {found:,} new vertices for level {depth + 1}</div>
+<div style="margin-top:0.75rem;color:var(--text-secondary)">Level sizes: {sizes}</div>
+<div class="queue-display">Frontier: {listed(front)}</div>
+</div>'''
 
     # ---------- Tables / Editors ----------
     def _ag_clean(self, original_df, ag_out):
@@ -188,6 +255,8 @@ Algorithm: Breadth-First Search explores nodes level by level, visiting all neig
         df_out.index = list(original_df.index)
         return df_out
 
+    # The grid's matrix as edited, unsanitized: apply_grid_edits reads it
+    # against the stored one and patches only the cells that changed.
     def _ag_matrix(self, df):
         if AG_OK:
             g = GridOptionsBuilder.from_dataframe(df)
@@ -210,7 +279,7 @@ Algorithm: Breadth-First Search explores nodes level by level, visiting all neig
                 allow_unsafe_jscode=True
             )
             cleaned = self._ag_clean(df, ag_out)
-            res = self._sanitize(cleaned)
+            res = cleaned
         else:
             raw = st.data_editor(
                 df,
@@ -219,19 +288,34 @@ Algorithm: Breadth-First Search explores nodes level by level, visiting all neig
                 use_container_width=True,
                 num_rows="dynamic"
             )
-            res = self._sanitize(raw)
+            res = raw
         return res
 
+    # Name-keyed view of the id-based state for tables and drawing.
+    def _view(self):
+        names = st.session_state[f"{self.ns}_names"]
+        cur = st.session_state[f"{self.ns}_current"]
+        return (
+            names[cur] if cur is not None else None,
+            {names[i] for i in np.flatnonzero(st.session_state[f"{self.ns}_visited"])},
+            {(names[a], names[b]) for a, b in st.session_state[f"{self.ns}_edges"]},
+        )
+
     def _state_table(self, V):
-        vis = st.session_state[f"{self.ns}_visited"]
-        order = st.session_state[f"{self.ns}_order"]
-        queue = st.session_state[f"{self.ns}_queue"]
+        names = st.session_state[f"{self.ns}_names"]
+        _, vis, _ = self._view()
+        order = {names[x]: i + 1 for i, x in enumerate(st.session_state[f"{self.ns}_order"])}
         df = pd.DataFrame({
             "Vertex": V,
-            "Visited": ["✓" if vis.get(v, False) else "-" for v in V],
-            "Visit Order": [order.index(v) + 1 if v in order else "-" for v in V],
-            "In Queue": ["✓" if v in queue else "-" for v in V],
+            "Visited": ["✓" if v in vis else "-" for v in V],
+            "Visit Order": [order.get(v, "-") for v in V],
         })
+        if st.session_state[f"{self.ns}_run_mode"] == "Level":
+            level = st.session_state[f"{self.ns}_level"]
+            df["Level"] = np.where(level >= 0, level.astype(str), "-")
+            df["Frontier"] = np.where(st.session_state[f"{self.ns}_frontier"], "✓", "-")
+        else:
+            df["In Queue"] = np.where(st.session_state[f"{self.ns}_inq"], "✓", "-")
         if AG_OK:
             g = GridOptionsBuilder.from_dataframe(df)
             g.configure_grid_options(domLayout="autoHeight", suppressMovableColumns=True, rowSelection="none", enableSorting=False, rowHeight=34)
@@ -240,6 +324,17 @@ Algorithm: Breadth-First Search explores nodes level by level, visiting all neig
         else:
             st.dataframe(df, height=220, use_container_width=True)
 
+    # Per-level frontier size, edges scanned and vertices found so far.
+    def _levels_panel(self):
+        levels = st.session_state[f"{self.ns}_levels"]
+        st.markdown('<div class="frame-title">Levels</div>', unsafe_allow_html=True)
+        if not levels:
+            st.markdown('<div class="frame-hint">No level expanded yet</div>', unsafe_allow_html=True)
+            return
+        df = pd.DataFrame(levels, columns=["Frontier", "Edges scanned", "Found"])
+        df.insert(0, "Level", range(len(levels)))
+        st.dataframe(df, hide_index=True, use_container_width=True, height=min(36 * (len(levels) + 1) + 2, 300))
+
     def _html_to_plain(self, html_text):
         import re
         text = html_text
@@ -255,105 +350,100 @@ Algorithm: Breadth-First Search explores nodes level by level, visiting all neig
         return text.strip()
 
     # ---------- Drawing ----------
-    def _draw(self, V, W, start_v):
+    # Force layout as an (n, 2) array in id order. Reruns and exported frames
+    # of the same graph reuse the session's last one. A graph not seen yet
+    # starts from the one last drawn here, so Add Vertex only re-settles the
+    # new vertex's neighbourhood; that result depends on the session's
+    # history and stays in the session. Only from-scratch layouts are shared
+    # between sessions, in LAYOUTS under the graph's structural key.
+    def _layout(self, V, G):
+        if len(V) <= 1:
+            return np.full((len(V), 2), 0.5)
+        key = layout_key(V, G)
+        prev = st.session_state.get(f"{self.ns}_layout")
+        if prev is not None and len(prev) == 3 and st.session_state.get(f"{self.ns}_layout_key") == key:
+            return prev[2]
+        P = update_layout(V, G, prev, lambda: LAYOUTS.layout(key, lambda: force_layout(G)))
+        st.session_state[f"{self.ns}_layout"] = (list(V), G, P)
+        st.session_state[f"{self.ns}_layout_key"] = key
+        return P
+
+    def _frontier(self):
+        s = st.session_state
+        return s[f"{self.ns}_frontier"] if s[f"{self.ns}_run_mode"] == "Level" else s[f"{self.ns}_inq"]
+
+    # Current step on ax, drawn in batches (components/graph_draw.py), in
+    # level of detail above lod_vertices; nothing above the draw limit.
+    def _plot(self, ax, V, G, start_v, **style):
+        if len(V) == 0 or len(V) > GRAPH_LAYOUT_CONFIG["max_draw_vertices"]:
+            return
+        s = st.session_state
+        cur = None if s[f"{self.ns}_fin"] else s[f"{self.ns}_current"]
+        start = V.index(start_v) if start_v in V else None
+        src, dst, _ = G.edge_pairs()
+        if len(V) > GRAPH_LAYOUT_CONFIG["lod_vertices"]:
+            draw_graph_lod(
+                ax, self._layout(V, G), src, dst, s[f"{self.ns}_visited"], self._frontier(),
+                cur, start, s[f"{self.ns}_edges"], density=s.get("sb_density", False),
+            )
+            return
+        ec, ew = edge_styles(len(V), src, dst, s[f"{self.ns}_edges"])
+        nc = vertex_colors(s[f"{self.ns}_visited"], cur, start)
+        draw_graph(ax, self._layout(V, G), src, dst, nc, ec, ew, labels=V, **style)
+
+    def _draw(self, V, G, start_v):
         if len(V) == 0:
             st.info("No vertices to display")
             return
+        if len(V) > GRAPH_LAYOUT_CONFIG["max_draw_vertices"]:
+            st.info(f"{len(V):,} vertices are too many to draw; the state table and explanation still follow every step.")
+            return
         fig, ax = plt.subplots(figsize=(7, 4.8))
         fig.patch.set_facecolor(COLORS["background"])
-        Gx = nx.Graph()
-        for u in V:
-            Gx.add_node(u)
-        for u in V:
-            for v in V:
-                try:
-                    on = (u < v) and (int(W.loc[u, v]) == 1)
-                except Exception:
-                    on = False
-                if on:
-                    Gx.add_edge(u, v)
-        pos = nx.spring_layout(Gx, seed=4, k=1.25) if len(Gx) > 1 else {V[0]: (0.5, 0.5)}
-        node_colors = []
-        for v in Gx.nodes():
-            if v == start_v:
-                node_colors.append(COLORS["source"])
-            elif st.session_state[f"{self.ns}_current"] == v and not st.session_state[f"{self.ns}_fin"]:
-                node_colors.append(COLORS["current"])
-            elif st.session_state[f"{self.ns}_visited"].get(v, False):
-                node_colors.append(COLORS["visited"])
-            else:
-                node_colors.append(COLORS["unvisited"])
-        ec, ew = [], []
-        for (u, v) in Gx.edges():
-            if (u, v) in st.session_state[f"{self.ns}_edges"] or (v, u) in st.session_state[f"{self.ns}_edges"]:
-                ec.append(GRAPH_LAYOUT_CONFIG["edge_color_highlight"])
-                ew.append(GRAPH_LAYOUT_CONFIG["edge_width_highlight"])
-            else:
-                ec.append(GRAPH_LAYOUT_CONFIG["edge_color_regular"])
-                ew.append(GRAPH_LAYOUT_CONFIG["edge_width_regular"])
-        nx.draw_networkx_nodes(Gx, pos, node_color=node_colors, node_size=GRAPH_LAYOUT_CONFIG["node_size"], edgecolors=GRAPH_LAYOUT_CONFIG["node_border_color"], linewidths=GRAPH_LAYOUT_CONFIG["node_border_width"], ax=ax)
-        nx.draw_networkx_labels(Gx, pos, font_size=GRAPH_LAYOUT_CONFIG["font_size"], font_weight=GRAPH_LAYOUT_CONFIG["font_weight"], font_color=GRAPH_LAYOUT_CONFIG["font_color"], ax=ax)
-        for i, e in enumerate(Gx.edges()):
-            nx.draw_networkx_edges(Gx, pos, [e], edge_color=[ec[i]], width=[ew[i]], ax=ax)
+        self._plot(ax, V, G, start_v)
         ax.set_facecolor(COLORS["background"])
         ax.axis("off")
         plt.tight_layout()
         st.pyplot(fig)
         plt.close(fig)
 
-    def _frame_figure(self, V, W, start_v, step_text):
+    def _frame_figure(self, V, G, start_v, step_text):
         fig = plt.figure(figsize=(8, 7), layout="constrained")
         fig.patch.set_facecolor(COLORS["background"])
         gs = fig.add_gridspec(2, 1, height_ratios=[3, 1])
         ax = fig.add_subplot(gs[0])
-        Gx = nx.Graph()
-        for u in V: Gx.add_node(u)
-        for u in V:
-            for v in V:
-                try:
-                    on = (u < v) and (int(W.loc[u, v]) == 1)
-                except Exception:
-                    on = False
-                if on:
-                    Gx.add_edge(u, v)
-        pos = nx.spring_layout(Gx, seed=4, k=1.25) if len(Gx) > 1 else ({V[0]: (0.5, 0.5)} if V else {})
-        node_colors = []
-        for v in Gx.nodes():
-            if v == start_v:
-                node_colors.append(COLORS["source"])
-            elif st.session_state[f"{self.ns}_current"] == v and not st.session_state[f"{self.ns}_fin"]:
-                node_colors.append(COLORS["current"])
-            elif st.session_state[f"{self.ns}_visited"].get(v, False):
-                node_colors.append(COLORS["visited"])
-            else:
-                node_colors.append(COLORS["unvisited"])
-        ec, ew = [], []
-        for (u, v) in Gx.edges():
-            if (u, v) in st.session_state[f"{self.ns}_edges"] or (v, u) in st.session_state[f"{self.ns}_edges"]:
-                ec.append(GRAPH_LAYOUT_CONFIG["edge_color_highlight"])
-                ew.append(GRAPH_LAYOUT_CONFIG["edge_width_highlight"])
-            else:
-                ec.append(GRAPH_LAYOUT_CONFIG["edge_color_regular"])
-                ew.append(GRAPH_LAYOUT_CONFIG["edge_width_regular"])
-        nx.draw_networkx_nodes(Gx, pos, node_color=node_colors, node_size=950, edgecolors="#9aa4d3", linewidths=2, ax=ax)
-        nx.draw_networkx_labels(Gx, pos, font_size=13, font_weight="bold", font_color="#eef3ff", ax=ax)
-        for i, e in enumerate(Gx.edges()):
-            nx.draw_networkx_edges(Gx, pos, [e], edge_color=[ec[i]], width=[ew[i]], ax=ax)
+        self._plot(ax, V, G, start_v, node_size=950, node_border_color="#9aa4d3", font_size=13, edge_label_size=12)
         ax.set_facecolor(COLORS["background"])
         ax.set_xticks([]); ax.set_yticks([])
         ax2 = fig.add_subplot(gs[1])
         ax2.set_facecolor("#0d1220"); ax2.set_xticks([]); ax2.set_yticks([])
-        plain_text = self._html_to_plain(step_text)
+        plain_text = clip_text(self._html_to_plain(step_text))
         ax2.text(0.02, 0.95, "Step-by-step", fontsize=12, color="#9fb3ff", fontweight="bold", va="top")
         ax2.text(0.02, 0.75, plain_text, fontsize=10, color="#e6ecff", va="top", family="monospace", wrap=True, linespacing=1.5)
         return fig
 
-    def _export(self, fmt, fps, V, W, start_v):
+    # Auto-play renders the next batch of frames, from the cursor on, once
+    # and lets the browser play them. The cursor stays put; it only moves
+    # when the player reports the step it reached (player_reached), and the
+    # rerun that follows sends the batch starting there.
+    def _autoplay(self, speed, V, G, start_v):
+        pos = st.session_state[f"{self.ns}_pos"]
+        self._seek(pos + PLAYER_BATCH - 1, G)
+        end = st.session_state[f"{self.ns}_pos"]
+        more = not st.session_state.get(f"{self.ns}_fin", False)
+        frames = []
+        for s in st.session_state[f"{self.ns}_hist"].states(pos, end + 1):
+            self._restore(s)
+            frames.append(figure_png(self._frame_figure(V, G, start_v, self._exp_html(s["ev"]))))
+        self._goto(pos)
+        render_player(frames, speed, self.ns, first_step=pos, more=more)
+
+    def _export(self, fmt, fps, V, G, start_v):
         frames = []
         saved = []
-        for s in st.session_state[f"{self.ns}_hist"]:
+        for s in st.session_state[f"{self.ns}_hist"].states(0, st.session_state[f"{self.ns}_pos"] + 1):
             self._restore(s)
-            fig = self._frame_figure(V, W, start_v, s["exp"])
+            fig = self._frame_figure(V, G, start_v, self._exp_html(s["ev"]))
             buf = io.BytesIO()
             fig.savefig(buf, format="png", dpi=140, facecolor=fig.get_facecolor())
             plt.close(fig)
@@ -364,9 +454,9 @@ Algorithm: Breadth-First Search explores nodes level by level, visiting all neig
         if fmt == "PDF":
             path = os.path.join(outdir, "bfs_run.pdf")
             with PdfPages(path) as pdf:
-                for s in st.session_state[f"{self.ns}_hist"]:
+                for s in st.session_state[f"{self.ns}_hist"].states(0, st.session_state[f"{self.ns}_pos"] + 1):
                     self._restore(s)
-                    fig = self._frame_figure(V, W, start_v, s["exp"])
+                    fig = self._frame_figure(V, G, start_v, self._exp_html(s["ev"]))
                     pdf.savefig(fig, facecolor=fig.get_facecolor())
                     plt.close(fig)
             saved.append(path)
@@ -398,107 +488,138 @@ Algorithm: Breadth-First Search explores nodes level by level, visiting all neig
         src = s.get("sb_src", "Sample graph")
         sample = s.get("sb_sample", "Straight Chain")
         auto = s.get("sb_auto", False)
+        precompute = s.get("sb_precompute", False)
         speed = s.get("sb_speed", 0.8)
         next_clicked = s.get("sb_next", False)
+        ff_clicked = s.get("sb_ff", False)
+        end_clicked = s.get("sb_end", False)
         back_clicked = s.get("sb_back", False)
         reset_clicked = s.get("sb_reset", False)
         export_clicked = s.get("sb_export", False)
 
         
-        if src == "Sample graph":
-            W = self._sample_df(sample)
-            hint = f"Sample: {sample}. Edit 0/1 to add or remove edges. Symmetry is enforced."
-            # keep a copy so builder widgets have something if user switches later
-            s.setdefault(f"{self.ns}_matrix_df", W.copy())
+        imported = None
+        if src == "Import file":
+            imported = load_imported_graph(self.ns, weighted=False)
+            W, G = None, (imported[1] if imported else None)
+            V = imported[0] if imported else []
+            gkey = f"import::{s[f'{self.ns}_import'][0]}" if imported else "import::"
+        elif src == "Generate":
+            imported = load_generated_graph(self.ns, weighted=False)
+            W, G = None, (imported[1] if imported else None)
+            V = imported[0] if imported else []
+            gkey = f"generate::{s[f'{self.ns}_generated'][0]}"
         else:
-            # SINGLE SOURCE OF TRUTH for custom graph
-            if f"{self.ns}_matrix_df" not in s:
-                # init once
-                Vnames = list(string.ascii_uppercase[:6])
-                base = pd.DataFrame(0, index=Vnames, columns=Vnames, dtype=int)
-                s[f"{self.ns}_matrix_df"] = base.copy()
-            W = s[f"{self.ns}_matrix_df"].copy()
-            hint = "Edit 0/1 to add or remove edges. Use Add/Delete to change vertices. Symmetry is enforced."
-
-        # sanitize & ensure state
-        W = self._sanitize(W)
-        V = list(W.index)
+            if src == "Sample graph":
+                W = self._sanitize(self._sample_df(sample))
+                hint = f"Sample: {sample}. Edit 0/1 to add or remove edges. Symmetry is enforced."
+                # keep a copy so builder widgets have something if user switches later
+                s.setdefault(f"{self.ns}_matrix_df", W.copy())
+            else:
+                # SINGLE SOURCE OF TRUTH for custom graph
+                if f"{self.ns}_matrix_df" not in s:
+                    # init once
+                    Vnames = list(string.ascii_uppercase[:6])
+                    base = pd.DataFrame(0, index=Vnames, columns=Vnames, dtype=int)
+                    s[f"{self.ns}_matrix_df"] = base.copy()
+                W = s[f"{self.ns}_matrix_df"]
+                hint = "Edit 0/1 to add or remove edges. Use Add/Delete to change vertices. Symmetry is enforced."
+
+            V = list(W.index)
+            gkey = f"{src}::{sample or 'custom'}::{','.join(V)}"
 
         # if saved start is invalid after vertex changes → fallback
         if V and s.get(f"{self.ns}_start_sel") not in V:
             s[f"{self.ns}_start_sel"] = V[0]
 
         sv = s.get(f"{self.ns}_start_sel", V[0] if V else None)
-        gkey = f"{src}::{sample or 'custom'}::{','.join(V)}"
         self._ensure_state(V, sv if V else None, gkey)
 
         col1, col2 = st.columns(2)
 
         
         with col1:
-            st.markdown('<div class="frame-title">Adjacency Matrix</div>', unsafe_allow_html=True)
-            st.markdown(f'<div class="frame-hint">{hint}</div>', unsafe_allow_html=True)
-
-            if src != "Sample graph":
-                col_add, col_del = st.columns(2)
-
-                # Add vertex
-                with col_add:
-                    new_vertex = st.text_input("Add vertex", key=f"{self.ns}_add_vertex", placeholder="Enter name")
-                    if st.button("Add Vertex", key=f"{self.ns}_btn_add"):
-                        nv = (new_vertex or "").strip()
-                        if nv and nv not in W.index:
-                            V_new = list(W.index) + [nv]
-                            W2 = pd.DataFrame(0, index=V_new, columns=V_new, dtype=int)
-                            W2.loc[W.index, W.columns] = W
-                            s[f"{self.ns}_matrix_df"] = self._sanitize(W2)
-                            # reset algo state because vertex set changed
-                            s[f"{self.ns}_inited"] = False
-                            st.rerun()
-
-               
-                with col_del:
-                    if len(list(W.index)) > 1:
-                        del_vertex = st.selectbox("Delete vertex", list(W.index), key=f"{self.ns}_del_vertex")
-                        if st.button("Delete Vertex", key=f"{self.ns}_btn_del"):
-                            if del_vertex in W.index:
-                                W2 = W.drop(index=[del_vertex], columns=[del_vertex])
-                                s[f"{self.ns}_matrix_df"] = self._sanitize(W2)
-                                # fix start if it was deleted
-                                if s.get(f"{self.ns}_start_sel") == del_vertex:
-                                    left = list(W2.index)
-                                    if left:
-                                        s[f"{self.ns}_start_sel"] = left[0]
+            if src == "Import file":
+                st.markdown('<div class="frame-title">Imported Graph</div>', unsafe_allow_html=True)
+                if imported:
+                    render_import_report(imported[2])
+                else:
+                    st.markdown('<div class="frame-hint">Choose an edge list, CSV, Matrix Market or GraphML file in the sidebar.</div>', unsafe_allow_html=True)
+            elif src == "Generate":
+                st.markdown('<div class="frame-title">Generated Graph</div>', unsafe_allow_html=True)
+                if imported:
+                    render_generate_report(imported[2])
+                else:
+                    st.markdown('<div class="frame-hint">Adjust the generator settings in the sidebar.</div>', unsafe_allow_html=True)
+            else:
+                st.markdown('<div class="frame-title">Adjacency Matrix</div>', unsafe_allow_html=True)
+                st.markdown(f'<div class="frame-hint">{hint}</div>', unsafe_allow_html=True)
+
+                if src != "Sample graph":
+                    col_add, col_del = st.columns(2)
+
+                    # Add vertex
+                    with col_add:
+                        new_vertex = st.text_input("Add vertex", key=f"{self.ns}_add_vertex", placeholder="Enter name")
+                        if st.button("Add Vertex", key=f"{self.ns}_btn_add"):
+                            nv = (new_vertex or "").strip()
+                            if nv and nv not in W.index:
+                                add_vertex(self.ns, W, nv, weighted=False)
+                                # reset algo state because vertex set changed
                                 s[f"{self.ns}_inited"] = False
                                 st.rerun()
 
+               
+                    with col_del:
+                        if len(list(W.index)) > 1:
+                            del_vertex = st.selectbox("Delete vertex", list(W.index), key=f"{self.ns}_del_vertex")
+                            if st.button("Delete Vertex", key=f"{self.ns}_btn_del"):
+                                if del_vertex in W.index:
+                                    W2, _ = delete_vertex(self.ns, W, del_vertex, weighted=False)
+                                    # fix start if it was deleted
+                                    if s.get(f"{self.ns}_start_sel") == del_vertex:
+                                        left = list(W2.index)
+                                        if left:
+                                            s[f"{self.ns}_start_sel"] = left[0]
+                                    s[f"{self.ns}_inited"] = False
+                                    st.rerun()
+
             
-            W = self._ag_matrix(W)
-            W = self._sanitize(W)
-            s[f"{self.ns}_matrix_df"] = W.copy()
+                W, G = apply_grid_edits(self.ns, W, self._ag_matrix(W), weighted=False)
 
         
         with col2:
             st.markdown('<div class="frame-title">BFS State</div>', unsafe_allow_html=True)
-            V = list(W.index)
+            if W is not None:
+                V = list(W.index)
+                gkey = f"{src}::{sample or 'custom'}::{','.join(V)}"
 
             # keep start valid
             if V and s.get(f"{self.ns}_start_sel") not in V:
                 s[f"{self.ns}_start_sel"] = V[0]
 
+            st.radio("Step by", list(MODES), key=f"{self.ns}_mode", horizontal=True,
+                     help="Vertex dequeues one vertex per step; Level expands the whole frontier per step.")
             sv = st.selectbox("Start vertex", V, index=(0 if V else 0),
                                key=f"{self.ns}_start_sel",
                                disabled=(len(V) == 0),
                                label_visibility="collapsed")
-            gkey = f"{src}::{sample or 'custom'}::{','.join(V)}"
             self._ensure_state(V, sv if V else None, gkey)
+            self._sync_graph(G)
+            if precompute and V:
+                self._compile(V, G)
+            seek = st.session_state.pop(f"{self.ns}_seek", None)
+            if seek is None:
+                seek = player_reached(self.ns)
+            if seek is not None and V:
+                self._seek(seek, G)
 
             if V:
                 self._state_table(V)
             else:
                 st.info("No vertices available")
 
-            visited_count = sum(st.session_state.get(f"{self.ns}_visited", {}).values()) if V else 0
+            visited_count = int(st.session_state[f"{self.ns}_visited"].sum()) if V else 0
             remaining = (len(V) - visited_count) if V else 0
             status = "Completed" if st.session_state.get(f"{self.ns}_fin", False) else "Running"
             cls = "ok" if status == "Completed" else "run"
@@ -511,48 +632,51 @@ Algorithm: Breadth-First Search explores nodes level by level, visiting all neig
                 <div class="pill"><div class="h">Status</div><div class="v {cls}">{status}</div></div>
             </div>
             ''', unsafe_allow_html=True)
+            if V and s[f"{self.ns}_run_mode"] == "Level":
+                self._levels_panel()
 
         
-        col3, col4 = st.columns(2)
+        manual = next_clicked or back_clicked or reset_clicked or ff_clicked or end_clicked
+        if auto and not manual and not st.session_state.get(f"{self.ns}_fin", False) and len(V) > 0:
+            self._autoplay(speed, V, G, st.session_state.get(f"{self.ns}_start"))
+        else:
+            col3, col4 = st.columns(2)
 
-        with col3:
-            st.markdown('<div class="frame-title">Graph Visualization</div>', unsafe_allow_html=True)
-            self._draw(list(W.index), W, sv)
-            st.markdown('<div class="legend"><span><i style="background:#7c4dff"></i>Source</span><span><i style="background:#34d399"></i>Visited</span><span><i style="background:#f59e0b"></i>Current</span><span><i style="background:#3a3f55"></i>Unvisited</span></div>', unsafe_allow_html=True)
+            with col3:
+                st.markdown('<div class="frame-title">Graph Visualization</div>', unsafe_allow_html=True)
+                self._draw(V, G, sv)
+                st.markdown('<div class="legend"><span><i style="background:#7c4dff"></i>Source</span><span><i style="background:#34d399"></i>Visited</span><span><i style="background:#f59e0b"></i>Current</span><span><i style="background:#3a3f55"></i>Unvisited</span></div>', unsafe_allow_html=True)
 
-        with col4:
-            st.markdown('<div class="frame-title">Step-by-Step Explanation</div>', unsafe_allow_html=True)
-            exp_html = st.session_state.get(f'{self.ns}_exp', '')
-            st.markdown(f'<div class="step-explanation">{exp_html}</div>', unsafe_allow_html=True)
+            with col4:
+                st.markdown('<div class="frame-title">Step-by-Step Explanation</div>', unsafe_allow_html=True)
+                exp_html = self._exp_html(st.session_state[f'{self.ns}_ev'])
+                st.markdown(f'<div class="step-explanation">{exp_html}</div>', unsafe_allow_html=True)
 
         # ---------- controls ----------
-        manual = next_clicked or back_clicked or reset_clicked
+        render_step_scrubber(self.ns, len(st.session_state[f"{self.ns}_hist"]), st.session_state[f"{self.ns}_pos"])
+        render_debug_panel(self.ns)
 
-        if next_clicked and not st.session_state.get(f"{self.ns}_fin", False) and len(W.index) > 0:
-            G = self._graph_from_matrix(W)
-            self._bfs_step(G)
-            self._push()
+        if next_clicked and not st.session_state.get(f"{self.ns}_fin", False) and len(V) > 0:
+            self._advance(G)
+            st.rerun()
+        if ff_clicked and not st.session_state.get(f"{self.ns}_fin", False) and len(V) > 0:
+            self._seek(st.session_state[f"{self.ns}_pos"] + int(s.get("sb_ff_n", 10)), G)
+            st.rerun()
+        if end_clicked and not st.session_state.get(f"{self.ns}_fin", False) and len(V) > 0:
+            self._seek(None, G)
             st.rerun()
 
-        if back_clicked and len(st.session_state.get(f"{self.ns}_hist", [])) > 1:
-            st.session_state[f"{self.ns}_hist"].pop()
-            self._restore(st.session_state[f"{self.ns}_hist"][-1])
+        if back_clicked and st.session_state.get(f"{self.ns}_pos", 0) > 0:
+            self._goto(st.session_state[f"{self.ns}_pos"] - 1)
             st.rerun()
 
         if reset_clicked:
             st.session_state[f"{self.ns}_inited"] = False
-            self._ensure_state(list(W.index), st.session_state.get(f"{self.ns}_start_sel"), gkey)
+            self._ensure_state(V, st.session_state.get(f"{self.ns}_start_sel"), gkey)
             st.rerun()
 
-        if export_clicked and len(st.session_state.get(f"{self.ns}_hist", [])) > 0 and len(W.index) > 0:
-            paths = self._export(st.session_state.get("sb_fmt", "GIF"), max(1, st.session_state.get("sb_fps", 6)), list(W.index), W, st.session_state.get(f"{self.ns}_start"))
+        if export_clicked and len(st.session_state.get(f"{self.ns}_hist", [])) > 0 and len(V) > 0:
+            paths = self._export(st.session_state.get("sb_fmt", "GIF"), max(1, st.session_state.get("sb_fps", 6)), V, G, st.session_state.get(f"{self.ns}_start"))
             for p in paths:
                 with open(p, "rb") as f:
                     st.sidebar.download_button("Download " + p.split("/")[-1], f, file_name=p.split("/")[-1], mime="application/octet-stream")
-
-        if auto and not st.session_state.get(f"{self.ns}_fin", False) and not manual and len(W.index) > 0:
-            G = self._graph_from_matrix(W)
-            self._bfs_step(G)
-            self._push()
-            time.sleep(speed)
-            st.rerun()
\ No newline at end of file
@@ -0,0 +1,120 @@
+import numpy as np
+
+# Compressed sparse row graph over vertex ids 0..n-1, shared by the BFS, DFS
+# and Dijkstra engines. The neighbours of u are
+# indices[offsets[u]:offsets[u+1]] in ascending id order, with the matching
+# slice of weights for weighted graphs. Memory is O(V + E), so sparse graphs
+# with millions of edges fit where a dense V x V matrix would not.
+
+
+class CSRGraph:
+    def __init__(self, offsets, indices, weights=None):
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.weights = None if weights is None else np.asarray(weights, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def n_edges(self):
+        return len(self.indices)
+
+    @property
+    def nbytes(self):
+        return self.offsets.nbytes + self.indices.nbytes + (0 if self.weights is None else self.weights.nbytes)
+
+    def degree(self, u):
+        return int(self.offsets[u + 1] - self.offsets[u])
+
+    def neighbors(self, u):
+        return self.indices[self.offsets[u]:self.offsets[u + 1]].tolist()
+
+    # [(v, w), ...] for weighted graphs
+    def weighted(self, u):
+        a, b = self.offsets[u], self.offsets[u + 1]
+        return list(zip(self.indices[a:b].tolist(), self.weights[a:b].tolist()))
+
+    # Each undirected edge once, as u < v in CSR order: (src, dst, weights)
+    # with weights None for unweighted graphs.
+    def edge_pairs(self):
+        src = np.repeat(np.arange(len(self), dtype=np.int32), np.diff(self.offsets))
+        keep = src < self.indices
+        w = None if self.weights is None else self.weights[keep]
+        return src[keep], self.indices[keep], w
+
+    # Copy with the undirected edges (u[i], v[i]) set to weight w[i]; 0
+    # removes the edge and unweighted graphs only look at w > 0. The kept
+    # arcs are spliced with the new ones in (src, dst) order, so the cost is
+    # a pass over the arrays, not a rebuild from a matrix.
+    def with_edges(self, u, v, w):
+        n = len(self)
+        u = np.asarray(u, dtype=np.int64)
+        v = np.asarray(v, dtype=np.int64)
+        w = np.asarray(w, dtype=np.float64)
+        a, b, w = np.concatenate([u, v]), np.concatenate([v, u]), np.concatenate([w, w])
+        src = np.repeat(np.arange(n, dtype=np.int64), np.diff(self.offsets))
+        key = src * n + self.indices
+        keep = ~np.isin(key, a * n + b)
+        on = np.flatnonzero(w > 0)
+        add = a[on] * n + b[on]
+        order = np.argsort(add)
+        add = add[order]
+        pos = np.searchsorted(key[keep], add)
+        key = np.insert(key[keep], pos, add)
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(key // max(n, 1), minlength=n), out=offsets[1:])
+        weights = None if self.weights is None else np.insert(self.weights[keep], pos, w[on][order])
+        return CSRGraph(offsets, key % max(n, 1), weights)
+
+    # Copy with an isolated vertex inserted at id `at`; later ids shift up.
+    def with_vertex(self, at):
+        idx = self.indices.astype(np.int64)
+        return CSRGraph(np.insert(self.offsets, at, self.offsets[at]), idx + (idx >= at), self.weights)
+
+    # Copy with vertex `at` and its edges removed; later ids shift down.
+    def without_vertex(self, at):
+        src = np.repeat(np.arange(len(self)), np.diff(self.offsets))
+        keep = (src != at) & (self.indices != at)
+        idx = self.indices[keep].astype(np.int64)
+        offsets = np.zeros(len(self), dtype=np.int64)
+        np.cumsum(np.delete(np.bincount(src[keep], minlength=len(self)), at), out=offsets[1:])
+        return CSRGraph(offsets, idx - (idx > at), None if self.weights is None else self.weights[keep])
+
+    # Directed arcs src[i] -> dst[i]; add both directions for an undirected
+    # graph. Duplicate arcs are kept.
+    @classmethod
+    def from_edges(cls, n, src, dst, weights=None):
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        order = np.lexsort((dst, src))
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=offsets[1:])
+        w = None if weights is None else np.asarray(weights, dtype=np.float64)[order]
+        return cls(offsets, dst[order], w)
+
+    # Every off-diagonal entry > 0 of a square matrix (ndarray or DataFrame)
+    # is an arc; with weighted=True the entry is its weight.
+    @classmethod
+    def from_matrix(cls, M, weighted=False):
+        M = np.asarray(M, dtype=np.float64)
+        mask = M > 0
+        np.fill_diagonal(mask, False)
+        src, dst = np.nonzero(mask)
+        offsets = np.zeros(len(M) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=len(M)), out=offsets[1:])
+        return cls(offsets, dst, M[src, dst] if weighted else None)
+
+    # adj[u] = [v, ...] or [(v, w), ...]
+    @classmethod
+    def from_lists(cls, adj):
+        src, dst, w = [], [], []
+        for u, row in enumerate(adj):
+            for x in row:
+                src.append(u)
+                if isinstance(x, tuple):
+                    dst.append(x[0])
+                    w.append(x[1])
+                else:
+                    dst.append(x)
+        return cls.from_edges(len(adj), src, dst, w if w else None)
@@ -1,11 +1,23 @@
 import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
-import networkx as nx
 import numpy as np
-import time, copy, random, string, io, os
+import string, io, os
 from matplotlib.backends.backend_pdf import PdfPages
+from algorithms.graph.apsp import APSPError, METHODS, all_pairs, shortest_path
+from algorithms.graph.engine import TAILS, init_dijkstra, intern, run_dijkstra, step_dijkstra
+from algorithms.graph.layout import force_layout, update_layout
+from algorithms.graph.matrix import sanitize_weights
+from components.apsp_cache import APSP, apsp_key
 from components.graphStyle import COLORS, GRAPH_LAYOUT_CONFIG
+from components.graph_draw import clip_text, draw_graph, draw_graph_lod, edge_styles, vertex_colors
+from components.graph_import import load_generated_graph, load_imported_graph, render_generate_report, render_import_report
+from components.history import StepHistory
+from components.layout_cache import LAYOUTS, layout_key
+from components.matrix_editor import add_vertex, apply_grid_edits, delete_vertex
+from components.player import PLAYER_BATCH, figure_png, player_reached, render_player
+from components.sidebar import render_debug_panel, render_step_scrubber
+from components.trace_cache import TRACES, trace_key
 
 try:
     from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, DataReturnMode
@@ -57,6 +69,13 @@ SAMPLES_W = {
 }
 
 class DijkstraVisualizer:
+    # Session keys of one step's state, the state panel's title and whether
+    # the run starts from a vertex. Subclasses (astar.py, union_find.py)
+    # override these and the engine hooks below.
+    KEYS = ("visited", "dist", "prev", "heap", "hpos", "current", "order", "edges", "ev", "fin", "step")
+    TITLE = "Dijkstra State"
+    HAS_START = True
+
     def __init__(self):
         self.ns = "dijkstra"
 
@@ -74,153 +93,154 @@ class DijkstraVisualizer:
         return W
 
     def _sanitize_weights(self, df):
-        df = pd.DataFrame(df).copy()
-        cols = [c for c in df.columns if not str(c).startswith("::")]
-        df = df.loc[:, cols]
-        idx = df.index.astype(str).tolist()
-        cols = pd.Index(df.columns).astype(str).tolist()
-        V = sorted(set(idx) | set(cols))
-        if len(V) == 0:
-            return pd.DataFrame(0.0, index=[], columns=[])
-        df.index = pd.Index(df.index).astype(str)
-        df.columns = pd.Index(df.columns).astype(str)
-        M = df.reindex(index=V, columns=V)
-        M = pd.to_numeric(M.stack(), errors="coerce").unstack()
-        M = M.replace([np.inf, -np.inf], 0).fillna(0.0)
-        M = M.clip(lower=0.0)
-        for i, v in enumerate(V):
-            M.iloc[i, i] = 0.0
-        M = np.minimum(M, M.T)
-        return M.astype(float)
+        return sanitize_weights(df)
 
     def _ensure_state(self, V, start_v, gkey):
         tag = f"{self.ns}_inited"
-        if (not st.session_state.get(tag)) or st.session_state.get(f"{self.ns}_gkey") != gkey or st.session_state.get(f"{self.ns}_start") != start_v:
-            st.session_state[f"{self.ns}_visited"] = {v: False for v in V}
-            st.session_state[f"{self.ns}_dist"] = {v: (0.0 if v == start_v else float('inf')) for v in V}
-            st.session_state[f"{self.ns}_prev"] = {v: None for v in V}
-            st.session_state[f"{self.ns}_current"] = None
-            st.session_state[f"{self.ns}_order"] = []
-            st.session_state[f"{self.ns}_edges"] = []
-            st.session_state[f"{self.ns}_tree_edges"] = set()
-            st.session_state[f"{self.ns}_step"] = 0
-            st.session_state[f"{self.ns}_exp"] = f'''<div class="step-content">
-<div class="step-header">Initialization</div>
-<div class="action">Start from <span class="vertex">{start_v if start_v else 'N/A'}</span></div>
-<div class="action">Set d[start]=0 and d[others]=∞</div>
-</div>'''
-            st.session_state[f"{self.ns}_fin"] = False
-            st.session_state[f"{self.ns}_hist"] = []
+        if (not st.session_state.get(tag)) or st.session_state.get(f"{self.ns}_gkey") != gkey or st.session_state.get(f"{self.ns}_start") != start_v \
+                or st.session_state.get(f"{self.ns}_run_key") != self._run_key(V):
+            st.session_state[f"{self.ns}_run_key"] = self._run_key(V)
+            self._restore(self._new_state(V, start_v))
+            st.session_state[f"{self.ns}_names"] = list(V)
+            st.session_state[f"{self.ns}_hist"] = StepHistory(tails=TAILS)
             st.session_state[f"{self.ns}_gkey"] = gkey
             st.session_state[f"{self.ns}_start"] = start_v
             st.session_state[tag] = True
             self._push()
+            st.session_state[f"{self.ns}_pos"] = 0
+
+    def _snapshot(self):
+        return {k: st.session_state[f"{self.ns}_{k}"] for k in self.KEYS}
 
     def _push(self):
-        h = {
-            "visited": copy.deepcopy(st.session_state[f"{self.ns}_visited"]),
-            "dist": copy.deepcopy(st.session_state[f"{self.ns}_dist"]),
-            "prev": copy.deepcopy(st.session_state[f"{self.ns}_prev"]),
-            "current": st.session_state[f"{self.ns}_current"],
-            "order": copy.deepcopy(st.session_state[f"{self.ns}_order"]),
-            "edges": copy.deepcopy(st.session_state[f"{self.ns}_edges"]),
-            "tree_edges": copy.deepcopy(st.session_state[f"{self.ns}_tree_edges"]),
-            "exp": st.session_state[f"{self.ns}_exp"],
-            "fin": st.session_state[f"{self.ns}_fin"],
-            "step": st.session_state[f"{self.ns}_step"],
-        }
-        st.session_state[f"{self.ns}_hist"].append(h)
+        st.session_state[f"{self.ns}_hist"].append(self._snapshot())
 
     def _restore(self, s):
-        st.session_state[f"{self.ns}_visited"] = copy.deepcopy(s["visited"])
-        st.session_state[f"{self.ns}_dist"] = copy.deepcopy(s["dist"])
-        st.session_state[f"{self.ns}_prev"] = copy.deepcopy(s["prev"])
-        st.session_state[f"{self.ns}_current"] = s["current"]
-        st.session_state[f"{self.ns}_order"] = copy.deepcopy(s["order"])
-        st.session_state[f"{self.ns}_edges"] = copy.deepcopy(s["edges"])
-        st.session_state[f"{self.ns}_tree_edges"] = copy.deepcopy(s["tree_edges"])
-        st.session_state[f"{self.ns}_exp"] = s["exp"]
-        st.session_state[f"{self.ns}_fin"] = s["fin"]
-        st.session_state[f"{self.ns}_step"] = s["step"]
-
-    def _graph_from_matrix(self, W):
-        V = list(W.index)
-        G = {u: [] for u in V}
-        for u in V:
-            for v in V:
-                if u != v:
-                    try:
-                        w = float(W.loc[u, v])
-                    except Exception:
-                        w = 0.0
-                    if w > 0:
-                        G[u].append((v, w))
-        return G
-
-    def _pick_min_unvisited(self, dist, visited):
-        cand = [(v, d) for v, d in dist.items() if not visited[v] and np.isfinite(d)]
-        if not cand:
-            return None
-        cand.sort(key=lambda x: (x[1], x[0]))
-        return cand[0][0]
+        for k in self.KEYS:
+            st.session_state[f"{self.ns}_{k}"] = s[k]
 
-    def _dijkstra_step(self, G):
-        if st.session_state[f"{self.ns}_fin"]:
+    # Engine hooks: a fresh state, one step, the whole run, and whatever
+    # besides the graph and start the run depends on (goal, heuristic).
+    def _new_state(self, V, start_v):
+        return init_dijkstra(len(V), intern(V).get(start_v))
+
+    def _step(self, state, G):
+        step_dijkstra(state, G)
+
+    def _run_all(self, V, G, start):
+        return run_dijkstra(G, start)
+
+    def _run_key(self, V):
+        return ()
+
+    def _goto(self, idx):
+        hist = st.session_state[f"{self.ns}_hist"]
+        idx = max(0, min(int(idx), len(hist) - 1))
+        self._restore(hist[idx])
+        st.session_state[f"{self.ns}_pos"] = idx
+
+    def _advance(self, G):
+        hist = st.session_state[f"{self.ns}_hist"]
+        if st.session_state[f"{self.ns}_pos"] < len(hist) - 1:
+            self._goto(st.session_state[f"{self.ns}_pos"] + 1)
+            return
+        self._dijkstra_step(G)
+        self._push()
+        st.session_state[f"{self.ns}_pos"] = len(hist) - 1
+
+    # A grid edit keeps the gkey (same vertex names) but changes the graph:
+    # the steps recorded past pos came from the old graph, so they are
+    # dropped and the run carries on from pos on the edited one.
+    def _sync_graph(self, G):
+        s = st.session_state
+        seen = s.get(f"{self.ns}_hist_g")
+        if G is None or (seen is not None and seen[0] is G):
+            return
+        key = trace_key(G.offsets, G.indices, G.weights)
+        if seen is not None and seen[1] != key:
+            s[f"{self.ns}_hist"].truncate(s[f"{self.ns}_pos"] + 1)
+        s[f"{self.ns}_hist_g"] = (G, key)
+
+    def _compile(self, V, G):
+        hist = st.session_state[f"{self.ns}_hist"]
+        if hist.peek("fin"):
             return
-        visited = st.session_state[f"{self.ns}_visited"]
+        pos = st.session_state[f"{self.ns}_pos"]
+        start = intern(V).get(st.session_state[f"{self.ns}_start"])
+        key = trace_key(self.ns, V, G.offsets, G.indices, G.weights, start, self._run_key(V))
+        st.session_state[f"{self.ns}_hist"] = TRACES.trace(key, lambda: self._run_all(V, G, start), TAILS)
+        self._goto(pos)
+
+    # Past the recorded history the engine runs in a tight loop on one working
+    # state; only the step landed on is restored and drawn. idx=None runs to
+    # the end.
+    def _seek(self, idx, G):
+        hist = st.session_state[f"{self.ns}_hist"]
+        if idx is None or idx >= len(hist):
+            self._goto(len(hist) - 1)
+            state = self._snapshot()
+            while (idx is None or len(hist) <= idx) and not state["fin"]:
+                self._step(state, G)
+                hist.append(state)
+            if idx is None:
+                idx = len(hist) - 1
+        self._goto(idx)
+
+    def _dijkstra_step(self, G):
+        state = self._snapshot()
+        self._step(state, G)
+        self._restore(state)
+
+    # Steps only record a small event; the HTML (including the O(V) distance
+    # table) is built for the step on screen.
+    def _dist_rows(self):
         dist = st.session_state[f"{self.ns}_dist"]
         prev = st.session_state[f"{self.ns}_prev"]
-        u = self._pick_min_unvisited(dist, visited)
-        st.session_state[f"{self.ns}_step"] += 1
-        if u is None:
-            st.session_state[f"{self.ns}_fin"] = True
-            order_str = " → ".join(st.session_state[f"{self.ns}_order"])
-            rows = []
-            for v in sorted(dist.keys()):
-                dv = ("∞" if not np.isfinite(dist[v]) else f"{dist[v]:.2f}")
-                pr = prev[v] if prev[v] is not None else "-"
-                rows.append(f"{v}: d={dv}, prev={pr}")
-            body = "<br>".join(rows)
-            st.session_state[f"{self.ns}_exp"] = f'''<div class="step-content"><div class="step-header">Done</div><div class="completion">✓ No more reachable vertices<br><strong>Process Order:</strong> {order_str}</div><div style="margin-top:0.5rem">{body}</div></div>'''
-            return
-        st.session_state[f"{self.ns}_current"] = u
-        visited[u] = True
-        st.session_state[f"{self.ns}_order"].append(u)
-        new_edges = []
+        names = st.session_state[f"{self.ns}_names"]
+        rows = []
+        for i, v in enumerate(names):
+            dv = ("∞" if not np.isfinite(dist[i]) else f"{dist[i]:.2f}")
+            pr = names[prev[i]] if prev[i] >= 0 else "-"
+            rows.append(f"{v}: d={dv}, prev={pr}")
+        return "<br>".join(rows)
+
+    def _exp_html(self, ev):
+        kind = ev[0]
+        names = st.session_state[f"{self.ns}_names"]
+        if kind == "init":
+            start_v = names[ev[1]] if ev[1] is not None else None
+            return f'''<div class="step-content">
+<div class="step-header">Initialization</div>
+<div class="action">Start from <span class="vertex">{start_v if start_v else 'N/A'}</span></div>
+<div class="action">Set d[start]=0 and d[others]=∞</div>
+</div>'''
+        if kind == "done":
+            order_str = " → ".join(names[x] for x in st.session_state[f"{self.ns}_order"])
+            body = self._dist_rows()
+            return f'''<div class="step-content"><div class="step-header">Done</div><div class="completion">✓ No more reachable vertices<br><strong>Process Order:</strong> {order_str}</div><div style="margin-top:0.5rem">{body}</div></div>'''
+        u, relax = names[ev[1]], ev[2]
+        du = float(st.session_state[f"{self.ns}_dist"][ev[1]])
         exp = [f'<div class="step-content"><div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>']
-        exp.append(f'<div class="action">Pick min unvisited: <span class="vertex">{u}</span> with d[{u}]={(dist[u] if np.isfinite(dist[u]) else "∞")}</div>')
-        nbrs = sorted(G.get(u, []), key=lambda x: x[0])
-        if not nbrs:
+        exp.append(f'<div class="action">Pick min unvisited: <span class="vertex">{u}</span> with d[{u}]={(du if np.isfinite(du) else "∞")}</div>')
+        if not relax:
             exp.append('<div class="action">No neighbors to relax</div>')
         else:
             exp.append('<div style="margin-top:0.5rem">Relaxation:</div>')
-            for v, w in nbrs:
-                if visited[v]:
+            for r in relax:
+                v = names[r[0]]
+                if len(r) == 1:
                     exp.append(f'<div style="color:var(--text-muted);margin-left:1rem">→ {v} already visited</div>')
                     continue
-                old = dist[v]
-                cand = (dist[u] + w) if np.isfinite(dist[u]) else float('inf')
-                cond = cand < old
-                if cond:
-                    dist[v] = cand
-                    prev[v] = u
-                    new_edges.append((u, v))
-                    exp.append(f'<div class="action" style="margin-left:1rem">d[{v}] > d[{u}] + w({u},{v}) ⇒ {("∞" if not np.isfinite(old) else f"{old:.2f}")} > {dist[u]:.2f} + {w:.2f} = {cand:.2f} ✓ update d[{v}]={cand:.2f}, prev[{v}]={u}</div>')
+                w, old, cand = r[1], r[2], r[3]
+                if cand < old:
+                    exp.append(f'<div class="action" style="margin-left:1rem">d[{v}] > d[{u}] + w({u},{v}) ⇒ {("∞" if not np.isfinite(old) else f"{old:.2f}")} > {du:.2f} + {w:.2f} = {cand:.2f} ✓ update d[{v}]={cand:.2f}, prev[{v}]={u}</div>')
                 else:
-                    rhs = (f"{dist[u]:.2f} + {w:.2f} = {cand:.2f}") if np.isfinite(dist[u]) else "∞"
+                    rhs = (f"{du:.2f} + {w:.2f} = {cand:.2f}") if np.isfinite(du) else "∞"
                     exp.append(f'<div class="action" style="margin-left:1rem;color:var(--text-muted)">d[{v}] ≤ d[{u}] + w({u},{v}) ⇒ {("∞" if not np.isfinite(old) else f"{old:.2f}")} ≤ {rhs} (no update)</div>')
-        st.session_state[f"{self.ns}_edges"] = new_edges
-        st.session_state[f"{self.ns}_tree_edges"] = {(prev[x], x) for x in prev if prev[x] is not None}
-        dv = st.session_state[f"{self.ns}_dist"]
-        rows = []
-        for k in sorted(dv.keys()):
-            dvk = ("∞" if not np.isfinite(dv[k]) else f"{dv[k]:.2f}")
-            pr = prev[k] if prev[k] is not None else "-"
-            rows.append(f"{k}: d={dvk}, prev={pr}")
         exp.append('<div style="margin-top:0.5rem;color:var(--text-secondary)">Distances/Parents:</div>')
-        exp.append('<div class="action" style="margin-left:1rem">' + "<br>".join(rows) + '</div>')
+        exp.append('<div class="action" style="margin-left:1rem">' + self._dist_rows() + '</div>')
         exp.append('</div>')
-        st.session_state[f"{self.ns}_exp"] = "".join(exp)
+        return "".join(exp)
 
     def _ag_clean(self, original_df, ag_out):
         df_out = pd.DataFrame(ag_out.data if hasattr(ag_out, "data") else ag_out)
@@ -230,6 +250,8 @@ class DijkstraVisualizer:
         df_out.index = list(original_df.index)
         return df_out
 
+    # The grid's matrix as edited, unsanitized: apply_grid_edits reads it
+    # against the stored one and patches only the cells that changed.
     def _ag_matrix(self, df):
         if AG_OK:
             g = GridOptionsBuilder.from_dataframe(df)
@@ -237,22 +259,33 @@ class DijkstraVisualizer:
             g.configure_grid_options(domLayout="autoHeight", suppressMovableColumns=True, rowSelection="multiple", rowHeight=36, enableRangeSelection=True)
             ag_out = AgGrid(df, gridOptions=g.build(), theme="streamlit", height=300, fit_columns_on_grid_load=True, update_mode=GridUpdateMode.VALUE_CHANGED, data_return_mode=DataReturnMode.AS_INPUT, allow_unsafe_jscode=True)
             cleaned = self._ag_clean(df, ag_out)
-            res = self._sanitize_weights(cleaned)
+            res = cleaned
         else:
             raw = st.data_editor(df, height=300, key=f"{self.ns}_editor", use_container_width=True, num_rows="dynamic")
-            res = self._sanitize_weights(raw)
+            res = raw
         return res
 
-    def _state_table(self, V):
+    # With all-pairs results, "Final" is the finished distance from the
+    # current start, read from its row instead of running to the end.
+    def _state_table(self, V, apsp=None):
+        names = st.session_state[f"{self.ns}_names"]
+        ids = intern(names)
         vis = st.session_state[f"{self.ns}_visited"]
         dist = st.session_state[f"{self.ns}_dist"]
         prev = st.session_state[f"{self.ns}_prev"]
         df = pd.DataFrame({
             "Vertex": V,
-            "Visited": ["✓" if vis.get(v, False) else "-" for v in V],
-            "Dist": [("∞" if not np.isfinite(dist.get(v, float('inf'))) else f"{dist.get(v, float('inf')):.2f}") for v in V],
-            "Prev": [prev.get(v, None) if prev.get(v, None) is not None else "-" for v in V],
+            "Visited": ["✓" if v in ids and vis[ids[v]] else "-" for v in V],
+            "Dist": [(f"{dist[ids[v]]:.2f}" if v in ids and np.isfinite(dist[ids[v]]) else "∞") for v in V],
+            "Prev": [(names[prev[ids[v]]] if v in ids and prev[ids[v]] >= 0 else "-") for v in V],
         })
+        start = ids.get(st.session_state.get(f"{self.ns}_start"))
+        if apsp is not None and start is not None:
+            row = apsp[0][start]
+            df["Final"] = [(f"{row[ids[v]]:.2f}" if v in ids and np.isfinite(row[ids[v]]) else "∞") for v in V]
+        self._show_table(df)
+
+    def _show_table(self, df):
         if AG_OK:
             g = GridOptionsBuilder.from_dataframe(df)
             g.configure_grid_options(domLayout="autoHeight", suppressMovableColumns=True, rowSelection="none", enableSorting=False, rowHeight=34)
@@ -261,6 +294,86 @@ class DijkstraVisualizer:
         else:
             st.dataframe(df, height=240, use_container_width=True)
 
+    # Priority queue drawn level by level from the root; each entry is a
+    # vertex with its key (the tentative distance unless key says otherwise).
+    def _heap_panel(self, limit=31, heap="heap", key="dist", title="Priority Queue (min-heap)"):
+        names = st.session_state[f"{self.ns}_names"]
+        heap = st.session_state[f"{self.ns}_{heap}"]
+        dist = st.session_state[f"{self.ns}_{key}"]
+        st.markdown(f'<div class="frame-title">{title}</div>', unsafe_allow_html=True)
+        if not heap:
+            st.markdown('<div class="frame-hint">Heap is empty</div>', unsafe_allow_html=True)
+            return
+        rows, i, width = [], 0, 1
+        while i < min(len(heap), limit):
+            level = heap[i:min(i + width, limit)]
+            cells = "".join(f'<span class="heap-node"><b>{names[v]}</b>{dist[v]:.2f}</span>' for v in level)
+            rows.append(f'<div class="heap-level">{cells}</div>')
+            i += width
+            width *= 2
+        if len(heap) > limit:
+            rows.append(f'<div class="frame-hint">+{len(heap) - limit} more</div>')
+        st.markdown(f'<div class="heap-panel">{"".join(rows)}</div>', unsafe_allow_html=True)
+
+    # Controls after the start vertex; Dijkstra has none.
+    def _target_controls(self, V, G):
+        pass
+
+    # Panels under the state table.
+    def _side_panels(self, V, G, apsp):
+        self._heap_panel()
+        self._apsp_panel(V, apsp)
+
+    # All-pairs (dist, pred, info) for G when precompute is switched on,
+    # computed once per graph and method and shared through APSP.
+    def _apsp(self, G):
+        s = st.session_state
+        if not s.get(f"{self.ns}_apsp_on") or G is None:
+            return None
+        method = s.get(f"{self.ns}_apsp_method", "Auto")
+        key = apsp_key(G, method)
+        res = APSP.get(key)
+        if res is None:
+            bar = st.progress(0.0, text="Computing all-pairs shortest paths")
+            try:
+                res = APSP.put(key, all_pairs(G, method, progress=lambda f: bar.progress(min(1.0, f), text="Computing all-pairs shortest paths")))
+            except APSPError as e:
+                st.warning(f"All-pairs precompute skipped: {e}")
+            bar.empty()
+        return res
+
+    # Precompute switch and an s -> t query answered from the matrices.
+    def _apsp_panel(self, V, apsp, limit=40):
+        s = st.session_state
+        st.markdown('<div class="frame-title">All-Pairs Shortest Paths</div>', unsafe_allow_html=True)
+        c1, c2 = st.columns([3, 2])
+        c1.checkbox("Precompute all pairs", key=f"{self.ns}_apsp_on")
+        c2.selectbox("Method", METHODS, key=f"{self.ns}_apsp_method", label_visibility="collapsed")
+        if apsp is None:
+            st.markdown('<div class="frame-hint">Runs every source once; then switching the start vertex or asking for any path needs no re-run.</div>', unsafe_allow_html=True)
+            return
+        dist, pred, info = apsp
+        st.caption(f"{info['method']} · {info['seconds']:.2f}s · {info['bytes'] / 2**20:,.1f} MB")
+        if s.get(f"{self.ns}_q_from") not in V:
+            s[f"{self.ns}_q_from"] = s.get(f"{self.ns}_start", V[0])
+        if s.get(f"{self.ns}_q_to") not in V:
+            s[f"{self.ns}_q_to"] = V[-1]
+        q1, q2 = st.columns(2)
+        a = q1.selectbox("From", V, key=f"{self.ns}_q_from")
+        b = q2.selectbox("To", V, key=f"{self.ns}_q_to")
+        ids = intern(V)
+        path = shortest_path(pred, ids[a], ids[b])
+        if not path:
+            st.markdown(f'<div class="apsp-path">{b} is not reachable from {a}</div>', unsafe_allow_html=True)
+            return
+        shown = [f"<b>{V[v]}</b>" for v in path]
+        if len(shown) > limit:
+            shown = shown[:limit // 2] + [f"… {len(shown) - limit} more …"] + shown[-(limit // 2):]
+        st.markdown(
+            f'<div class="apsp-path">{" → ".join(shown)}<span>&nbsp;d = {dist[ids[a], ids[b]]:.2f} · {len(path) - 1} edges</span></div>',
+            unsafe_allow_html=True,
+        )
+
     def _html_to_plain(self, html_text):
         import re
         text = html_text
@@ -275,112 +388,111 @@ class DijkstraVisualizer:
         text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
         return text.strip()
 
-    def _draw(self, V, W, start_v):
+    # Force layout as an (n, 2) array in id order. Reruns and exported frames
+    # of the same graph reuse the session's last one. A graph not seen yet
+    # starts from the one last drawn here, so Add Vertex only re-settles the
+    # new vertex's neighbourhood; that result depends on the session's
+    # history and stays in the session. Only from-scratch layouts are shared
+    # between sessions, in LAYOUTS under the graph's structural key.
+    def _layout(self, V, G):
+        if len(V) <= 1:
+            return np.full((len(V), 2), 0.5)
+        key = layout_key(V, G)
+        prev = st.session_state.get(f"{self.ns}_layout")
+        if prev is not None and len(prev) == 3 and st.session_state.get(f"{self.ns}_layout_key") == key:
+            return prev[2]
+        P = update_layout(V, G, prev, lambda: LAYOUTS.layout(key, lambda: force_layout(G)))
+        st.session_state[f"{self.ns}_layout"] = (list(V), G, P)
+        st.session_state[f"{self.ns}_layout_key"] = key
+        return P
+
+    # Shortest-path tree found so far as (prev, vertex) id pairs.
+    def _tree(self):
+        prev = np.asarray(st.session_state[f"{self.ns}_prev"])
+        at = np.flatnonzero(prev >= 0)
+        return np.stack([prev[at], at], 1)
+
+    # Vertices waiting in the heap, drawn as the frontier.
+    def _frontier(self):
+        return st.session_state[f"{self.ns}_hpos"] >= 0
+
+    # Edges to highlight: the ones relaxed this step and the tree.
+    def _highlighted(self):
+        edges = np.asarray(st.session_state[f"{self.ns}_edges"], dtype=np.int64).reshape(-1, 2)
+        return np.concatenate([edges, self._tree()])
+
+    # Current step on ax, drawn in batches (components/graph_draw.py), in
+    # level of detail above lod_vertices; nothing above the draw limit.
+    def _plot(self, ax, V, G, start_v, **style):
+        if len(V) == 0 or len(V) > GRAPH_LAYOUT_CONFIG["max_draw_vertices"]:
+            return
+        s = st.session_state
+        cur = None if s[f"{self.ns}_fin"] else s[f"{self.ns}_current"]
+        start = V.index(start_v) if start_v in V else None
+        src, dst, w = G.edge_pairs()
+        if len(V) > GRAPH_LAYOUT_CONFIG["lod_vertices"]:
+            draw_graph_lod(
+                ax, self._layout(V, G), src, dst, s[f"{self.ns}_visited"], self._frontier(),
+                cur, start, s[f"{self.ns}_edges"], self._tree(), density=s.get("sb_density", False),
+            )
+            return
+        ec, ew = edge_styles(len(V), src, dst, self._highlighted())
+        nc = vertex_colors(s[f"{self.ns}_visited"], cur, start)
+        draw_graph(ax, self._layout(V, G), src, dst, nc, ec, ew, labels=V, weights=w, **style)
+
+    def _draw(self, V, G, start_v):
         if len(V) == 0:
             st.info("No vertices to display")
             return
+        if len(V) > GRAPH_LAYOUT_CONFIG["max_draw_vertices"]:
+            st.info(f"{len(V):,} vertices are too many to draw; the state table and explanation still follow every step.")
+            return
         fig, ax = plt.subplots(figsize=(7.6, 5.0))
         fig.patch.set_facecolor(COLORS["background"])
-        Gx = nx.Graph()
-        for u in V:
-            Gx.add_node(u)
-        for u in V:
-            for v in V:
-                try:
-                    on = (u < v) and (float(W.loc[u, v]) > 0)
-                except Exception:
-                    on = False
-                if on:
-                    Gx.add_edge(u, v, weight=float(W.loc[u, v]))
-        pos = nx.spring_layout(Gx, seed=4, k=1.25) if len(Gx) > 1 else {V[0]: (0.5, 0.5)}
-        node_colors = []
-        for v in Gx.nodes():
-            if v == start_v:
-                node_colors.append(COLORS["source"])
-            elif st.session_state[f"{self.ns}_current"] == v and not st.session_state[f"{self.ns}_fin"]:
-                node_colors.append(COLORS["current"])
-            elif st.session_state[f"{self.ns}_visited"].get(v, False):
-                node_colors.append(COLORS["visited"])
-            else:
-                node_colors.append(COLORS["unvisited"])
-        ec, ew = [], []
-        hi = set(st.session_state[f"{self.ns}_edges"]) | set(st.session_state[f"{self.ns}_tree_edges"])
-        for (u, v) in Gx.edges():
-            if (u, v) in hi or (v, u) in hi:
-                ec.append(GRAPH_LAYOUT_CONFIG["edge_color_highlight"])
-                ew.append(GRAPH_LAYOUT_CONFIG["edge_width_highlight"])
-            else:
-                ec.append(GRAPH_LAYOUT_CONFIG["edge_color_regular"])
-                ew.append(GRAPH_LAYOUT_CONFIG["edge_width_regular"])
-        nx.draw_networkx_nodes(Gx, pos, node_color=node_colors, node_size=GRAPH_LAYOUT_CONFIG["node_size"], edgecolors=GRAPH_LAYOUT_CONFIG["node_border_color"], linewidths=GRAPH_LAYOUT_CONFIG["node_border_width"], ax=ax)
-        nx.draw_networkx_labels(Gx, pos, font_size=GRAPH_LAYOUT_CONFIG["font_size"], font_weight=GRAPH_LAYOUT_CONFIG["font_weight"], font_color=GRAPH_LAYOUT_CONFIG["font_color"], ax=ax)
-        for i, e in enumerate(Gx.edges()):
-            nx.draw_networkx_edges(Gx, pos, [e], edge_color=[ec[i]], width=[ew[i]], ax=ax)
-        labels = {(u, v): f'{Gx[u][v]["weight"]:.0f}' if abs(Gx[u][v]["weight"]-round(Gx[u][v]["weight"]))<1e-9 else f'{Gx[u][v]["weight"]:.2f}' for (u, v) in Gx.edges()}
-        nx.draw_networkx_edge_labels(Gx, pos, edge_labels=labels, font_color="#ff6b6b", font_size=GRAPH_LAYOUT_CONFIG["font_size"], ax=ax)
+        self._plot(ax, V, G, start_v)
         ax.set_facecolor(COLORS["background"])
         ax.axis("off")
         plt.tight_layout()
         st.pyplot(fig)
         plt.close(fig)
 
-    def _frame_figure(self, V, W, start_v, step_text):
+    def _frame_figure(self, V, G, start_v, step_text):
         fig = plt.figure(figsize=(8.4, 7.4), layout="constrained")
         fig.patch.set_facecolor(COLORS["background"])
         gs = fig.add_gridspec(2, 1, height_ratios=[3, 1])
         ax = fig.add_subplot(gs[0])
-        Gx = nx.Graph()
-        for u in V:
-            Gx.add_node(u)
-        for u in V:
-            for v in V:
-                try:
-                    on = (u < v) and (float(W.loc[u, v]) > 0)
-                except Exception:
-                    on = False
-                if on:
-                    Gx.add_edge(u, v, weight=float(W.loc[u, v]))
-        pos = nx.spring_layout(Gx, seed=4, k=1.25) if len(Gx) > 1 else ({V[0]: (0.5, 0.5)} if V else {})
-        node_colors = []
-        for v in Gx.nodes():
-            if v == start_v:
-                node_colors.append(COLORS["source"])
-            elif st.session_state[f"{self.ns}_current"] == v and not st.session_state[f"{self.ns}_fin"]:
-                node_colors.append(COLORS["current"])
-            elif st.session_state[f"{self.ns}_visited"].get(v, False):
-                node_colors.append(COLORS["visited"])
-            else:
-                node_colors.append(COLORS["unvisited"])
-        ec, ew = [], []
-        hi = set(st.session_state[f"{self.ns}_edges"]) | set(st.session_state[f"{self.ns}_tree_edges"])
-        for (u, v) in Gx.edges():
-            if (u, v) in hi or (v, u) in hi:
-                ec.append(GRAPH_LAYOUT_CONFIG["edge_color_highlight"])
-                ew.append(GRAPH_LAYOUT_CONFIG["edge_width_highlight"])
-            else:
-                ec.append(GRAPH_LAYOUT_CONFIG["edge_color_regular"])
-                ew.append(GRAPH_LAYOUT_CONFIG["edge_width_regular"])
-        nx.draw_networkx_nodes(Gx, pos, node_color=node_colors, node_size=950, edgecolors="#9aa4d3", linewidths=2, ax=ax)
-        nx.draw_networkx_labels(Gx, pos, font_size=13, font_weight="bold", font_color="#eef3ff", ax=ax)
-        for i, e in enumerate(Gx.edges()):
-            nx.draw_networkx_edges(Gx, pos, [e], edge_color=[ec[i]], width=[ew[i]], ax=ax)
-        labels = {(u, v): f'{Gx[u][v]["weight"]:.0f}' if abs(Gx[u][v]["weight"]-round(Gx[u][v]["weight"]))<1e-9 else f'{Gx[u][v]["weight"]:.2f}' for (u, v) in Gx.edges()}
-        nx.draw_networkx_edge_labels(Gx, pos, edge_labels=labels, font_color="#ff6b6b", font_size=12, ax=ax)
+        self._plot(ax, V, G, start_v, node_size=950, node_border_color="#9aa4d3", font_size=13, edge_label_size=12)
         ax.set_facecolor(COLORS["background"])
         ax.set_xticks([]); ax.set_yticks([])
         ax2 = fig.add_subplot(gs[1])
         ax2.set_facecolor("#0d1220"); ax2.set_xticks([]); ax2.set_yticks([])
-        plain_text = self._html_to_plain(step_text)
+        plain_text = clip_text(self._html_to_plain(step_text))
         ax2.text(0.02, 0.95, "Step-by-step", fontsize=12, color="#9fb3ff", fontweight="bold", va="top")
         ax2.text(0.02, 0.75, plain_text, fontsize=10, color="#e6ecff", va="top", family="monospace", wrap=True, linespacing=1.5)
         return fig
 
-    def _export(self, fmt, fps, V, W, start_v):
+    # Auto-play renders the next batch of frames, from the cursor on, once
+    # and lets the browser play them. The cursor stays put; it only moves
+    # when the player reports the step it reached (player_reached), and the
+    # rerun that follows sends the batch starting there.
+    def _autoplay(self, speed, V, G, start_v):
+        pos = st.session_state[f"{self.ns}_pos"]
+        self._seek(pos + PLAYER_BATCH - 1, G)
+        end = st.session_state[f"{self.ns}_pos"]
+        more = not st.session_state.get(f"{self.ns}_fin", False)
+        frames = []
+        for s in st.session_state[f"{self.ns}_hist"].states(pos, end + 1):
+            self._restore(s)
+            frames.append(figure_png(self._frame_figure(V, G, start_v, self._exp_html(s["ev"]))))
+        self._goto(pos)
+        render_player(frames, speed, self.ns, first_step=pos, more=more)
+
+    def _export(self, fmt, fps, V, G, start_v):
         frames = []
         saved = []
-        for s in st.session_state[f"{self.ns}_hist"]:
+        for s in st.session_state[f"{self.ns}_hist"].states(0, st.session_state[f"{self.ns}_pos"] + 1):
             self._restore(s)
-            fig = self._frame_figure(V, W, start_v, s["exp"])
+            fig = self._frame_figure(V, G, start_v, self._exp_html(s["ev"]))
             buf = io.BytesIO()
             fig.savefig(buf, format="png", dpi=140, facecolor=fig.get_facecolor())
             plt.close(fig)
@@ -390,9 +502,9 @@ class DijkstraVisualizer:
         if fmt == "PDF":
             path = os.path.join(outdir, f"{self.ns}_run.pdf")
             with PdfPages(path) as pdf:
-                for s in st.session_state[f"{self.ns}_hist"]:
+                for s in st.session_state[f"{self.ns}_hist"].states(0, st.session_state[f"{self.ns}_pos"] + 1):
                     self._restore(s)
-                    fig = self._frame_figure(V, W, start_v, s["exp"])
+                    fig = self._frame_figure(V, G, start_v, self._exp_html(s["ev"]))
                     pdf.savefig(fig, facecolor=fig.get_facecolor())
                     plt.close(fig)
             saved.append(path)
@@ -419,79 +531,114 @@ class DijkstraVisualizer:
         src = s.get("sb_src", "Sample graph")
         sample = s.get("sb_sample", "Straight Chain")
         auto = s.get("sb_auto", False)
+        precompute = s.get("sb_precompute", False)
         speed = s.get("sb_speed", 0.8)
         next_clicked = s.get("sb_next", False)
+        ff_clicked = s.get("sb_ff", False)
+        end_clicked = s.get("sb_end", False)
         back_clicked = s.get("sb_back", False)
         reset_clicked = s.get("sb_reset", False)
         export_clicked = s.get("sb_export", False)
 
-        if src == "Sample graph":
-            W = self._sample_df(sample)
-            s.setdefault(f"{self.ns}_matrix_df", W.copy())
-            hint = f"Sample: {sample}. Edit weights (0 = no edge). Symmetry is enforced."
+        imported = None
+        if src == "Import file":
+            imported = load_imported_graph(self.ns, weighted=True)
+            W, G = None, (imported[1] if imported else None)
+            V = imported[0] if imported else []
+            gkey = f"import::{s[f'{self.ns}_import'][0]}" if imported else "import::"
+        elif src == "Generate":
+            imported = load_generated_graph(self.ns, weighted=True)
+            W, G = None, (imported[1] if imported else None)
+            V = imported[0] if imported else []
+            gkey = f"generate::{s[f'{self.ns}_generated'][0]}"
         else:
-            if f"{self.ns}_matrix_df" not in s:
-                Vnames = list(string.ascii_uppercase[:6])
-                base = pd.DataFrame(0.0, index=Vnames, columns=Vnames, dtype=float)
-                s[f"{self.ns}_matrix_df"] = base.copy()
-            W = s[f"{self.ns}_matrix_df"].copy()
-            hint = "Edit weights (0 = no edge). Use Add/Delete to change vertices. Symmetry is enforced. Nonnegative only."
-
-        W = self._sanitize_weights(W)
-        V = list(W.index)
+            if src == "Sample graph":
+                W = self._sanitize_weights(self._sample_df(sample))
+                s.setdefault(f"{self.ns}_matrix_df", W.copy())
+                hint = f"Sample: {sample}. Edit weights (0 = no edge). Symmetry is enforced."
+            else:
+                if f"{self.ns}_matrix_df" not in s:
+                    Vnames = list(string.ascii_uppercase[:6])
+                    base = pd.DataFrame(0.0, index=Vnames, columns=Vnames, dtype=float)
+                    s[f"{self.ns}_matrix_df"] = base.copy()
+                W = s[f"{self.ns}_matrix_df"]
+                hint = "Edit weights (0 = no edge). Use Add/Delete to change vertices. Symmetry is enforced. Nonnegative only."
+
+            V = list(W.index)
+            gkey = f"{src}::{sample or 'custom'}::{','.join(V)}"
         if V and s.get(f"{self.ns}_start_sel") not in V:
             s[f"{self.ns}_start_sel"] = V[0]
         sv = s.get(f"{self.ns}_start_sel", V[0] if V else None)
-        gkey = f"{src}::{sample or 'custom'}::{','.join(V)}"
         self._ensure_state(V, sv if V else None, gkey)
 
         col1, col2 = st.columns(2)
         with col1:
-            st.markdown('<div class="frame-title">Weight Matrix</div>', unsafe_allow_html=True)
-            st.markdown(f'<div class="frame-hint">{hint}</div>', unsafe_allow_html=True)
-            if src != "Sample graph":
-                col_add, col_del = st.columns(2)
-                with col_add:
-                    new_vertex = st.text_input("Add vertex", key=f"{self.ns}_add_vertex", placeholder="Enter name")
-                    if st.button("Add Vertex", key=f"{self.ns}_btn_add"):
-                        nv = (new_vertex or "").strip()
-                        if nv and nv not in W.index:
-                            V_new = list(W.index) + [nv]
-                            W2 = pd.DataFrame(0.0, index=V_new, columns=V_new, dtype=float)
-                            W2.loc[W.index, W.columns] = W
-                            s[f"{self.ns}_matrix_df"] = self._sanitize_weights(W2)
-                            s[f"{self.ns}_inited"] = False
-                            st.rerun()
-                with col_del:
-                    if len(list(W.index)) > 1:
-                        del_vertex = st.selectbox("Delete vertex", list(W.index), key=f"{self.ns}_del_vertex")
-                        if st.button("Delete Vertex", key=f"{self.ns}_btn_del"):
-                            if del_vertex in W.index:
-                                W2 = W.drop(index=[del_vertex], columns=[del_vertex])
-                                s[f"{self.ns}_matrix_df"] = self._sanitize_weights(W2)
-                                if s.get(f"{self.ns}_start_sel") == del_vertex:
-                                    left = list(W2.index)
-                                    if left:
-                                        s[f"{self.ns}_start_sel"] = left[0]
+            if src == "Import file":
+                st.markdown('<div class="frame-title">Imported Graph</div>', unsafe_allow_html=True)
+                if imported:
+                    render_import_report(imported[2])
+                else:
+                    st.markdown('<div class="frame-hint">Choose an edge list, CSV, Matrix Market or GraphML file in the sidebar.</div>', unsafe_allow_html=True)
+            elif src == "Generate":
+                st.markdown('<div class="frame-title">Generated Graph</div>', unsafe_allow_html=True)
+                if imported:
+                    render_generate_report(imported[2])
+                else:
+                    st.markdown('<div class="frame-hint">Adjust the generator settings in the sidebar.</div>', unsafe_allow_html=True)
+            else:
+                st.markdown('<div class="frame-title">Weight Matrix</div>', unsafe_allow_html=True)
+                st.markdown(f'<div class="frame-hint">{hint}</div>', unsafe_allow_html=True)
+                if src != "Sample graph":
+                    col_add, col_del = st.columns(2)
+                    with col_add:
+                        new_vertex = st.text_input("Add vertex", key=f"{self.ns}_add_vertex", placeholder="Enter name")
+                        if st.button("Add Vertex", key=f"{self.ns}_btn_add"):
+                            nv = (new_vertex or "").strip()
+                            if nv and nv not in W.index:
+                                add_vertex(self.ns, W, nv, weighted=True)
                                 s[f"{self.ns}_inited"] = False
                                 st.rerun()
-            W = self._ag_matrix(W)
-            W = self._sanitize_weights(W)
-            s[f"{self.ns}_matrix_df"] = W.copy()
+                    with col_del:
+                        if len(list(W.index)) > 1:
+                            del_vertex = st.selectbox("Delete vertex", list(W.index), key=f"{self.ns}_del_vertex")
+                            if st.button("Delete Vertex", key=f"{self.ns}_btn_del"):
+                                if del_vertex in W.index:
+                                    W2, _ = delete_vertex(self.ns, W, del_vertex, weighted=True)
+                                    if s.get(f"{self.ns}_start_sel") == del_vertex:
+                                        left = list(W2.index)
+                                        if left:
+                                            s[f"{self.ns}_start_sel"] = left[0]
+                                    s[f"{self.ns}_inited"] = False
+                                    st.rerun()
+                W, G = apply_grid_edits(self.ns, W, self._ag_matrix(W), weighted=True)
 
         with col2:
-            st.markdown('<div class="frame-title">Dijkstra State</div>', unsafe_allow_html=True)
-            V = list(W.index)
+            st.markdown(f'<div class="frame-title">{self.TITLE}</div>', unsafe_allow_html=True)
+            if W is not None:
+                V = list(W.index)
+                gkey = f"{src}::{sample or 'custom'}::{','.join(V)}"
             if V and s.get(f"{self.ns}_start_sel") not in V:
                 s[f"{self.ns}_start_sel"] = V[0]
-            sv = st.selectbox("Start vertex", V, index=(0 if V else 0), key=f"{self.ns}_start_sel", disabled=(len(V) == 0), label_visibility="collapsed")
-            gkey = f"{src}::{sample or 'custom'}::{','.join(V)}"
+            sv = None
+            if self.HAS_START:
+                sv = st.selectbox("Start vertex", V, index=(0 if V else 0), key=f"{self.ns}_start_sel", disabled=(len(V) == 0), label_visibility="collapsed")
+            if V:
+                self._target_controls(V, G)
             self._ensure_state(V, sv if V else None, gkey)
+            self._sync_graph(G)
+            if precompute and V:
+                self._compile(V, G)
+            seek = st.session_state.pop(f"{self.ns}_seek", None)
+            if seek is None:
+                seek = player_reached(self.ns)
+            if seek is not None and V:
+                self._seek(seek, G)
+            apsp = self._apsp(G) if V else None
             if V:
-                self._state_table(V)
+                self._state_table(V, apsp)
             else:
                 st.info("No vertices available")
-            visited_count = sum(st.session_state.get(f"{self.ns}_visited", {}).values()) if V else 0
+            visited_count = int(st.session_state[f"{self.ns}_visited"].sum()) if V else 0
             remaining = (len(V) - visited_count) if V else 0
             status = "Completed" if st.session_state.get(f"{self.ns}_fin", False) else "Running"
             cls = "ok" if status == "Completed" else "run"
@@ -503,39 +650,44 @@ class DijkstraVisualizer:
                 <div class="pill"><div class="h">Status</div><div class="v {cls}">{status}</div></div>
             </div>
             ''', unsafe_allow_html=True)
+            if V:
+                self._side_panels(V, G, apsp)
 
-        col3, col4 = st.columns(2)
-        with col3:
-            st.markdown('<div class="frame-title">Graph Visualization</div>', unsafe_allow_html=True)
-            self._draw(list(W.index), W, st.session_state.get(f"{self.ns}_start"))
-            st.markdown('<div class="legend"><span><i style="background:#7c4dff"></i>Source</span><span><i style="background:#34d399"></i>Visited</span><span><i style="background:#f59e0b"></i>Current</span><span><i style="background:#3a3f55"></i>Unvisited</span><span><i style="background:#ff6b6b"></i>Weights</span></div>', unsafe_allow_html=True)
-        with col4:
-            st.markdown('<div class="frame-title">Step-by-Step Explanation</div>', unsafe_allow_html=True)
-            exp_html = st.session_state.get(f'{self.ns}_exp', '')
-            st.markdown(f'<div class="step-explanation">{exp_html}</div>', unsafe_allow_html=True)
-
-        manual = next_clicked or back_clicked or reset_clicked
-        if next_clicked and not st.session_state.get(f"{self.ns}_fin", False) and len(W.index) > 0:
-            G = self._graph_from_matrix(W)
-            self._dijkstra_step(G)
-            self._push()
+        manual = next_clicked or back_clicked or reset_clicked or ff_clicked or end_clicked
+        if auto and not manual and not st.session_state.get(f"{self.ns}_fin", False) and len(V) > 0:
+            self._autoplay(speed, V, G, st.session_state.get(f"{self.ns}_start"))
+        else:
+            col3, col4 = st.columns(2)
+            with col3:
+                st.markdown('<div class="frame-title">Graph Visualization</div>', unsafe_allow_html=True)
+                self._draw(V, G, st.session_state.get(f"{self.ns}_start"))
+                st.markdown('<div class="legend"><span><i style="background:#7c4dff"></i>Source</span><span><i style="background:#34d399"></i>Visited</span><span><i style="background:#f59e0b"></i>Current</span><span><i style="background:#3a3f55"></i>Unvisited</span><span><i style="background:#ff6b6b"></i>Weights</span></div>', unsafe_allow_html=True)
+            with col4:
+                st.markdown('<div class="frame-title">Step-by-Step Explanation</div>', unsafe_allow_html=True)
+                exp_html = self._exp_html(st.session_state[f'{self.ns}_ev'])
+                st.markdown(f'<div class="step-explanation">{exp_html}</div>', unsafe_allow_html=True)
+
+        render_step_scrubber(self.ns, len(st.session_state[f"{self.ns}_hist"]), st.session_state[f"{self.ns}_pos"])
+        render_debug_panel(self.ns)
+
+        if next_clicked and not st.session_state.get(f"{self.ns}_fin", False) and len(V) > 0:
+            self._advance(G)
+            st.rerun()
+        if ff_clicked and not st.session_state.get(f"{self.ns}_fin", False) and len(V) > 0:
+            self._seek(st.session_state[f"{self.ns}_pos"] + int(s.get("sb_ff_n", 10)), G)
             st.rerun()
-        if back_clicked and len(st.session_state.get(f"{self.ns}_hist", [])) > 1:
-            st.session_state[f"{self.ns}_hist"].pop()
-            self._restore(st.session_state[f"{self.ns}_hist"][-1])
+        if end_clicked and not st.session_state.get(f"{self.ns}_fin", False) and len(V) > 0:
+            self._seek(None, G)
+            st.rerun()
+        if back_clicked and st.session_state.get(f"{self.ns}_pos", 0) > 0:
+            self._goto(st.session_state[f"{self.ns}_pos"] - 1)
             st.rerun()
         if reset_clicked:
             st.session_state[f"{self.ns}_inited"] = False
-            self._ensure_state(list(W.index), st.session_state.get(f"{self.ns}_start_sel"), gkey)
+            self._ensure_state(V, st.session_state.get(f"{self.ns}_start_sel"), gkey)
             st.rerun()
-        if export_clicked and len(st.session_state.get(f"{self.ns}_hist", [])) > 0 and len(W.index) > 0:
-            paths = self._export(st.session_state.get("sb_fmt", "GIF"), max(1, st.session_state.get("sb_fps", 6)), list(W.index), W, st.session_state.get(f"{self.ns}_start"))
+        if export_clicked and len(st.session_state.get(f"{self.ns}_hist", [])) > 0 and len(V) > 0:
+            paths = self._export(st.session_state.get("sb_fmt", "GIF"), max(1, st.session_state.get("sb_fps", 6)), V, G, st.session_state.get(f"{self.ns}_start"))
             for p in paths:
                 with open(p, "rb") as f:
                     st.sidebar.download_button("Download " + p.split("/")[-1], f, file_name=p.split("/")[-1], mime="application/octet-stream")
-        if auto and not st.session_state.get(f"{self.ns}_fin", False) and not manual and len(W.index) > 0:
-            G = self._graph_from_matrix(W)
-            self._dijkstra_step(G)
-            self._push()
-            time.sleep(speed)
-            st.rerun()
\ No newline at end of file
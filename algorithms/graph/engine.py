@@ -0,0 +1,720 @@
+import math
+import time
+from collections import deque
+import numpy as np
+
+# Headless step engines for the graph visualizers. No Streamlit here: each
+# algorithm is an init_* that builds a plain state dict, a step_* that
+# advances it by one step in place, and a run_* generator over both.
+#
+# Vertices are interned to integer ids 0..n-1 (see intern); callers keep the
+# id -> name list for display. Per-vertex state is held in NumPy arrays:
+# visited is bool, dist is float64 and prev is int32 with -1 for "none".
+# Queues, stacks, orders and events hold plain int ids. The BFS queue is a
+# deque and the DFS stack a list, each paired with a bool membership array
+# (inq / ins), so pops and "already queued?" checks are O(1). The level BFS
+# replaces the queue with a bool frontier vector and steps a whole level.
+#
+# g is a CSRGraph (see csr.py); neighbours come out in ascending id order.
+# Dijkstra needs the weighted form. Every state carries "step", "fin" and
+# "ev", the event the visualizers turn into the step explanation.
+#
+# run_* yields the same dict after every step; copy it to keep a step.
+# The lists under TAILS only change at the end (appends, stack pops and
+# pushes) and never get an item back in a slot it left, which lets
+# StepHistory diff them from the end instead of comparing every item.
+TAILS = ("order", "levels", "stack")
+
+
+def intern(V):
+    return {v: i for i, v in enumerate(V)}
+
+
+def _run(state, step, *args):
+    yield state
+    while not state["fin"]:
+        step(state, *args)
+        yield state
+
+
+# ---------- BFS ----------
+def init_bfs(n, start):
+    queue = deque([start] if (start is not None and 0 <= start < n) else ([0] if n else []))
+    inq = np.zeros(n, dtype=bool)
+    inq[list(queue)] = True
+    return {
+        "visited": np.zeros(n, dtype=bool),
+        "queue": queue,
+        "inq": inq,
+        "current": None,
+        "order": [],
+        "edges": [],
+        "ev": ("init", start),
+        "fin": False,
+        "step": 0,
+    }
+
+
+def step_bfs(state, g):
+    if state["fin"]:
+        return
+    state["step"] += 1
+    queue, inq, visited = state["queue"], state["inq"], state["visited"]
+
+    if not queue:
+        state["fin"] = True
+        state["ev"] = ("done",)
+        return
+
+    u = queue.popleft()
+    inq[u] = False
+    state["current"] = u
+
+    if not visited[u]:
+        visited[u] = True
+        state["order"].append(u)
+        new_edges = []
+        seen = []
+        for v in g.neighbors(u):
+            if not visited[v] and not inq[v]:
+                queue.append(v)
+                inq[v] = True
+                new_edges.append((u, v))
+                seen.append((v, "enq"))
+            elif visited[v]:
+                seen.append((v, "vis"))
+            else:
+                seen.append((v, "inq"))
+        state["edges"] = new_edges
+        state["ev"] = ("visit", u, seen)
+    else:
+        state["edges"] = []
+        state["ev"] = ("skip", u)
+
+
+def run_bfs(g, start):
+    return _run(init_bfs(len(g), start), step_bfs, g)
+
+
+# ---------- BFS by levels ----------
+# Level-synchronous BFS for large graphs: one step expands the whole
+# frontier. The frontier is a bool vector; its rows' CSR slices are gathered
+# in one go, which is the sparse product A @ frontier over the boolean
+# semiring, and the targets not yet visited or queued form the next level.
+# Each new vertex takes its lowest-id frontier neighbour as parent, so
+# edges holds the BFS tree edges of the level as an (k, 2) array. level is
+# the depth of every vertex found (-1 for not yet) and levels gets one
+# (frontier size, arcs scanned, vertices found) entry per step.
+def init_bfs_levels(n, start):
+    s = start if (start is not None and 0 <= start < n) else (0 if n else None)
+    frontier = np.zeros(n, dtype=bool)
+    level = np.full(n, -1, dtype=np.int32)
+    if s is not None:
+        frontier[s] = True
+        level[s] = 0
+    return {
+        "visited": np.zeros(n, dtype=bool),
+        "frontier": frontier,
+        "level": level,
+        "current": None,
+        "order": [],
+        "edges": np.empty((0, 2), dtype=np.int32),
+        "levels": [],
+        "ev": ("init", start),
+        "fin": False,
+        "step": 0,
+    }
+
+
+# Arc slots of the CSR rows in rows, concatenated in row order.
+def _gather(g, rows):
+    lo = g.offsets[rows]
+    cnt = g.offsets[rows + 1] - lo
+    total = int(cnt.sum())
+    return np.repeat(lo - (np.cumsum(cnt) - cnt), cnt) + np.arange(total), cnt
+
+
+def step_bfs_level(state, g):
+    if state["fin"]:
+        return
+    state["step"] += 1
+    frontier, visited = state["frontier"], state["visited"]
+    rows = np.flatnonzero(frontier)
+
+    if len(rows) == 0:
+        state["fin"] = True
+        state["edges"] = np.empty((0, 2), dtype=np.int32)
+        state["ev"] = ("done",)
+        return
+
+    depth = int(state["level"][rows[0]])
+    visited[rows] = True
+    state["order"].extend(rows.tolist())
+    at, cnt = _gather(g, rows)
+    src = np.repeat(rows, cnt)
+    dst = g.indices[at]
+    new = ~visited[dst] & ~frontier[dst]
+    found, first = np.unique(dst[new], return_index=True)
+    parent = src[new][first]
+
+    nxt = np.zeros(len(frontier), dtype=bool)
+    nxt[found] = True
+    state["level"][found] = depth + 1
+    state["frontier"] = nxt
+    state["edges"] = np.stack([parent, found], 1).astype(np.int32)
+    state["levels"].append((len(rows), len(at), len(found)))
+    state["ev"] = ("level", depth, len(rows), len(at), len(found))
+
+
+def run_bfs_levels(g, start):
+    return _run(init_bfs_levels(len(g), start), step_bfs_level, g)
+
+
+# ---------- DFS ----------
+def init_dfs(n, start):
+    stack = [start] if (start is not None and 0 <= start < n) else ([0] if n else [])
+    ins = np.zeros(n, dtype=bool)
+    ins[stack] = True
+    return {
+        "visited": np.zeros(n, dtype=bool),
+        "stack": stack,
+        "ins": ins,
+        "current": None,
+        "order": [],
+        "edges": [],
+        "ev": ("init", start),
+        "fin": False,
+        "step": 0,
+    }
+
+
+def step_dfs(state, g):
+    if state["fin"]:
+        return
+    state["step"] += 1
+    stack, ins, visited = state["stack"], state["ins"], state["visited"]
+
+    if not stack:
+        state["fin"] = True
+        state["ev"] = ("done",)
+        return
+
+    u = stack.pop()
+    ins[u] = False
+    state["current"] = u
+
+    if not visited[u]:
+        visited[u] = True
+        state["order"].append(u)
+        new_edges = []
+        seen = []
+        for v in reversed(g.neighbors(u)):
+            if not visited[v] and not ins[v]:
+                stack.append(v)
+                ins[v] = True
+                new_edges.append((u, v))
+                seen.append((v, "push"))
+            elif visited[v]:
+                seen.append((v, "vis"))
+            else:
+                seen.append((v, "ins"))
+        state["edges"] = new_edges
+        state["ev"] = ("visit", u, seen)
+    else:
+        state["edges"] = []
+        state["ev"] = ("skip", u)
+
+
+def run_dfs(g, start):
+    return _run(init_dfs(len(g), start), step_dfs, g)
+
+
+# ---------- Dijkstra ----------
+# The frontier is an indexed binary min-heap: heap lists vertex ids in heap
+# order and hpos[v] is v's slot (-1 when not queued), so decrease-key is a
+# sift-up from a known slot. Entries order by (dist, id); ids follow the
+# sorted vertex list, so ties go to the lower name.
+def _before(dist, a, b):
+    return dist[a] < dist[b] or (dist[a] == dist[b] and a < b)
+
+
+def _sift_up(heap, hpos, dist, i):
+    v = heap[i]
+    while i > 0:
+        p = (i - 1) // 2
+        if not _before(dist, v, heap[p]):
+            break
+        heap[i] = heap[p]
+        hpos[heap[i]] = i
+        i = p
+    heap[i] = v
+    hpos[v] = i
+
+
+def _sift_down(heap, hpos, dist, i):
+    n = len(heap)
+    v = heap[i]
+    while True:
+        c = 2 * i + 1
+        if c >= n:
+            break
+        if c + 1 < n and _before(dist, heap[c + 1], heap[c]):
+            c += 1
+        if not _before(dist, heap[c], v):
+            break
+        heap[i] = heap[c]
+        hpos[heap[i]] = i
+        i = c
+    heap[i] = v
+    hpos[v] = i
+
+
+# Insert v, or move it up after its distance dropped.
+def heap_push(heap, hpos, dist, v):
+    if hpos[v] < 0:
+        heap.append(v)
+        hpos[v] = len(heap) - 1
+    _sift_up(heap, hpos, dist, int(hpos[v]))
+
+
+def heap_pop(heap, hpos, dist):
+    if not heap:
+        return None
+    top = heap[0]
+    last = heap.pop()
+    hpos[top] = -1
+    if heap:
+        heap[0] = last
+        _sift_down(heap, hpos, dist, 0)
+    return top
+
+
+def init_dijkstra(n, start):
+    dist = np.full(n, np.inf)
+    heap, hpos = [], np.full(n, -1, dtype=np.int32)
+    if start is not None and 0 <= start < n:
+        dist[start] = 0.0
+        heap_push(heap, hpos, dist, start)
+    return {
+        "visited": np.zeros(n, dtype=bool),
+        "dist": dist,
+        "prev": np.full(n, -1, dtype=np.int32),
+        "heap": heap,
+        "hpos": hpos,
+        "current": None,
+        "order": [],
+        "edges": [],
+        "ev": ("init", start),
+        "fin": False,
+        "step": 0,
+    }
+
+
+def step_dijkstra(state, g):
+    if state["fin"]:
+        return
+    visited, dist, prev = state["visited"], state["dist"], state["prev"]
+    heap, hpos = state["heap"], state["hpos"]
+    u = heap_pop(heap, hpos, dist)
+    state["step"] += 1
+    if u is None:
+        state["fin"] = True
+        state["ev"] = ("done",)
+        return
+    state["current"] = u
+    visited[u] = True
+    state["order"].append(u)
+    du = float(dist[u])
+    new_edges = []
+    relax = []
+    for v, w in g.weighted(u):
+        if visited[v]:
+            relax.append((v,))
+            continue
+        old = float(dist[v])
+        cand = (du + w) if math.isfinite(du) else float('inf')
+        if cand < old:
+            dist[v] = cand
+            prev[v] = u
+            heap_push(heap, hpos, dist, v)
+            new_edges.append((u, v))
+        relax.append((v, w, old, cand))
+    state["edges"] = new_edges
+    state["ev"] = ("pick", u, relax)
+
+
+def run_dijkstra(g, start):
+    return _run(init_dijkstra(len(g), start), step_dijkstra, g)
+
+
+# ---------- A* ----------
+# Dijkstra towards one goal with the heap ordered by f = dist + h, where h
+# is a consistent lower bound on the distance left to the goal (see
+# heuristic); with h = 0 it is plain Dijkstra stopped at the goal. The same
+# indexed heap is keyed on the f array. stats counts expanded vertices,
+# relaxed edges (to vertices not yet expanded) and heap pushes / pops.
+HEURISTICS = ["Manhattan", "Euclidean", "Zero"]
+
+
+def heuristic(P, goal, kind, g):
+    n = len(g)
+    if kind == "Zero" or goal is None or P is None or n == 0:
+        return np.zeros(n)
+    P = np.asarray(P, dtype=np.float64)
+    norm = (lambda d: np.abs(d).sum(1)) if kind == "Manhattan" else (lambda d: np.sqrt((d ** 2).sum(1)))
+    # scale h so no edge is shorter in weight than in h: then h(u) - h(v)
+    # <= w(u, v) for every edge and h never overestimates
+    src = np.repeat(np.arange(n), np.diff(g.offsets))
+    span = norm(P[src] - P[g.indices])
+    w = np.ones(g.n_edges) if g.weights is None else g.weights
+    ok = span > 0
+    scale = float((w[ok] / span[ok]).min()) if ok.any() else 0.0
+    return scale * norm(P - P[goal])
+
+
+def _stats():
+    return {"expanded": 0, "relaxed": 0, "pushes": 0, "pops": 0}
+
+
+def init_astar(n, start, goal):
+    dist, f = np.full(n, np.inf), np.full(n, np.inf)
+    heap, hpos = [], np.full(n, -1, dtype=np.int32)
+    stats = _stats()
+    if start is not None and 0 <= start < n:
+        dist[start] = f[start] = 0.0
+        heap_push(heap, hpos, f, start)
+        stats["pushes"] += 1
+    return {
+        "visited": np.zeros(n, dtype=bool),
+        "dist": dist,
+        "f": f,
+        "prev": np.full(n, -1, dtype=np.int32),
+        "heap": heap,
+        "hpos": hpos,
+        "goal": goal,
+        "current": None,
+        "order": [],
+        "edges": [],
+        "stats": stats,
+        "ev": ("init", start, goal),
+        "fin": False,
+        "step": 0,
+    }
+
+
+def step_astar(state, g, h):
+    if state["fin"]:
+        return
+    visited, dist, f, prev = state["visited"], state["dist"], state["f"], state["prev"]
+    heap, hpos, stats = state["heap"], state["hpos"], state["stats"]
+    u = heap_pop(heap, hpos, f)
+    state["step"] += 1
+    if u is None:
+        state["fin"] = True
+        state["edges"] = []
+        state["ev"] = ("done",)
+        return
+    stats["pops"] += 1
+    stats["expanded"] += 1
+    state["current"] = u
+    visited[u] = True
+    state["order"].append(u)
+    if u == state["goal"]:
+        state["fin"] = True
+        state["edges"] = []
+        state["ev"] = ("goal", u)
+        return
+    du = float(dist[u])
+    new_edges = []
+    relax = []
+    for v, w in g.weighted(u):
+        if visited[v]:
+            relax.append((v,))
+            continue
+        stats["relaxed"] += 1
+        old = float(dist[v])
+        cand = du + w
+        if cand < old:
+            dist[v] = cand
+            f[v] = cand + h[v]
+            prev[v] = u
+            heap_push(heap, hpos, f, v)
+            stats["pushes"] += 1
+            new_edges.append((u, v))
+        relax.append((v, w, old, cand))
+    state["edges"] = new_edges
+    state["ev"] = ("pick", u, relax)
+
+
+def run_astar(g, start, goal, h):
+    return _run(init_astar(len(g), start, goal), step_astar, g, h)
+
+
+# Vertex ids from the start to v along prev, [] when v was not reached.
+def tree_path(prev, start, v):
+    if v is None or start is None or (v != start and prev[v] < 0):
+        return []
+    path = [v]
+    while path[-1] != start and len(path) <= len(prev):
+        path.append(int(prev[path[-1]]))
+    return path[::-1]
+
+
+# ---------- Bidirectional Dijkstra ----------
+# One Dijkstra from the start ("dist", "prev", "heap", ...) and one from the
+# goal (the same keys with "_b"); the graph is undirected, so the backward
+# search walks the same arcs. Each step expands the side whose heap top is
+# nearer. mu is the shortest start -> goal distance through an edge seen
+# between the two sides, at vertex meet, and the search stops once the two
+# heap tops add up to mu or more: no unexplored path can be shorter.
+def init_bidijkstra(n, start, goal):
+    state = {"visited": np.zeros(n, dtype=bool), "stats": _stats()}
+    for side, root in (("", start), ("_b", goal)):
+        dist = np.full(n, np.inf)
+        heap, hpos = [], np.full(n, -1, dtype=np.int32)
+        if root is not None and 0 <= root < n:
+            dist[root] = 0.0
+            heap_push(heap, hpos, dist, root)
+            state["stats"]["pushes"] += 1
+        state.update({
+            f"dist{side}": dist,
+            f"prev{side}": np.full(n, -1, dtype=np.int32),
+            f"heap{side}": heap,
+            f"hpos{side}": hpos,
+            f"settled{side}": np.zeros(n, dtype=bool),
+        })
+    state.update({
+        "goal": goal,
+        "mu": 0.0 if start is not None and start == goal else np.inf,
+        "meet": start if start is not None and start == goal else None,
+        "current": None,
+        "order": [],
+        "edges": [],
+        "ev": ("init", start, goal),
+        "fin": False,
+        "step": 0,
+    })
+    return state
+
+
+def step_bidijkstra(state, g):
+    if state["fin"]:
+        return
+    state["step"] += 1
+    stats = state["stats"]
+    tops = [float(state[f"dist{s}"][state[f"heap{s}"][0]]) if state[f"heap{s}"] else np.inf for s in ("", "_b")]
+    if tops[0] + tops[1] >= state["mu"]:
+        state["fin"] = True
+        state["edges"] = []
+        state["ev"] = ("meet", state["meet"]) if state["meet"] is not None else ("done",)
+        return
+    side, other = ("", "_b") if tops[0] <= tops[1] else ("_b", "")
+    dist, prev, settled = state[f"dist{side}"], state[f"prev{side}"], state[f"settled{side}"]
+    heap, hpos = state[f"heap{side}"], state[f"hpos{side}"]
+    odist = state[f"dist{other}"]
+    u = heap_pop(heap, hpos, dist)
+    stats["pops"] += 1
+    stats["expanded"] += 1
+    settled[u] = True
+    state["visited"][u] = True
+    state["current"] = u
+    state["order"].append(u)
+    du = float(dist[u])
+    new_edges = []
+    relax = []
+    for v, w in g.weighted(u):
+        if settled[v]:
+            relax.append((v,))
+            continue
+        stats["relaxed"] += 1
+        old = float(dist[v])
+        cand = du + w
+        if cand < old:
+            dist[v] = cand
+            prev[v] = u
+            heap_push(heap, hpos, dist, v)
+            stats["pushes"] += 1
+            new_edges.append((u, v))
+        if cand + odist[v] < state["mu"]:
+            state["mu"] = cand + float(odist[v])
+            state["meet"] = v
+        relax.append((v, w, old, cand))
+    state["edges"] = new_edges
+    state["ev"] = ("pick", u, relax, "forward" if side == "" else "backward")
+
+
+def run_bidijkstra(g, start, goal):
+    return _run(init_bidijkstra(len(g), start, goal), step_bidijkstra, g)
+
+
+# Start -> goal vertex ids through meet, [] when the sides never met.
+def bidi_path(state, start, goal):
+    meet = state["meet"]
+    if meet is None:
+        return []
+    back = tree_path(state["prev_b"], goal, meet)[::-1]
+    return tree_path(state["prev"], start, meet) + back[1:]
+
+
+# Runs plain Dijkstra (A* with h = 0), A* with h and bidirectional
+# Dijkstra from start to goal and returns {name: stats} with the distance
+# found ("dist", inf when unreachable), the steps taken and the seconds.
+def compare_searches(g, start, goal, h):
+    out = {}
+    for name, run in (("Dijkstra", lambda: run_astar(g, start, goal, np.zeros(len(g)))),
+                      ("A*", lambda: run_astar(g, start, goal, h)),
+                      ("Bidirectional", lambda: run_bidijkstra(g, start, goal))):
+        t = time.perf_counter()
+        for state in run():
+            pass
+        if name == "Bidirectional":
+            d = float(state["mu"])
+        else:
+            d = float(state["dist"][goal]) if state["visited"][goal] else np.inf
+        out[name] = {**state["stats"], "dist": d, "steps": state["step"], "seconds": time.perf_counter() - t}
+    return out
+
+
+# ---------- Union-find ----------
+# Disjoint sets over the vertices, joined by one union per edge of src/dst
+# (the pairs of g.edge_pairs()). parent is int32 with each root pointing at
+# itself; rank holds the union-by-rank bound, or the set size under "Size".
+# A find walks parent pointers up to the root and counts every pointer
+# followed as a hop; with compress the walked vertices are then pointed
+# straight at the root. A step is one union: two finds, then a link of the
+# two roots unless they are equal. hop_hist counts finds by hops, the last
+# bin holding HOP_BINS - 1 or more. merged marks the edges that joined two
+# sets, a spanning forest of the graph.
+UNION_RULES = ["Rank", "Size", "None"]
+HOP_BINS = 16
+PATH_SHOWN = 32
+
+
+def _find(parent, x, compress):
+    path = [x]
+    while True:
+        p = int(parent[path[-1]])
+        if p == path[-1]:
+            break
+        path.append(p)
+    if compress:
+        for y in path[:-2]:
+            parent[y] = p
+    return p, path
+
+
+# Links roots a and b by rule and returns the root kept; without a rule b
+# goes under a.
+def _link(parent, rank, a, b, rule):
+    if rule != "None" and rank[a] < rank[b]:
+        a, b = b, a
+    if rule == "Rank" and rank[a] == rank[b]:
+        rank[a] += 1
+    elif rule == "Size":
+        rank[a] += rank[b]
+    parent[b] = a
+    return a
+
+
+def init_union_find(n, m, compress=True, rule="Rank"):
+    return {
+        "parent": np.arange(n, dtype=np.int32),
+        "rank": np.full(n, 1 if rule == "Size" else 0, dtype=np.int32),
+        "compress": compress,
+        "rule": rule,
+        "visited": np.zeros(n, dtype=bool),
+        "merged": np.zeros(m, dtype=bool),
+        "sets": n,
+        "at": 0,
+        "finds": 0,
+        "hops": 0,
+        "max_hops": 0,
+        "hop_hist": np.zeros(HOP_BINS, dtype=np.int64),
+        "current": None,
+        "edges": [],
+        "ev": ("init", n, m),
+        "fin": False,
+        "step": 0,
+    }
+
+
+def step_union_find(state, src, dst):
+    if state["fin"]:
+        return
+    state["step"] += 1
+    i = state["at"]
+    if i >= len(src):
+        state["fin"] = True
+        state["current"] = None
+        state["edges"] = []
+        state["ev"] = ("done",)
+        return
+    a, b = int(src[i]), int(dst[i])
+    state["at"] = i + 1
+    parent, rank = state["parent"], state["rank"]
+    ra, pa = _find(parent, a, state["compress"])
+    rb, pb = _find(parent, b, state["compress"])
+    for path in (pa, pb):
+        hops = len(path) - 1
+        state["finds"] += 1
+        state["hops"] += hops
+        state["max_hops"] = max(state["max_hops"], hops)
+        state["hop_hist"][min(hops, HOP_BINS - 1)] += 1
+    state["current"] = a
+    state["edges"] = [(a, b)]
+    finds = (len(pa) - 1, len(pb) - 1, pa[:PATH_SHOWN], pb[:PATH_SHOWN])
+    if ra == rb:
+        state["ev"] = ("same", a, b, *finds, ra)
+        return
+    root = _link(parent, rank, ra, rb, state["rule"])
+    state["sets"] -= 1
+    state["merged"][i] = True
+    state["visited"][a] = state["visited"][b] = True
+    state["ev"] = ("union", a, b, *finds, root, rb if root == ra else ra)
+
+
+def run_union_find(n, src, dst, compress=True, rule="Rank"):
+    return _run(init_union_find(n, len(src), compress, rule), step_union_find, src, dst)
+
+
+# Every union over src/dst with plain lists instead of the step state:
+# finds, hops, the longest find, the sets left and the running mean hops
+# per find at up to points checkpoints as (unions done, mean). Stops early
+# once more than budget hops were followed ("complete" False).
+def union_find_costs(n, src, dst, compress=True, rule="Rank", budget=None, points=60):
+    t = time.perf_counter()
+    parent = list(range(n))
+    rank = [1 if rule == "Size" else 0] * n
+    finds = hops = longest = 0
+    sets, series = n, []
+    every = max(1, len(src) // points)
+    done = 0
+    for a, b in zip(np.asarray(src).tolist(), np.asarray(dst).tolist()):
+        ra, pa = _find(parent, a, compress)
+        rb, pb = _find(parent, b, compress)
+        finds += 2
+        hops += len(pa) + len(pb) - 2
+        longest = max(longest, len(pa) - 1, len(pb) - 1)
+        if ra != rb:
+            _link(parent, rank, ra, rb, rule)
+            sets -= 1
+        done += 1
+        if done % every == 0:
+            series.append((done, hops / finds))
+        if budget is not None and hops > budget:
+            break
+    return {
+        "unions": done, "finds": finds, "hops": hops, "max_hops": longest, "sets": sets,
+        "complete": done == len(src), "series": series, "seconds": time.perf_counter() - t,
+    }
+
+
+# union_find_costs for every mix of path compression and union rule,
+# as {name: costs}.
+def compare_union_find(n, src, dst, budget=None, points=60):
+    out = {}
+    for compress in (True, False):
+        for rule in UNION_RULES:
+            name = ("Compression" if compress else "No compression") + (f" + {rule.lower()}" if rule != "None" else "")
+            out[name] = union_find_costs(n, src, dst, compress, rule, budget, points)
+    return out
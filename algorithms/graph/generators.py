@@ -0,0 +1,166 @@
+import math
+import time
+import numpy as np
+from algorithms.graph.csr import CSRGraph
+
+# Seeded synthetic graphs for stress-testing the graph visualizers. Each
+# generator draws undirected edges as NumPy id arrays from one
+# np.random.default_rng(seed) and goes straight into a CSRGraph, so graphs
+# with a million vertices are built in seconds without a matrix or Python
+# adjacency lists. Like the importer, self-loops are dropped and repeated
+# edges merged.
+#
+# degree is the target mean degree: the edge probability for Erdős–Rényi,
+# the edges each new vertex brings (degree / 2) for Barabási–Albert, the
+# radius for random geometric, the share of lattice edges kept for grid
+# (4 keeps them all) and short forward hops on top of the chain (2 is a
+# bare path).
+#
+# generate returns (names, g, report) like read_graph. Names are the ids
+# zero-padded, so name order is id order as the engines expect. Builders
+# return (a, b, coords); grid and random geometric graphs keep their (n, 2)
+# vertex coordinates in report["coords"] for A*, the others None.
+
+KINDS = ["Grid", "Erdős–Rényi", "Barabási–Albert", "Random geometric", "Chain"]
+WEIGHTS = ["Uniform", "Integer", "Exponential", "Constant"]
+MAX_VERTICES = 1_000_000
+
+
+class GeneratorError(ValueError):
+    pass
+
+
+def grid(n, degree, rng):
+    w = max(1, math.ceil(math.sqrt(n)))
+    i = np.arange(n, dtype=np.int64)
+    right = i[(i % w < w - 1) & (i + 1 < n)]
+    down = i[i + w < n]
+    a = np.concatenate([right, down])
+    b = np.concatenate([right + 1, down + w])
+    keep = rng.random(len(a)) < min(1.0, degree / 4)
+    return a[keep], b[keep], np.stack([i % w, i // w], 1).astype(np.float64)
+
+
+# G(n, m) with m = n * degree / 2 pairs drawn with replacement; for sparse
+# graphs this is G(n, p) with p = degree / (n - 1) up to a few merged pairs.
+def erdos_renyi(n, degree, rng):
+    m = int(round(n * degree / 2))
+    return rng.integers(0, n, m), rng.integers(0, n, m), None
+
+
+# Preferential attachment by the Batagelj–Brandes edge list: arc k joins
+# vertex 1 + k // m to the endpoint in a uniformly chosen earlier slot, so
+# every vertex is picked in proportion to its degree. Earlier slots holding
+# a target are themselves resolved by pointer jumping, all arcs at once.
+def barabasi_albert(n, degree, rng):
+    m = max(1, int(round(degree / 2)))
+    k = np.arange((n - 1) * m, dtype=np.int64)
+    src = 1 + k // m
+    slot = (rng.random(len(k)) * (2 * k)).astype(np.int64)
+    ptr = slot.copy()
+    odd = np.flatnonzero((ptr % 2 == 1) & (ptr > 1))
+    while len(odd):
+        ptr[odd] = slot[(ptr[odd] - 1) // 2]
+        odd = odd[(ptr[odd] % 2 == 1) & (ptr[odd] > 1)]
+    dst = np.where(ptr == 1, 0, 1 + (ptr // 2) // m)
+    dst[:1] = 0
+    return src, dst, None
+
+
+# Points in the unit square joined within radius r, with r set so the mean
+# degree is about degree. Points are bucketed into cells of side at least r
+# (about one point per cell at most, so tiny radii do not allocate huge
+# grids) and only the cell itself and four of its neighbours are compared,
+# in blocks. Degree 0 gives the points with no edges.
+def random_geometric(n, degree, rng, block=200_000):
+    r = min(1.0, math.sqrt(degree / (math.pi * max(n - 1, 1))))
+    xy = pts = rng.random((n, 2))
+    if r == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), pts
+    side = max(1, min(int(1 / r), math.isqrt(n) + 1))
+    cell = np.minimum((xy / (1 / side)).astype(np.int64), side - 1)
+    key = cell[:, 0] * side + cell[:, 1]
+    order = np.argsort(key, kind="stable")
+    xy, cell, key = xy[order], cell[order], key[order]
+    start = np.searchsorted(key, np.arange(side * side))
+    stop = np.searchsorted(key, np.arange(side * side), side="right")
+    out_a, out_b = [], []
+    for lo in range(0, n, block):
+        i = np.arange(lo, min(n, lo + block))
+        for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+            cx, cy = cell[i, 0] + dx, cell[i, 1] + dy
+            ok = (cx < side) & (cy >= 0) & (cy < side)
+            ii = i[ok]
+            c = cx[ok] * side + cy[ok]
+            cnt = stop[c] - start[c]
+            j = np.repeat(start[c] - (np.cumsum(cnt) - cnt), cnt) + np.arange(int(cnt.sum()))
+            ii = np.repeat(ii, cnt)
+            near = ((xy[ii] - xy[j]) ** 2).sum(1) <= r * r
+            if dx == 0 and dy == 0:
+                near &= j > ii
+            out_a.append(order[ii[near]])
+            out_b.append(order[j[near]])
+    return np.concatenate(out_a), np.concatenate(out_b), pts
+
+
+# A path 0 - 1 - ... - n-1 plus n * (degree - 2) / 2 hops of 2..9 ids
+# forward, so BFS depth stays in the order of n.
+def chain(n, degree, rng):
+    a = np.arange(n - 1, dtype=np.int64)
+    extra = int(round(n * max(0.0, degree - 2) / 2))
+    s = rng.integers(0, n, extra)
+    t = s + rng.integers(2, 10, extra)
+    keep = t < n
+    return np.concatenate([a, s[keep]]), np.concatenate([a + 1, t[keep]]), None
+
+
+BUILDERS = {
+    "Grid": grid,
+    "Erdős–Rényi": erdos_renyi,
+    "Barabási–Albert": barabasi_albert,
+    "Random geometric": random_geometric,
+    "Chain": chain,
+}
+
+
+# m edge weights from dist over [low, high]; Exponential has its mean a
+# quarter of the way up and is clipped at high.
+def edge_weights(m, dist, low, high, rng):
+    if dist == "Uniform":
+        return rng.uniform(low, high, m)
+    if dist == "Integer":
+        return rng.integers(int(math.ceil(low)), int(math.floor(high)) + 1, m).astype(np.float64)
+    if dist == "Exponential":
+        return np.minimum(low + rng.exponential(max(high - low, 1e-9) / 4, m), high)
+    if dist == "Constant":
+        return np.full(m, float(low))
+    raise GeneratorError(f"unknown weight distribution {dist!r}")
+
+
+def generate(kind, n, degree=4.0, seed=0, weights=None, low=1.0, high=10.0):
+    n = int(n)
+    if kind not in BUILDERS:
+        raise GeneratorError(f"unknown graph kind {kind!r}")
+    if not 1 <= n <= MAX_VERTICES:
+        raise GeneratorError(f"vertex count must be between 1 and {MAX_VERTICES:,}")
+    if degree < 0:
+        raise GeneratorError("mean degree must not be negative")
+    if weights is not None and not 0 < low <= high:
+        raise GeneratorError("weights need 0 < low <= high")
+    if weights == "Integer" and math.ceil(low) > math.floor(high):
+        raise GeneratorError(f"integer weights need a whole number between {low:g} and {high:g}")
+    t = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    a, b, coords = BUILDERS[kind](n, degree, rng)
+    a, b = np.minimum(a, b), np.maximum(a, b)
+    pair = np.unique((a * n + b)[a != b])
+    a, b = pair // n, pair % n
+    w = None if weights is None else edge_weights(len(a), weights, low, high, rng)
+    g = CSRGraph.from_edges(n, np.concatenate([a, b]), np.concatenate([b, a]),
+                            None if w is None else np.concatenate([w, w]))
+    names = [str(i).zfill(len(str(n - 1))) for i in range(n)]
+    report = {
+        "kind": kind, "seed": seed, "vertices": n, "edges": len(a),
+        "mean_degree": 2 * len(a) / n, "seconds": time.perf_counter() - t, "coords": coords,
+    }
+    return names, g, report
@@ -0,0 +1,320 @@
+import csv
+import io
+import math
+import os
+from itertools import islice
+import xml.etree.ElementTree as ET
+import numpy as np
+from algorithms.graph.csr import CSRGraph
+
+# Streaming readers for graph files. Rows are parsed in chunks of
+# CHUNK_EDGES into int id arrays and go straight into a CSRGraph, so no
+# dense V x V matrix is ever built. Graphs are treated as undirected like the
+# matrix editor: self-loops are dropped and repeated edges merged, keeping
+# the smallest weight. Rows that cannot be used are counted and skipped; the
+# first few are kept as warnings in the report. A file that cannot be read
+# at all (bad CSV quoting, malformed XML, undecodable text) raises
+# GraphImportError naming the format and, where known, the line.
+#
+# read_graph returns (names, g, report): names sorted, so id order is name
+# order as the engines expect.
+
+CHUNK_EDGES = int(os.environ.get("IMPORT_CHUNK_EDGES", "50000"))
+MAX_WARNINGS = 10
+
+FORMATS = ["Edge list", "CSV", "Matrix Market", "GraphML"]
+EXTENSIONS = {
+    ".txt": "Edge list", ".edges": "Edge list", ".el": "Edge list", ".tsv": "Edge list",
+    ".csv": "CSV",
+    ".mtx": "Matrix Market", ".mm": "Matrix Market",
+    ".graphml": "GraphML", ".xml": "GraphML",
+}
+SOURCE_COLUMNS = {"source", "src", "from", "u", "node1", "start"}
+
+
+class GraphImportError(ValueError):
+    pass
+
+
+def guess_format(filename):
+    return EXTENSIONS.get(os.path.splitext(str(filename).lower())[1], "Edge list")
+
+
+class _Builder:
+    def __init__(self, weighted, progress, size):
+        self.weighted = weighted
+        self.progress = progress
+        self.size = size
+        self.ids = {}
+        self.names = []
+        self.chunks = []
+        self._s, self._d, self._w = [], [], []
+        self.report = {"rows": 0, "edges_read": 0, "self_loops": 0, "invalid": 0, "duplicates": 0, "warnings": []}
+
+    def vertex(self, name):
+        i = self.ids.get(name)
+        if i is None:
+            i = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return i
+
+    def skip(self, where, why):
+        self.report["invalid"] += 1
+        if len(self.report["warnings"]) < MAX_WARNINGS:
+            self.report["warnings"].append(f"{where}: {why}")
+
+    # u and v are names (or ids from vertex()); w is the raw weight field.
+    def edge(self, where, u, v, w=None):
+        self.report["rows"] += 1
+        if u is None or v is None or u == "" or v == "":
+            self.skip(where, "missing endpoint")
+            return
+        weight = 1.0
+        if self.weighted and w is not None and w != "":
+            try:
+                weight = float(w)
+            except (TypeError, ValueError):
+                self.skip(where, f"weight {w!r} is not a number")
+                return
+            if not math.isfinite(weight) or weight <= 0:
+                self.skip(where, f"weight {w!r} must be a positive number")
+                return
+        a = u if isinstance(u, int) else self.vertex(u)
+        b = v if isinstance(v, int) else self.vertex(v)
+        if a == b:
+            self.report["self_loops"] += 1
+            return
+        self._s.append(a)
+        self._d.append(b)
+        self._w.append(weight)
+        if len(self._s) >= CHUNK_EDGES:
+            self._seal()
+
+    def _seal(self):
+        if self._s:
+            self.chunks.append((
+                np.array(self._s, dtype=np.int64),
+                np.array(self._d, dtype=np.int64),
+                np.array(self._w, dtype=np.float64),
+            ))
+            self.report["edges_read"] += len(self._s)
+            self._s, self._d, self._w = [], [], []
+
+    def flush(self, done=None):
+        self._seal()
+        if self.progress is not None:
+            self.progress(done, self.size, self.report["edges_read"])
+
+    def build(self):
+        self.flush(self.size)
+        n = len(self.names)
+        if n == 0:
+            raise GraphImportError("no vertices found")
+        order = sorted(range(n), key=self.names.__getitem__)
+        names = [self.names[i] for i in order]
+        remap = np.empty(n, dtype=np.int64)
+        remap[order] = np.arange(n)
+        if self.chunks:
+            src, dst, w = (np.concatenate(c) for c in zip(*self.chunks))
+        else:
+            src = dst = np.zeros(0, dtype=np.int64)
+            w = np.zeros(0)
+        src, dst = remap[src], remap[dst]
+        a, b = np.minimum(src, dst), np.maximum(src, dst)
+        # one row per undirected edge, lightest first within repeats
+        idx = np.lexsort((w, b, a))
+        a, b, w = a[idx], b[idx], w[idx]
+        first = np.ones(len(a), dtype=bool)
+        first[1:] = (a[1:] != a[:-1]) | (b[1:] != b[:-1])
+        a, b, w = a[first], b[first], w[first]
+        self.report["duplicates"] = int(len(first) - first.sum())
+        self.report["vertices"] = n
+        self.report["edges"] = int(len(a))
+        g = CSRGraph.from_edges(
+            n, np.concatenate([a, b]), np.concatenate([b, a]),
+            np.concatenate([w, w]) if self.weighted else None,
+        )
+        return names, g, self.report
+
+
+def _size(f):
+    try:
+        pos = f.tell()
+        f.seek(0, io.SEEK_END)
+        size = f.tell()
+        f.seek(pos)
+        return size
+    except (AttributeError, OSError):
+        return None
+
+
+def _tell(f):
+    try:
+        return f.tell()
+    except (AttributeError, OSError):
+        return None
+
+
+def _text(f):
+    return io.TextIOWrapper(f, encoding="utf-8", errors="replace", newline="")
+
+
+def _chunked(rows, f, build):
+    while True:
+        chunk = list(islice(rows, CHUNK_EDGES))
+        if not chunk:
+            return
+        for where, fields in chunk:
+            yield where, fields
+        build.flush(_tell(f))
+
+
+# "u v [w]" per line, whitespace separated; # and % start comments.
+def _read_edge_list(f, build):
+    text = _text(f)
+    try:
+        rows = ((f"line {i}", line.split()) for i, line in enumerate(text, 1))
+        for where, fields in _chunked(rows, f, build):
+            if not fields or fields[0][0] in "#%":
+                continue
+            if len(fields) < 2:
+                build.skip(where, "expected 'source target [weight]'")
+                continue
+            build.edge(where, fields[0], fields[1], fields[2] if len(fields) > 2 else None)
+    finally:
+        text.detach()
+
+
+# source,target[,weight]; a header row is used when its first column is a
+# known source name (source, src, from, ...), otherwise every row is data.
+def _read_csv(f, build):
+    text = _text(f)
+    try:
+        reader = csv.reader(text, skipinitialspace=True)
+        rows = ((f"row {i}", r) for i, r in enumerate(reader, 1))
+        cols = (0, 1, 2)
+        for where, fields in _chunked(rows, f, build):
+            if not fields or fields[0].startswith("#"):
+                continue
+            if where == "row 1" and fields[0].strip().lower() in SOURCE_COLUMNS:
+                low = [c.strip().lower() for c in fields]
+                wcol = next((i for i, c in enumerate(low) if c in ("weight", "w", "cost", "distance")), 2)
+                cols = (0, 1, wcol)
+                continue
+            if len(fields) < 2:
+                build.skip(where, "expected 'source,target[,weight]'")
+                continue
+            w = fields[cols[2]] if len(fields) > cols[2] else None
+            build.edge(where, fields[cols[0]].strip(), fields[cols[1]].strip(), w)
+    except csv.Error as e:
+        raise GraphImportError(f"CSV error on line {reader.line_num}: {e}")
+    finally:
+        text.detach()
+
+
+# Coordinate format only; vertices are the 1-based indices as names, and
+# every index up to the declared size is a vertex even without edges.
+def _read_matrix_market(f, build):
+    text = _text(f)
+    try:
+        header = text.readline().split()
+        if len(header) < 5 or header[0].lower() != "%%matrixmarket" or header[1].lower() != "matrix":
+            raise GraphImportError("missing '%%MatrixMarket matrix ...' header")
+        if header[2].lower() != "coordinate":
+            raise GraphImportError("only coordinate Matrix Market files are supported")
+        pattern = header[3].lower() == "pattern"
+        if header[3].lower() == "complex":
+            raise GraphImportError("complex Matrix Market files are not supported")
+        lines = enumerate(text, 2)
+        for i, line in lines:
+            if line.strip() and not line.startswith("%"):
+                try:
+                    nrows, ncols, _ = (int(x) for x in line.split()[:3])
+                except ValueError:
+                    raise GraphImportError(f"line {i}: bad size line {line.strip()!r}")
+                break
+        else:
+            raise GraphImportError("missing size line")
+        if nrows != ncols:
+            raise GraphImportError(f"matrix is {nrows} x {ncols}; an adjacency matrix must be square")
+        for k in range(1, nrows + 1):
+            build.vertex(str(k))
+        rows = ((f"line {i}", line.split()) for i, line in lines)
+        for where, fields in _chunked(rows, f, build):
+            if not fields or fields[0].startswith("%"):
+                continue
+            try:
+                r, c = int(fields[0]), int(fields[1])
+            except (IndexError, ValueError):
+                build.skip(where, "expected 'row col [value]'")
+                continue
+            if not (1 <= r <= nrows and 1 <= c <= ncols):
+                build.skip(where, f"index ({r}, {c}) outside {nrows} x {ncols}")
+                continue
+            w = None if pattern or len(fields) < 3 else fields[2]
+            try:
+                if w is not None and float(w) == 0:
+                    continue
+            except ValueError:
+                pass
+            build.edge(where, r - 1, c - 1, w)
+    finally:
+        text.detach()
+
+
+# <node id> and <edge source target> elements, read with iterparse and
+# cleared as they are consumed. The edge weight is the <data> whose <key>
+# has attr.name "weight".
+def _read_graphml(f, build):
+    wkey = None
+    n_edges = 0
+    try:
+        for _, el in ET.iterparse(f, events=("end",)):
+            tag = el.tag.rsplit("}", 1)[-1]
+            if tag == "key":
+                if el.get("attr.name", "").lower() == "weight" and el.get("for", "edge") in ("edge", "all"):
+                    wkey = el.get("id")
+            elif tag == "node":
+                if el.get("id") is not None:
+                    build.vertex(el.get("id"))
+                el.clear()
+            elif tag == "edge":
+                n_edges += 1
+                w = None
+                for d in el:
+                    if d.tag.rsplit("}", 1)[-1] == "data" and d.get("key") == wkey:
+                        w = (d.text or "").strip()
+                build.edge(f"edge {n_edges}", el.get("source"), el.get("target"), w)
+                el.clear()
+                if n_edges % CHUNK_EDGES == 0:
+                    build.flush(_tell(f))
+    except ET.ParseError as e:
+        raise GraphImportError(f"GraphML parse error: {e}")
+    except (LookupError, ValueError) as e:
+        # encoding declared in the XML header is unknown, multi-byte or wrong
+        raise GraphImportError(f"GraphML encoding error: {e}")
+
+
+READERS = {
+    "Edge list": _read_edge_list,
+    "CSV": _read_csv,
+    "Matrix Market": _read_matrix_market,
+    "GraphML": _read_graphml,
+}
+
+
+# f is a binary file object (an open file or an uploaded file). progress, if
+# given, is called after every chunk as progress(bytes_done, total_bytes,
+# edges_read); either byte count may be None for unseekable input.
+def read_graph(f, fmt, weighted=False, progress=None):
+    if fmt not in READERS:
+        raise GraphImportError(f"unknown format {fmt!r}")
+    build = _Builder(weighted, progress, _size(f))
+    try:
+        READERS[fmt](f, build)
+    except UnicodeError as e:
+        raise GraphImportError(f"{fmt} file is not valid text: {e}")
+    names, g, report = build.build()
+    if report["edges_read"] == 0 and report["invalid"]:
+        raise GraphImportError(f"no usable edges ({report['invalid']} invalid rows; first: {report['warnings'][0]})")
+    return names, g, report
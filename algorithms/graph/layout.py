@@ -0,0 +1,297 @@
+import numpy as np
+from algorithms.graph.csr import CSRGraph
+
+# Force-directed layout for CSR graphs in NumPy (Fruchterman-Reingold forces
+# on a multilevel hierarchy). The graph is coarsened by merging matched
+# neighbours until it is small, laid out there, and the positions are
+# projected back level by level with a short refinement at each one. Up to
+# EXACT_MAX vertices repulsion is computed for all pairs; above that it is
+# split Barnes-Hut style into exact pairs within a 2k cutoff and cell
+# centroids beyond it, so an iteration is O(V + E) array work instead of
+# the O(V^2) of networkx.spring_layout. A weak pull towards the centre keeps
+# separate components from drifting apart.
+#
+# force_layout returns an (n, 2) array centred on 0 and scaled into
+# [-1, 1]; settle re-runs the forces on a neighbourhood of an existing
+# layout and leaves everything else where it was, and update_layout uses it
+# to carry a drawn layout over to an edited graph.
+
+EXACT_MAX = 500
+NEAR_CAP = 8
+FAR_CELLS = 16
+GRAVITY = 0.1
+COARSEST = 48
+COARSE_ITERATIONS = 120
+FINE_ITERATIONS = 20
+MAX_MOVED = 0.25
+
+
+# ---------- Forces ----------
+def _repulsion_exact(P, rows, k2):
+    F = np.zeros((len(rows), 2))
+    step = max(1, 2_000_000 // max(1, len(P)))
+    for a in range(0, len(rows), step):
+        r = rows[a:a + step]
+        d = P[r, None, :] - P[None, :, :]
+        r2 = (d * d).sum(-1)
+        r2[np.arange(len(r)), r] = np.inf
+        np.maximum(r2, 1e-9, out=r2)
+        F[a:a + step] = (d * (k2 / r2)[..., None]).sum(1)
+    return F
+
+
+# Near field: pairs within the 3 x 3 block of grid cells (side = cutoff,
+# 2k) around each row's cell, with cells holding more than NEAR_CAP points
+# taken as one mass at their centroid. Only occupied cells are stored.
+def _repulsion_near(P, rows, k2, cut):
+    ij = np.floor((P - P.min(0)) / cut).astype(np.int64) + 1
+    ny = int(ij[:, 1].max()) + 2
+    cid = ij[:, 0] * ny + ij[:, 1]
+    order = np.argsort(cid, kind="stable")
+    cells, start, count = np.unique(cid[order], return_index=True, return_counts=True)
+    slot = np.searchsorted(cells, cid)
+    cen = np.stack([np.bincount(slot, P[:, 0]), np.bincount(slot, P[:, 1])], 1) / count[:, None]
+    F = np.zeros((len(rows), 2))
+    loc = np.arange(len(rows))
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            want = cid[rows] + dx * ny + dy
+            c = np.minimum(np.searchsorted(cells, want), len(cells) - 1)
+            ok = cells[c] == want
+            crowd = ok & (count[c] > NEAR_CAP)
+            if crowd.any():
+                d = P[rows[crowd]] - cen[c[crowd]]
+                r2 = np.maximum((d * d).sum(1), k2 * 1e-2)
+                F[crowd] += d * (count[c[crowd]] * k2 / r2)[:, None]
+            cnt = np.where(ok & ~crowd, count[c], 0)
+            tot = int(cnt.sum())
+            if tot == 0:
+                continue
+            i = np.repeat(loc, cnt)
+            j = order[np.repeat(start[c], cnt) + np.arange(tot) - np.repeat(np.cumsum(cnt) - cnt, cnt)]
+            d = P[rows[i]] - P[j]
+            r2 = (d * d).sum(1)
+            keep = (rows[i] != j) & (r2 < cut * cut)
+            i, d, r2 = i[keep], d[keep], np.maximum(r2[keep], 1e-9)
+            f = d * (k2 / r2)[:, None]
+            F[:, 0] += np.bincount(i, f[:, 0], minlength=len(rows))
+            F[:, 1] += np.bincount(i, f[:, 1], minlength=len(rows))
+    return F
+
+
+# Far field on a FAR_CELLS x FAR_CELLS grid over the layout, with each
+# cell's vertices lumped at their centroid (a two-level Barnes-Hut). Rows
+# feel the cells in their own 3 x 3 block individually, skipping centroids
+# inside the cutoff that the near field already covers; cells further out
+# act cell to cell and every row gets its own cell's share. The cost is
+# 9 per row plus FAR_CELLS^4 for the whole grid.
+def _repulsion_far(P, rows, k2, cut):
+    lo = P.min(0)
+    span = max(float((P.max(0) - lo).max()), 1e-9)
+    ij = np.minimum(((P - lo) / span * FAR_CELLS).astype(np.int64), FAR_CELLS - 1)
+    cid = ij[:, 0] * FAR_CELLS + ij[:, 1]
+    size = FAR_CELLS * FAR_CELLS
+    count = np.bincount(cid, minlength=size)
+    cen = np.stack([np.bincount(cid, P[:, 0], size), np.bincount(cid, P[:, 1], size)], 1)
+    cen /= np.maximum(count, 1)[:, None]
+    occ = np.flatnonzero(count)
+    oi, oj = occ // FAR_CELLS, occ % FAR_CELLS
+    d = cen[occ, None, :] - cen[None, occ, :]
+    w = count[occ] * k2 / np.maximum((d * d).sum(-1), 1e-9)
+    w[(np.abs(oi[:, None] - oi[None, :]) <= 1) & (np.abs(oj[:, None] - oj[None, :]) <= 1)] = 0.0
+    cell_f = np.zeros((size, 2))
+    cell_f[occ] = (d * w[..., None]).sum(1)
+    F = cell_f[cid[rows]]
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            x, y = ij[rows, 0] + dx, ij[rows, 1] + dy
+            ok = (x >= 0) & (x < FAR_CELLS) & (y >= 0) & (y < FAR_CELLS)
+            c = np.where(ok, x * FAR_CELLS + y, 0)
+            m = np.where(ok, count[c], 0) - (c == cid[rows])
+            d = P[rows] - cen[c]
+            r2 = (d * d).sum(1)
+            f = np.where((m > 0) & (r2 >= cut * cut), m * k2 / np.maximum(r2, 1e-9), 0.0)
+            F += d * f[:, None]
+    return F
+
+
+# FR iterations on the rows in `rows` (all vertices by default); the rest
+# only push and pull. src/dst list every undirected edge once.
+def _relax(P, src, dst, k, iterations, t0, rows=None):
+    n = len(P)
+    rows = np.arange(n) if rows is None else rows
+    if len(rows) == 0:
+        return P
+    slot = np.full(n, -1)
+    slot[rows] = np.arange(len(rows))
+    k2 = k * k
+    for it in range(iterations):
+        if n <= EXACT_MAX:
+            F = _repulsion_exact(P, rows, k2)
+        else:
+            F = _repulsion_near(P, rows, k2, 2 * k) + _repulsion_far(P, rows, k2, 2 * k)
+        d = P[src] - P[dst]
+        f = d * (np.sqrt((d * d).sum(1)) / k)[:, None]
+        for ends, sign in ((src, -1.0), (dst, 1.0)):
+            at = slot[ends]
+            m = at >= 0
+            F[:, 0] += sign * np.bincount(at[m], f[m, 0], minlength=len(rows))
+            F[:, 1] += sign * np.bincount(at[m], f[m, 1], minlength=len(rows))
+        F -= GRAVITY / np.sqrt(n) * (P[rows] - P.mean(0))
+        t = t0 * (1 - it / iterations)
+        L = np.sqrt((F * F).sum(1))
+        P[rows] += F * (np.minimum(L, t) / np.maximum(L, 1e-12))[:, None]
+    return P
+
+
+# ---------- Coarsening ----------
+# Vertices propose to a random neighbour; mutual proposals merge, then
+# unmatched vertices join the group of the neighbour they proposed to.
+# Returns (group of each vertex, coarse graph).
+def _coarsen(g, rng):
+    n = len(g)
+    deg = np.diff(g.offsets)
+    ids = np.arange(n)
+    group = np.full(n, -1)
+    prop = np.full(n, -1)
+    has = deg > 0
+    for _ in range(3):
+        pick = g.offsets[:-1][has] + (rng.random(int(has.sum())) * deg[has]).astype(np.int64)
+        prop[has] = g.indices[pick]
+        free = group < 0
+        ok = has & free & free[np.maximum(prop, 0)] & (prop[np.maximum(prop, 0)] == ids) & (ids < prop)
+        a = np.flatnonzero(ok)
+        group[a] = a
+        group[prop[a]] = a
+    late = (group < 0) & has
+    late &= group[np.maximum(prop, 0)] >= 0
+    group[late] = group[prop[late]]
+    alone = group < 0
+    group[alone] = ids[alone]
+    _, cmap = np.unique(group, return_inverse=True)
+    nc = int(cmap.max()) + 1
+    src, dst, _ = g.edge_pairs()
+    a, b = cmap[src], cmap[dst]
+    keep = a != b
+    key = np.unique(np.minimum(a[keep], b[keep]) * nc + np.maximum(a[keep], b[keep]))
+    a, b = key // nc, key % nc
+    return cmap, CSRGraph.from_edges(nc, np.concatenate([a, b]), np.concatenate([b, a]))
+
+
+def _normalize(P):
+    P = P - P.mean(0)
+    m = np.abs(P).max()
+    return P / m if m > 0 else P
+
+
+def force_layout(g, seed=4):
+    n = len(g)
+    if n <= 1:
+        return np.zeros((n, 2))
+    rng = np.random.default_rng(seed)
+    levels = [(g, None)]
+    while len(levels[-1][0]) > COARSEST:
+        cmap, coarse = _coarsen(levels[-1][0], rng)
+        if len(coarse) > 0.9 * len(levels[-1][0]):
+            break
+        levels.append((coarse, cmap))
+
+    # ideal edge length 1 at the finest level; a coarse vertex stands for
+    # about n / n_c vertices, so its k grows with the square root of that
+    top = levels[-1][0]
+    k = np.sqrt(n / len(top))
+    side = k * np.sqrt(len(top))
+    P = rng.random((len(top), 2)) * side
+    src, dst, _ = top.edge_pairs()
+    P = _relax(P, src, dst, k, COARSE_ITERATIONS, side / 10)
+    for i in range(len(levels) - 1, 0, -1):
+        fine, cmap = levels[i - 1][0], levels[i][1]
+        k = np.sqrt(n / len(fine))
+        P = P[cmap] + (rng.random((len(fine), 2)) - 0.5) * k
+        src, dst, _ = fine.edge_pairs()
+        P = _relax(P, src, dst, k, FINE_ITERATIONS, k)
+    return _normalize(P)
+
+
+# ---------- Incremental ----------
+def _grow(g, mask, hops):
+    for _ in range(hops):
+        rows = np.flatnonzero(mask)
+        if len(rows) == 0:
+            break
+        cnt = g.offsets[rows + 1] - g.offsets[rows]
+        at = np.repeat(g.offsets[rows], cnt) + np.arange(int(cnt.sum())) - np.repeat(np.cumsum(cnt) - cnt, cnt)
+        mask[g.indices[at]] = True
+    return mask
+
+
+# Re-settles the vertices in `moved` (ids) and their `hops` neighbourhood on
+# top of an existing layout P; rows of P that are NaN are new vertices and
+# start at the mean of their placed neighbours (or beside the drawing when
+# they have none). Everything outside the neighbourhood stays put.
+def settle(g, P, moved, hops=1, iterations=40, seed=4):
+    n = len(g)
+    P = np.array(P, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    placed = ~np.isnan(P).any(1)
+    src, dst, _ = g.edge_pairs()
+    both = placed[src] & placed[dst]
+    if both.any():
+        k = float(np.median(np.sqrt(((P[src[both]] - P[dst[both]]) ** 2).sum(1))))
+    else:
+        k = 2.0 / np.sqrt(max(n, 1))
+    k = k if k > 0 else 2.0 / np.sqrt(max(n, 1))
+    lo, hi = (P[placed].min(0), P[placed].max(0)) if placed.any() else (np.zeros(2), np.zeros(2))
+    for v in np.flatnonzero(~placed):
+        nb = g.indices[g.offsets[v]:g.offsets[v + 1]]
+        nb = nb[placed[nb]]
+        if len(nb):
+            P[v] = P[nb].mean(0) + (rng.random(2) - 0.5) * k
+        else:
+            P[v] = (hi[0] + k, lo[1] + rng.random() * max(hi[1] - lo[1], k))
+        placed[v] = True
+    mask = np.zeros(n, dtype=bool)
+    mask[np.asarray(moved, dtype=np.int64)] = True
+    rows = np.flatnonzero(_grow(g, mask, hops))
+    return _relax(P, src, dst, k, iterations, k, rows)
+
+
+# Layout for the graph g with vertex names V, reusing prev = (names, graph,
+# positions) of a graph drawn before: shared vertices keep their place and
+# only new vertices and the ends of added or removed edges are settled. Falls
+# back to force_layout when nothing is shared or more than MAX_MOVED of the
+# vertices would move. An editor patch hands over (names, g, positions,
+# moved) with the rows already in g's id order, and skips the diff. full()
+# gives the from-scratch layout (force_layout(g) by default), so callers can
+# serve it from a cache.
+def update_layout(V, g, prev=None, full=None):
+    if full is None:
+        full = lambda: force_layout(g)
+    if prev is None:
+        return full()
+    if len(prev) > 3 and prev[1] is g:
+        moved = prev[3]
+        return full() if len(moved) > MAX_MOVED * len(g) else settle(g, prev[2], moved)
+    pV, pg, pP = prev[:3]
+    n = len(V)
+    at = {v: i for i, v in enumerate(pV)}
+    old = np.array([at.get(v, -1) for v in V], dtype=np.int64)
+    keep = old >= 0
+    if n == 0 or not keep.any():
+        return full()
+    P = np.full((n, 2), np.nan)
+    P[keep] = np.asarray(pP)[old[keep]]
+    new_id = np.full(len(pV), -1)
+    new_id[old[keep]] = np.flatnonzero(keep)
+    # int64 edge keys: edge_pairs ids are int32 and u * n overflows past ~46k
+    src, dst, _ = g.edge_pairs()
+    src, dst = src.astype(np.int64), dst.astype(np.int64)
+    ps, pd, _ = pg.edge_pairs()
+    ps, pd = new_id[ps], new_id[pd]
+    both = (ps >= 0) & (pd >= 0)
+    before = np.minimum(ps[both], pd[both]) * n + np.maximum(ps[both], pd[both])
+    changed = np.setxor1d(src * n + dst, before)
+    moved = np.unique(np.concatenate([np.flatnonzero(~keep), changed // n, changed % n]))
+    if len(moved) > MAX_MOVED * n:
+        return full()
+    return settle(g, P, moved)
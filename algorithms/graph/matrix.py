@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+# Sanitization of the editable adjacency / weight matrices. Labels are
+# aligned once on the pandas side; coercion, clipping, diagonal zeroing and
+# symmetrization then run on a single NumPy array, without stack/unstack or
+# per-vertex loops. edge_edits reads an edited matrix against the sanitized
+# one, so an editor change becomes a short list of edge updates.
+#
+# An infinite cell is rejected with MatrixError rather than read as 0: "inf"
+# looks like an edge by value but like no edge as a weight. Blank and
+# non-numeric cells mean 0 (no edge).
+
+
+class MatrixError(ValueError):
+    pass
+
+
+def _square(df):
+    df = pd.DataFrame(df)
+    keep = [not str(c).startswith("::") for c in df.columns]
+    df = df.loc[:, keep]
+    rows = pd.Index(df.index).astype(str)
+    cols = pd.Index(df.columns).astype(str)
+    V = sorted(set(rows) | set(cols))
+    if not V:
+        return V, None
+    if list(rows) == V and list(cols) == V:
+        X = df.to_numpy()
+    else:
+        df = df.set_axis(rows, axis=0).set_axis(cols, axis=1)
+        X = df.reindex(index=V, columns=V).to_numpy()
+    n = len(V)
+    return V, _numeric(X, lambda k: (V[k // n], V[k % n]))
+
+
+# float64 copy with anything non-numeric turned into 0; cell(k) names the
+# k-th (flat) entry when one is infinite.
+def _numeric(X, cell):
+    if X.dtype.kind in "biuf":
+        M = X.astype(float)
+    else:
+        M = pd.to_numeric(pd.Series(X.ravel()), errors="coerce").to_numpy(dtype=float).reshape(X.shape)
+    bad = np.flatnonzero(np.isinf(M))
+    if len(bad):
+        u, v = cell(int(bad[0]))
+        raise MatrixError(f"infinite value in cell ({u}, {v}); enter a number, 0 for no edge")
+    M[np.isnan(M)] = 0.0
+    return M
+
+
+def sanitize_adjacency(df):
+    V, M = _square(df)
+    if M is None:
+        return pd.DataFrame(0, index=[], columns=[])
+    A = M > 0.5
+    np.fill_diagonal(A, False)
+    A |= A.T
+    return pd.DataFrame(A.astype(int), index=V, columns=V)
+
+
+def sanitize_weights(df):
+    V, M = _square(df)
+    if M is None:
+        return pd.DataFrame(0.0, index=[], columns=[])
+    np.maximum(M, 0.0, out=M)
+    np.fill_diagonal(M, 0.0)
+    M = np.minimum(M, M.T)
+    return pd.DataFrame(M, index=V, columns=V)
+
+
+# Cells where the editor's X differs from the sanitized M, as undirected
+# edits (u, v, value) with u < v and value 0/1 for adjacency or the weight
+# (0 = no edge). Only the differing cells are coerced, and an edited cell
+# sets both directions. When a cell and its mirror are both edited they
+# resolve like the sanitizers: either one adds the edge, the smaller weight
+# wins. Edits that leave an edge as it was are dropped. V labels the
+# vertices in a MatrixError (default: their ids).
+def edge_edits(M, X, weighted=False, V=None):
+    M = np.asarray(M)
+    n = len(M)
+    i, j = np.nonzero(np.asarray(X) != M)
+    off = i != j
+    i, j = i[off], j[off]
+    V = range(n) if V is None else V
+    x = _numeric(np.asarray(X)[i, j], lambda k: (V[i[k]], V[j[k]]))
+    x = np.maximum(x, 0.0) if weighted else (x > 0.5).astype(float)
+    key, inv = np.unique(np.minimum(i, j) * n + np.maximum(i, j), return_inverse=True)
+    val = np.full(len(key), np.inf if weighted else 0.0)
+    (np.minimum if weighted else np.maximum).at(val, inv, x)
+    u, v = key // max(n, 1), key % max(n, 1)
+    cur = M[u, v].astype(float) if weighted else (M[u, v] > 0).astype(float)
+    changed = val != cur
+    return u[changed], v[changed], val[changed]
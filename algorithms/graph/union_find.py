@@ -0,0 +1,312 @@
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+import streamlit as st
+from matplotlib.colors import to_rgba_array
+from algorithms.graph.dijkstra import DijkstraVisualizer
+from algorithms.graph.engine import (
+    HOP_BINS, UNION_RULES, compare_union_find, init_union_find, run_union_find, step_union_find,
+)
+from components.graphStyle import COLORS, GRAPH_LAYOUT_CONFIG
+from components.graph_draw import draw_graph, draw_graph_lod, edge_styles, vertex_colors
+from components.trace_cache import trace_key
+
+# Disjoint-set (union-find) visualizer on the Dijkstra visualizer's input
+# and drawing: one union per edge of the graph, with path compression and
+# the union rule (by rank, by size or none) switchable. Each step shows
+# the two finds as pointer paths, and every pointer followed is counted as
+# a hop. A costs panel runs every union over every mix of the two options,
+# so the mean hops per find can be compared on large graphs.
+
+ORDERS = ["Shuffled", "Graph order"]
+FOREST_MAX = 40
+COST_BUDGET = 20_000_000
+
+
+def _rule_label(rule):
+    return {"Rank": "rank", "Size": "size", "None": "-"}[rule]
+
+
+class UnionFindVisualizer(DijkstraVisualizer):
+    KEYS = (
+        "parent", "rank", "compress", "rule", "visited", "merged", "sets", "at",
+        "finds", "hops", "max_hops", "hop_hist", "current", "edges", "ev", "fin", "step",
+    )
+    TITLE = "Union-Find State"
+    HAS_START = False
+
+    def __init__(self):
+        super().__init__()
+        self.ns = "unionfind"
+        self._pairs = None
+        self._pairs_key = None
+
+    # No start vertex; the state waits for the edge order, which is only
+    # known once the controls have run.
+    def _ensure_state(self, V, start_v, gkey):
+        if V and self._pairs is None:
+            return
+        super()._ensure_state(V, None, gkey)
+
+    def _options(self):
+        s = st.session_state
+        return (
+            bool(s.get(f"{self.ns}_compress_on", True)),
+            s.get(f"{self.ns}_union_rule", UNION_RULES[0]),
+            s.get(f"{self.ns}_edge_order", ORDERS[0]),
+        )
+
+    # Edges to union as (src, dst) id arrays, in graph order or shuffled
+    # with a fixed seed; kept per graph and order.
+    def _edge_order(self, G):
+        order = self._options()[2]
+        cached = st.session_state.get(f"{self.ns}_pairs")
+        if cached is None or cached[0] is not G or cached[1] != order:
+            src, dst, _ = G.edge_pairs()
+            if order == "Shuffled":
+                perm = np.random.default_rng(0).permutation(len(src))
+                src, dst = src[perm], dst[perm]
+            cached = st.session_state[f"{self.ns}_pairs"] = (G, order, src, dst, trace_key(len(G), src, dst))
+        return cached[2:]
+
+    def _new_state(self, V, start_v):
+        compress, rule, _ = self._options()
+        m = len(self._pairs[0]) if self._pairs is not None else 0
+        return init_union_find(len(V), m, compress, rule)
+
+    def _step(self, state, G):
+        step_union_find(state, *self._pairs)
+
+    def _run_all(self, V, G, start):
+        compress, rule, _ = self._options()
+        return run_union_find(len(V), *self._pairs, compress, rule)
+
+    def _run_key(self, V):
+        return self._options() + (self._pairs_key,)
+
+    def _target_controls(self, V, G):
+        c1, c2, c3 = st.columns([2, 2, 2])
+        c1.checkbox("Path compression", value=True, key=f"{self.ns}_compress_on")
+        c2.selectbox("Union by", UNION_RULES, key=f"{self.ns}_union_rule")
+        c3.selectbox("Edge order", ORDERS, key=f"{self.ns}_edge_order")
+        src, dst, self._pairs_key = self._edge_order(G)
+        self._pairs = (src, dst)
+
+    # Root of every vertex, by pointer jumping on a copy of parent.
+    def _roots(self):
+        r = np.array(st.session_state[f"{self.ns}_parent"])
+        while True:
+            nxt = r[r]
+            if np.array_equal(nxt, r):
+                return r
+            r = nxt
+
+    # Vertices on the two find paths of the step on screen.
+    def _paths(self):
+        ev = st.session_state[f"{self.ns}_ev"]
+        return list(ev[5]) + list(ev[6]) if ev[0] in ("union", "same") else []
+
+    # Edges that joined two sets so far.
+    def _tree(self):
+        src, dst = self._pairs
+        merged = st.session_state[f"{self.ns}_merged"]
+        return np.stack([src[merged], dst[merged]], 1)
+
+    def _frontier(self):
+        front = np.zeros(len(st.session_state[f"{self.ns}_parent"]), dtype=bool)
+        front[self._paths()] = True
+        return front
+
+    # Graph with joined vertices as visited, the find paths as the frontier,
+    # the edge being unioned highlighted and the spanning forest so far.
+    def _plot(self, ax, V, G, start_v, **style):
+        if len(V) == 0 or len(V) > GRAPH_LAYOUT_CONFIG["max_draw_vertices"]:
+            return
+        s = st.session_state
+        cur = None if s[f"{self.ns}_fin"] else s[f"{self.ns}_current"]
+        src, dst, _ = G.edge_pairs()
+        if len(V) > GRAPH_LAYOUT_CONFIG["lod_vertices"]:
+            draw_graph_lod(
+                ax, self._layout(V, G), src, dst, s[f"{self.ns}_visited"], self._frontier(),
+                cur, None, s[f"{self.ns}_edges"], self._tree(), density=s.get("sb_density", False),
+            )
+            return
+        edges = np.asarray(s[f"{self.ns}_edges"], dtype=np.int64).reshape(-1, 2)
+        ec, ew = edge_styles(len(V), src, dst, np.concatenate([edges, self._tree()]))
+        nc = vertex_colors(s[f"{self.ns}_visited"], cur)
+        front = self._frontier()
+        if cur is not None:
+            front[cur] = False
+        nc[front] = to_rgba_array([COLORS["active"]])[0]
+        draw_graph(ax, self._layout(V, G), src, dst, nc, ec, ew, labels=V, **style)
+
+    def _find_html(self, names, x, hops, path, compress):
+        shown = " → ".join(f'<span class="vertex">{names[v]}</span>' for v in path)
+        if hops + 1 > len(path):
+            shown += f" → … ({hops + 1 - len(path)} more)"
+        note = ""
+        if compress and hops > 1:
+            note = f'<div style="margin-left:1rem;color:var(--text-secondary)">compressed: {hops - 1} pointer(s) now go straight to {names[path[-1]] if hops + 1 == len(path) else "the root"}</div>'
+        return f'<div class="action">find({names[x]}): {shown} · {hops} hop{"s" if hops != 1 else ""}</div>{note}'
+
+    def _exp_html(self, ev):
+        s = st.session_state
+        names = s[f"{self.ns}_names"]
+        compress, rule = s[f"{self.ns}_compress"], s[f"{self.ns}_rule"]
+        kind = ev[0]
+        if kind == "init":
+            return f'''<div class="step-content">
+<div class="step-header">Initialization</div>
+<div class="action">{ev[1]} singleton sets, {ev[2]} edges to union</div>
+<div class="action">Path compression {"on" if compress else "off"}; union by {rule.lower() if rule != "None" else "neither rank nor size"}</div>
+</div>'''
+        finds = max(s[f"{self.ns}_finds"], 1)
+        if kind == "done":
+            return f'''<div class="step-content"><div class="step-header">Done</div><div class="completion">✓ Every edge unioned<br><strong>Sets:</strong> {s[f"{self.ns}_sets"]} · <strong>Finds:</strong> {s[f"{self.ns}_finds"]} · <strong>Hops:</strong> {s[f"{self.ns}_hops"]} · <strong>Mean hops per find:</strong> {s[f"{self.ns}_hops"] / finds:.3f}</div></div>'''
+        a, b, ha, hb, pa, pb = ev[1:7]
+        exp = [f'<div class="step-content"><div class="step-header">Step {s[f"{self.ns}_step"]} · edge {names[a]} – {names[b]}</div>']
+        exp.append(self._find_html(names, a, ha, pa, compress))
+        exp.append(self._find_html(names, b, hb, pb, compress))
+        if kind == "same":
+            exp.append(f'<div class="action" style="color:var(--text-muted)">Same root {names[ev[7]]}: already in one set, no union</div>')
+        else:
+            root, child = ev[7], ev[8]
+            label = _rule_label(rule)
+            extra = f" ({label} of {names[root]} now {s[f'{self.ns}_rank'][root]})" if rule != "None" else ""
+            exp.append(f'<div class="action">union: root <span class="vertex">{names[child]}</span> now points at <span class="vertex">{names[root]}</span>{extra}</div>')
+        exp.append(f'<div style="margin-top:0.5rem;color:var(--text-secondary)">{s[f"{self.ns}_sets"]} sets · {ha + hb} hops this union · {s[f"{self.ns}_hops"] / finds:.3f} mean hops per find</div>')
+        exp.append('</div>')
+        return "".join(exp)
+
+    def _state_table(self, V, apsp=None):
+        s = st.session_state
+        names = s[f"{self.ns}_names"]
+        parent = s[f"{self.ns}_parent"]
+        roots = self._roots()
+        size = np.bincount(roots, minlength=len(roots))
+        df = pd.DataFrame({
+            "Vertex": names,
+            "Parent": [names[p] for p in parent.tolist()],
+            "Root": [names[r] for r in roots.tolist()],
+            "Set size": size[roots],
+        })
+        if s[f"{self.ns}_rule"] != "None":
+            df[_rule_label(s[f"{self.ns}_rule"]).capitalize()] = np.where(roots == np.arange(len(roots)), s[f"{self.ns}_rank"].astype(str), "-")
+        self._show_table(df)
+
+    def _cost_pills(self):
+        s = st.session_state
+        finds = s[f"{self.ns}_finds"]
+        mean = f"{s[f'{self.ns}_hops'] / finds:.3f}" if finds else "-"
+        st.markdown(f'''
+            <div class="bfs-meta">
+                <div class="pill"><div class="h">Sets</div><div class="v">{s[f"{self.ns}_sets"]:,}</div></div>
+                <div class="pill"><div class="h">Finds</div><div class="v">{finds:,}</div></div>
+                <div class="pill"><div class="h">Hops</div><div class="v">{s[f"{self.ns}_hops"]:,}</div></div>
+                <div class="pill"><div class="h">Hops / find</div><div class="v">{mean}</div></div>
+                <div class="pill"><div class="h">Longest</div><div class="v">{s[f"{self.ns}_max_hops"]}</div></div>
+            </div>
+            ''', unsafe_allow_html=True)
+
+    def _hops_panel(self):
+        hist = st.session_state[f"{self.ns}_hop_hist"]
+        st.markdown('<div class="frame-title">Hops per Find</div>', unsafe_allow_html=True)
+        if not hist.sum():
+            st.markdown('<div class="frame-hint">No find yet</div>', unsafe_allow_html=True)
+            return
+        last = int(np.flatnonzero(hist)[-1]) + 1
+        labels = [str(i) for i in range(last)]
+        if last == HOP_BINS:
+            labels[-1] += "+"
+        st.bar_chart(pd.DataFrame({"Finds": hist[:last]}, index=labels), height=180)
+
+    # Parent pointers as a forest, roots on top; the two find paths of the
+    # step on screen are highlighted.
+    def _forest_panel(self):
+        s = st.session_state
+        names = s[f"{self.ns}_names"]
+        parent = s[f"{self.ns}_parent"].tolist()
+        n = len(parent)
+        st.markdown('<div class="frame-title">Parent Forest</div>', unsafe_allow_html=True)
+        if n > FOREST_MAX:
+            st.markdown(f'<div class="frame-hint">Drawn up to {FOREST_MAX} vertices; the table lists every parent pointer.</div>', unsafe_allow_html=True)
+            return
+        children = [[] for _ in range(n)]
+        for v, p in enumerate(parent):
+            if p != v:
+                children[p].append(v)
+        x, y, slot = np.zeros(n), np.zeros(n), 0
+        for r in (v for v in range(n) if parent[v] == v):
+            stack = [(r, 0, False)]
+            while stack:
+                v, d, done = stack.pop()
+                if done:
+                    x[v] = np.mean([x[c] for c in children[v]])
+                    continue
+                y[v] = -d
+                if children[v]:
+                    stack.append((v, d, True))
+                    stack.extend((c, d + 1, False) for c in reversed(children[v]))
+                else:
+                    x[v] = slot
+                    slot += 1
+        on = set()
+        paths = self._paths()
+        ev = s[f"{self.ns}_ev"]
+        if ev[0] in ("union", "same"):
+            for path in (ev[5], ev[6]):
+                on.update(zip(path[:-1], path[1:]))
+        fig, ax = plt.subplots(figsize=(7.6, 2.8))
+        fig.patch.set_facecolor(COLORS["background"])
+        for v, p in enumerate(parent):
+            if p != v:
+                hi = (v, p) in on
+                ax.annotate("", xy=(x[p], y[p]), xytext=(x[v], y[v]), zorder=1, arrowprops=dict(
+                    arrowstyle="-|>", shrinkA=9, shrinkB=9, lw=2.0 if hi else 1.0,
+                    color=GRAPH_LAYOUT_CONFIG["edge_color_highlight"] if hi else GRAPH_LAYOUT_CONFIG["edge_color_regular"],
+                ))
+        front = np.zeros(n, dtype=bool)
+        front[paths] = True
+        nc = vertex_colors(np.array(parent) == np.arange(n))
+        nc[front] = to_rgba_array([COLORS["active"]])[0]
+        ax.scatter(x, y, s=260, c=nc, zorder=2, edgecolors=GRAPH_LAYOUT_CONFIG["node_border_color"], linewidths=1)
+        for i in range(n):
+            ax.text(x[i], y[i], names[i], ha="center", va="center", fontsize=8, color=GRAPH_LAYOUT_CONFIG["font_color"], zorder=3)
+        ax.margins(0.08)
+        ax.set_facecolor(COLORS["background"])
+        ax.axis("off")
+        plt.tight_layout()
+        st.pyplot(fig)
+        plt.close(fig)
+
+    # Every union of the graph for each mix of compression and union rule,
+    # with the running mean hops per find; kept per graph and edge order.
+    # Runs stop after COST_BUDGET hops, which only the unbalanced ones reach.
+    def _costs_panel(self, V, G):
+        s = st.session_state
+        st.markdown('<div class="frame-title">Amortized Cost</div>', unsafe_allow_html=True)
+        if not st.checkbox("Compare all options", value=True, key=f"{self.ns}_costs_on"):
+            return
+        src, dst = self._pairs
+        key = self._pairs_key
+        cached = s.get(f"{self.ns}_costs")
+        if cached is None or cached[0] != key:
+            with st.spinner(f"Running {len(src):,} unions for every option"):
+                cached = s[f"{self.ns}_costs"] = (key, compare_union_find(len(V), src, dst, COST_BUDGET))
+        res = cached[1]
+        st.dataframe(pd.DataFrame({
+            "Unions": [f"{r['unions']:,}" + ("" if r["complete"] else " (stopped)") for r in res.values()],
+            "Hops / find": [f"{r['hops'] / max(r['finds'], 1):.3f}" for r in res.values()],
+            "Longest find": [r["max_hops"] for r in res.values()],
+            "Time": [f"{r['seconds']:.2f}s" for r in res.values()],
+        }, index=list(res)), use_container_width=True)
+        series = {name: pd.Series(dict(r["series"])) for name, r in res.items() if r["series"]}
+        if series:
+            st.line_chart(pd.DataFrame(series), height=200)
+            st.caption("Mean hops per find against unions done")
+
+    def _side_panels(self, V, G, apsp):
+        self._cost_pills()
+        self._forest_panel()
+        self._hops_panel()
+        self._costs_panel(V, G)
@@ -2,9 +2,14 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-import time, copy, io, os, html
+import io, os, html
 from matplotlib.backends.backend_pdf import PdfPages
+from algorithms.searching.engine import init_binary, run_binary, step_binary
 from components.graphStyle import COLORS, GRAPH_LAYOUT_CONFIG
+from components.history import StepHistory
+from components.player import PLAYER_BATCH, figure_png, player_reached, render_player
+from components.sidebar import render_debug_panel, render_step_scrubber
+from components.trace_cache import TRACES, trace_key
 
 try:
     from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, DataReturnMode
@@ -47,42 +52,15 @@ class BinarySearchVisualizer:
             except Exception:
                 return txt
 
-    def _to_num_or_str(self, x):
-        try:
-            if isinstance(x, str) and "." in x:
-                return float(x)
-            return int(x)
-        except Exception:
-            try:
-                return float(x)
-            except Exception:
-                return str(x)
-
-    def _cmp(self, a, b):
-        aa = self._to_num_or_str(a)
-        bb = self._to_num_or_str(b)
-        if isinstance(aa, (int, float)) and isinstance(bb, (int, float)):
-            return -1 if aa < bb else (1 if aa > bb else 0)
-        sa, sb = str(aa), str(bb)
-        return -1 if sa < sb else (1 if sa > sb else 0)
-
     def _ensure_state(self, A, target, gkey):
         tag = f"{self.ns}_inited"
         if (not st.session_state.get(tag)) or st.session_state.get(f"{self.ns}_gkey") != gkey:
-            n = len(A)
-            st.session_state[f"{self.ns}_visited"] = {i: False for i in range(n)}
-            st.session_state[f"{self.ns}_lo"] = 0 if n > 0 else None
-            st.session_state[f"{self.ns}_hi"] = n - 1 if n > 0 else None
-            st.session_state[f"{self.ns}_mid"] = None
-            st.session_state[f"{self.ns}_current"] = None
-            st.session_state[f"{self.ns}_found_idx"] = None
-            st.session_state[f"{self.ns}_step"] = 0
-            st.session_state[f"{self.ns}_fin"] = (n == 0)
-            st.session_state[f"{self.ns}_hist"] = []
-            st.session_state[f"{self.ns}_exp"] = self._exp_init(target, n)
+            self._restore(init_binary(A, target))
+            st.session_state[f"{self.ns}_hist"] = StepHistory()
             st.session_state[f"{self.ns}_gkey"] = gkey
             st.session_state[tag] = True
             self._push()
+            st.session_state[f"{self.ns}_pos"] = 0
 
     def _code_block(self, stage="start", lo=None, hi=None, mid=None):
         lines = [
@@ -133,88 +111,110 @@ class BinarySearchVisualizer:
 <div style="margin-top:0.5rem">{code}</div>
 </div>"""
 
-    def _push(self):
-        h = {
-            "visited": copy.deepcopy(st.session_state[f"{self.ns}_visited"]),
+    def _snapshot(self):
+        return {
+            "visited": st.session_state[f"{self.ns}_visited"],
             "lo": st.session_state[f"{self.ns}_lo"],
             "hi": st.session_state[f"{self.ns}_hi"],
             "mid": st.session_state[f"{self.ns}_mid"],
             "current": st.session_state[f"{self.ns}_current"],
             "found_idx": st.session_state[f"{self.ns}_found_idx"],
-            "exp": st.session_state[f"{self.ns}_exp"],
+            "ev": st.session_state[f"{self.ns}_ev"],
             "fin": st.session_state[f"{self.ns}_fin"],
             "step": st.session_state[f"{self.ns}_step"],
         }
-        st.session_state[f"{self.ns}_hist"].append(h)
+
+    def _push(self):
+        st.session_state[f"{self.ns}_hist"].append(self._snapshot())
 
     def _restore(self, s):
-        st.session_state[f"{self.ns}_visited"] = copy.deepcopy(s["visited"])
+        st.session_state[f"{self.ns}_visited"] = s["visited"]
         st.session_state[f"{self.ns}_lo"] = s["lo"]
         st.session_state[f"{self.ns}_hi"] = s["hi"]
         st.session_state[f"{self.ns}_mid"] = s["mid"]
         st.session_state[f"{self.ns}_current"] = s["current"]
         st.session_state[f"{self.ns}_found_idx"] = s["found_idx"]
-        st.session_state[f"{self.ns}_exp"] = s["exp"]
+        st.session_state[f"{self.ns}_ev"] = s["ev"]
         st.session_state[f"{self.ns}_fin"] = s["fin"]
         st.session_state[f"{self.ns}_step"] = s["step"]
 
-    def _binary_step(self, A, target):
-        if st.session_state[f"{self.ns}_fin"]:
+    def _goto(self, idx):
+        hist = st.session_state[f"{self.ns}_hist"]
+        idx = max(0, min(int(idx), len(hist) - 1))
+        self._restore(hist[idx])
+        st.session_state[f"{self.ns}_pos"] = idx
+
+    def _advance(self, A, target):
+        hist = st.session_state[f"{self.ns}_hist"]
+        if st.session_state[f"{self.ns}_pos"] < len(hist) - 1:
+            self._goto(st.session_state[f"{self.ns}_pos"] + 1)
             return
-        st.session_state[f"{self.ns}_step"] += 1
-        lo = st.session_state[f"{self.ns}_lo"]
-        hi = st.session_state[f"{self.ns}_hi"]
-        if lo is None or hi is None or lo > hi:
-            code = self._code_block(stage="done", lo=lo, hi=hi)
-            st.session_state[f"{self.ns}_fin"] = True
-            st.session_state[f"{self.ns}_mid"] = None
-            st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
+        self._binary_step(A, target)
+        self._push()
+        st.session_state[f"{self.ns}_pos"] = len(hist) - 1
+
+    def _compile(self, A, target):
+        hist = st.session_state[f"{self.ns}_hist"]
+        if hist.peek("fin"):
+            return
+        pos = st.session_state[f"{self.ns}_pos"]
+        key = trace_key(self.ns, list(A), target)
+        st.session_state[f"{self.ns}_hist"] = TRACES.trace(key, lambda: run_binary(A, target))
+        self._goto(pos)
+
+    # Past the recorded history the engine runs in a tight loop on one working
+    # state; only the step landed on is restored and drawn. idx=None runs to
+    # the end.
+    def _seek(self, idx, A, target):
+        hist = st.session_state[f"{self.ns}_hist"]
+        if idx is None or idx >= len(hist):
+            self._goto(len(hist) - 1)
+            state = self._snapshot()
+            while (idx is None or len(hist) <= idx) and not state["fin"]:
+                step_binary(state, A, target)
+                hist.append(state)
+            if idx is None:
+                idx = len(hist) - 1
+        self._goto(idx)
+
+    def _binary_step(self, A, target):
+        state = self._snapshot()
+        step_binary(state, A, target)
+        self._restore(state)
+
+    # Steps only record a small event; the HTML is built for the step on screen.
+    def _exp_html(self, ev):
+        kind = ev[0]
+        if kind == "init":
+            return self._exp_init(ev[1], ev[2])
+        head = f'''<div class="step-content">
 <div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="completion">lo > hi ⇒ target not found.</div>
+'''
+        if kind == "not_found":
+            _, lo, hi = ev
+            code = self._code_block(stage="done", lo=lo, hi=hi)
+            return f'''{head}<div class="completion">lo > hi ⇒ target not found.</div>
 <div style="margin-top:0.5rem">{code}</div>
-</div>"""
-            return
-        mid = (lo + hi) // 2
-        st.session_state[f"{self.ns}_mid"] = mid
-        st.session_state[f"{self.ns}_current"] = mid
-        st.session_state[f"{self.ns}_visited"][mid] = True
+</div>'''
+        _, lo, hi, mid, val = ev
         code0 = self._code_block(stage="choose_mid", lo=lo, hi=hi, mid=mid)
-        val = A[mid]
-        c = self._cmp(val, target)
-        if c == 0:
-            st.session_state[f"{self.ns}_found_idx"] = mid
-            st.session_state[f"{self.ns}_fin"] = True
+        if kind == "found":
             code = self._code_block(stage="found", lo=lo, hi=hi, mid=mid)
-            st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">mid = ⌊(lo + hi)/2⌋ = <span class="vertex">{mid}</span></div>
-<div class="action">Compare A[{mid}] = <span class="vertex">{val}</span> with target ⇒ match ✓</div>
-<div class="completion">Return index <span class="vertex">{mid}</span></div>
-<div style="margin-top:0.5rem">{code0}</div>
-<div style="margin-top:0.5rem">{code}</div>
-</div>"""
-        elif c < 0:
-            st.session_state[f"{self.ns}_lo"] = mid + 1
-            code = self._code_block(stage="go_right", lo=st.session_state[f"{self.ns}_lo"], hi=hi, mid=mid)
-            st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">mid = ⌊(lo + hi)/2⌋ = <span class="vertex">{mid}</span></div>
-<div class="action">A[{mid}] = <span class="vertex">{val}</span> &lt; target ⇒ search right half</div>
-<div class="action">lo ← mid + 1 ⇒ <span class="vertex">{st.session_state[f"{self.ns}_lo"]}</span></div>
-<div style="margin-top:0.5rem">{code0}</div>
-<div style="margin-top:0.5rem">{code}</div>
-</div>"""
+            body = f'''<div class="action">Compare A[{mid}] = <span class="vertex">{val}</span> with target ⇒ match ✓</div>
+<div class="completion">Return index <span class="vertex">{mid}</span></div>'''
+        elif kind == "right":
+            code = self._code_block(stage="go_right", lo=mid + 1, hi=hi, mid=mid)
+            body = f'''<div class="action">A[{mid}] = <span class="vertex">{val}</span> &lt; target ⇒ search right half</div>
+<div class="action">lo ← mid + 1 ⇒ <span class="vertex">{mid + 1}</span></div>'''
         else:
-            st.session_state[f"{self.ns}_hi"] = mid - 1
-            code = self._code_block(stage="go_left", lo=lo, hi=st.session_state[f"{self.ns}_hi"], mid=mid)
-            st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">mid = ⌊(lo + hi)/2⌋ = <span class="vertex">{mid}</span></div>
-<div class="action">A[{mid}] = <span class="vertex">{val}</span> &gt; target ⇒ search left half</div>
-<div class="action">hi ← mid - 1 ⇒ <span class="vertex">{st.session_state[f"{self.ns}_hi"]}</span></div>
+            code = self._code_block(stage="go_left", lo=lo, hi=mid - 1, mid=mid)
+            body = f'''<div class="action">A[{mid}] = <span class="vertex">{val}</span> &gt; target ⇒ search left half</div>
+<div class="action">hi ← mid - 1 ⇒ <span class="vertex">{mid - 1}</span></div>'''
+        return f'''{head}<div class="action">mid = ⌊(lo + hi)/2⌋ = <span class="vertex">{mid}</span></div>
+{body}
 <div style="margin-top:0.5rem">{code0}</div>
 <div style="margin-top:0.5rem">{code}</div>
-</div>"""
+</div>'''
 
     def _ag_clean(self, original_df, ag_out):
         df_out = pd.DataFrame(ag_out.data if hasattr(ag_out, "data") else ag_out)
@@ -370,12 +370,28 @@ class BinarySearchVisualizer:
         ax2.text(0.02, 0.75, plain_text, fontsize=10, color="#e6ecff", va="top", family="monospace", wrap=True, linespacing=1.5)
         return fig
 
+    # Auto-play renders the next batch of frames, from the cursor on, once
+    # and lets the browser play them. The cursor stays put; it only moves
+    # when the player reports the step it reached (player_reached), and the
+    # rerun that follows sends the batch starting there.
+    def _autoplay(self, speed, A, target):
+        pos = st.session_state[f"{self.ns}_pos"]
+        self._seek(pos + PLAYER_BATCH - 1, A, target)
+        end = st.session_state[f"{self.ns}_pos"]
+        more = not st.session_state.get(f"{self.ns}_fin", False)
+        frames = []
+        for s in st.session_state[f"{self.ns}_hist"].states(pos, end + 1):
+            self._restore(s)
+            frames.append(figure_png(self._frame_figure(A, target, self._exp_html(s["ev"]))))
+        self._goto(pos)
+        render_player(frames, speed, self.ns, first_step=pos, more=more)
+
     def _export(self, fmt, fps, A, target):
         frames = []
         saved = []
-        for s in st.session_state[f"{self.ns}_hist"]:
+        for s in st.session_state[f"{self.ns}_hist"].states(0, st.session_state[f"{self.ns}_pos"] + 1):
             self._restore(s)
-            fig = self._frame_figure(A, target, s["exp"])
+            fig = self._frame_figure(A, target, self._exp_html(s["ev"]))
             buf = io.BytesIO()
             fig.savefig(buf, format="png", dpi=140, facecolor=fig.get_facecolor())
             plt.close(fig)
@@ -385,9 +401,9 @@ class BinarySearchVisualizer:
         if fmt == "PDF":
             path = os.path.join(outdir, f"{self.ns}_run.pdf")
             with PdfPages(path) as pdf:
-                for s in st.session_state[f"{self.ns}_hist"]:
+                for s in st.session_state[f"{self.ns}_hist"].states(0, st.session_state[f"{self.ns}_pos"] + 1):
                     self._restore(s)
-                    fig = self._frame_figure(A, target, s["exp"])
+                    fig = self._frame_figure(A, target, self._exp_html(s["ev"]))
                     pdf.savefig(fig, facecolor=fig.get_facecolor()); plt.close(fig)
             saved.append(path)
         elif fmt in ("GIF", "MP4"):
@@ -410,8 +426,11 @@ class BinarySearchVisualizer:
         src = s.get("sb_src", "Sample graph")
         sample = s.get("sb_sample", "Sorted 6")
         auto = s.get("sb_auto", False)
+        precompute = s.get("sb_precompute", False)
         speed = s.get("sb_speed", 0.8)
         next_clicked = s.get("sb_next", False)
+        ff_clicked = s.get("sb_ff", False)
+        end_clicked = s.get("sb_end", False)
         back_clicked = s.get("sb_back", False)
         reset_clicked = s.get("sb_reset", False)
         export_clicked = s.get("sb_export", False)
@@ -472,6 +491,13 @@ class BinarySearchVisualizer:
             target = self._parse_target(s)
             gkey = f"{src}::{sample or 'custom'}::A={','.join(map(str,A))}::t={target}"
             self._ensure_state(A, target, gkey)
+            if precompute and A:
+                self._compile(A, target)
+            seek = st.session_state.pop(f"{self.ns}_seek", None)
+            if seek is None:
+                seek = player_reached(self.ns)
+            if seek is not None and A:
+                self._seek(seek, A, target)
             self._state_table(A)
             visited_count = sum(st.session_state.get(f"{self.ns}_visited", {}).values()) if A else 0
             remaining = max(0, (st.session_state.get(f"{self.ns}_hi",-1) - st.session_state.get(f"{self.ns}_lo",0) + 1)) if A else 0
@@ -486,24 +512,34 @@ class BinarySearchVisualizer:
             </div>
             ''', unsafe_allow_html=True)
 
-        col3, col4 = st.columns(2)
-        with col3:
-            st.markdown('<div class="frame-title">Visualization</div>', unsafe_allow_html=True)
-            self._draw(A, target)
-            st.markdown('<div class="legend"><span><i style="background:#ef4444"></i>Search Range</span><span><i style="background:#f59e0b"></i>Current(mid)</span><span><i style="background:#34d399"></i>Visited</span><span><i style="background:#7c4dff"></i>Found</span><span><i style="background:#3a3f55"></i>Unvisited</span></div>', unsafe_allow_html=True)
-        with col4:
-            st.markdown('<div class="frame-title">Step-by-Step Explanation</div>', unsafe_allow_html=True)
-            exp_html = st.session_state.get(f'{self.ns}_exp', '')
-            st.markdown(f'<div class="step-explanation">{exp_html}</div>', unsafe_allow_html=True)
-
-        manual = next_clicked or back_clicked or reset_clicked
+        manual = next_clicked or back_clicked or reset_clicked or ff_clicked or end_clicked
+        if auto and not manual and not st.session_state.get(f"{self.ns}_fin", False) and len(A) > 0:
+            self._autoplay(speed, A, target)
+        else:
+            col3, col4 = st.columns(2)
+            with col3:
+                st.markdown('<div class="frame-title">Visualization</div>', unsafe_allow_html=True)
+                self._draw(A, target)
+                st.markdown('<div class="legend"><span><i style="background:#ef4444"></i>Search Range</span><span><i style="background:#f59e0b"></i>Current(mid)</span><span><i style="background:#34d399"></i>Visited</span><span><i style="background:#7c4dff"></i>Found</span><span><i style="background:#3a3f55"></i>Unvisited</span></div>', unsafe_allow_html=True)
+            with col4:
+                st.markdown('<div class="frame-title">Step-by-Step Explanation</div>', unsafe_allow_html=True)
+                exp_html = self._exp_html(st.session_state[f'{self.ns}_ev'])
+                st.markdown(f'<div class="step-explanation">{exp_html}</div>', unsafe_allow_html=True)
+
+        render_step_scrubber(self.ns, len(st.session_state[f"{self.ns}_hist"]), st.session_state[f"{self.ns}_pos"])
+        render_debug_panel(self.ns)
+
         if next_clicked and not st.session_state.get(f"{self.ns}_fin", False) and len(A) > 0:
-            self._binary_step(A, target)
-            self._push()
+            self._advance(A, target)
+            st.rerun()
+        if ff_clicked and not st.session_state.get(f"{self.ns}_fin", False) and len(A) > 0:
+            self._seek(st.session_state[f"{self.ns}_pos"] + int(s.get("sb_ff_n", 10)), A, target)
             st.rerun()
-        if back_clicked and len(st.session_state.get(f"{self.ns}_hist", [])) > 1:
-            st.session_state[f"{self.ns}_hist"].pop()
-            self._restore(st.session_state[f"{self.ns}_hist"][-1])
+        if end_clicked and not st.session_state.get(f"{self.ns}_fin", False) and len(A) > 0:
+            self._seek(None, A, target)
+            st.rerun()
+        if back_clicked and st.session_state.get(f"{self.ns}_pos", 0) > 0:
+            self._goto(st.session_state[f"{self.ns}_pos"] - 1)
             st.rerun()
         if reset_clicked:
             st.session_state[f"{self.ns}_inited"] = False
@@ -514,8 +550,3 @@ class BinarySearchVisualizer:
             for p in paths:
                 with open(p, "rb") as f:
                     st.sidebar.download_button("Download " + p.split("/")[-1], f, file_name=p.split("/")[-1], mime="application/octet-stream")
-        if auto and not st.session_state.get(f"{self.ns}_fin", False) and not manual and len(A) > 0:
-            self._binary_step(A, target)
-            self._push()
-            time.sleep(speed)
-            st.rerun()
\ No newline at end of file
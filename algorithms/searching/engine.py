@@ -0,0 +1,140 @@
+# Headless step engines for the searching visualizers. No Streamlit here:
+# each algorithm is an init_* that builds a plain state dict, a step_* that
+# advances it by one step in place, and a run_* generator over both. The
+# array and target are passed to every step; every state carries "step",
+# "fin" and "ev", the event the visualizers turn into the step explanation.
+#
+# run_* yields the same dict after every step; copy it to keep a step.
+
+
+def to_num_or_str(x):
+    try:
+        if isinstance(x, str) and "." in x:
+            return float(x)
+        return int(x)
+    except Exception:
+        try:
+            return float(x)
+        except Exception:
+            return str(x)
+
+
+def compare(a, b):
+    aa = to_num_or_str(a)
+    bb = to_num_or_str(b)
+    if isinstance(aa, (int, float)) and isinstance(bb, (int, float)):
+        return -1 if aa < bb else (1 if aa > bb else 0)
+    sa, sb = str(aa), str(bb)
+    return -1 if sa < sb else (1 if sa > sb else 0)
+
+
+def equal(a, b):
+    def to_num(x):
+        try:
+            if isinstance(x, str) and "." in x:
+                return float(x)
+            return int(x)
+        except Exception:
+            try:
+                return float(x)
+            except Exception:
+                return None
+    na, nb = to_num(a), to_num(b)
+    if na is not None and nb is not None:
+        return (na == nb)
+    return str(a).strip().lower() == str(b).strip().lower()
+
+
+def _run(state, step, A, target):
+    yield state
+    while not state["fin"]:
+        step(state, A, target)
+        yield state
+
+
+# ---------- Linear Search ----------
+def init_linear(A, target):
+    return {
+        "visited": {i: False for i in range(len(A))},
+        "i": 0 if len(A) > 0 else None,
+        "current": None,
+        "found_idx": None,
+        "ev": ("init", target, len(A)),
+        "fin": (len(A) == 0),
+        "step": 0,
+        "edges": [],
+    }
+
+
+def step_linear(state, A, target):
+    if state["fin"]:
+        return
+    i = state["i"]
+    state["step"] += 1
+    if i is None or i >= len(A):
+        state["fin"] = True
+        state["ev"] = ("not_found",)
+        return
+    state["current"] = i
+    val = A[i]
+    state["visited"][i] = True
+    if equal(val, target):
+        state["found_idx"] = i
+        state["fin"] = True
+        state["ev"] = ("found", i, val)
+    else:
+        nxt = i + 1
+        state["i"] = nxt
+        state["ev"] = ("miss", i, val, nxt < len(A))
+
+
+def run_linear(A, target):
+    return _run(init_linear(A, target), step_linear, A, target)
+
+
+# ---------- Binary Search ----------
+def init_binary(A, target):
+    n = len(A)
+    return {
+        "visited": {i: False for i in range(n)},
+        "lo": 0 if n > 0 else None,
+        "hi": n - 1 if n > 0 else None,
+        "mid": None,
+        "current": None,
+        "found_idx": None,
+        "ev": ("init", target, n),
+        "fin": (n == 0),
+        "step": 0,
+    }
+
+
+def step_binary(state, A, target):
+    if state["fin"]:
+        return
+    state["step"] += 1
+    lo, hi = state["lo"], state["hi"]
+    if lo is None or hi is None or lo > hi:
+        state["fin"] = True
+        state["mid"] = None
+        state["ev"] = ("not_found", lo, hi)
+        return
+    mid = (lo + hi) // 2
+    state["mid"] = mid
+    state["current"] = mid
+    state["visited"][mid] = True
+    val = A[mid]
+    c = compare(val, target)
+    if c == 0:
+        state["found_idx"] = mid
+        state["fin"] = True
+        state["ev"] = ("found", lo, hi, mid, val)
+    elif c < 0:
+        state["lo"] = mid + 1
+        state["ev"] = ("right", lo, hi, mid, val)
+    else:
+        state["hi"] = mid - 1
+        state["ev"] = ("left", lo, hi, mid, val)
+
+
+def run_binary(A, target):
+    return _run(init_binary(A, target), step_binary, A, target)
@@ -2,9 +2,14 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-import time, copy, io, os, html
+import io, os, html
 from matplotlib.backends.backend_pdf import PdfPages
+from algorithms.sorting.engine import init_bubble, run_bubble, step_bubble
 from components.graphStyle import COLORS, GRAPH_LAYOUT_CONFIG
+from components.history import StepHistory
+from components.player import PLAYER_BATCH, figure_png, player_reached, render_player
+from components.sidebar import render_debug_panel, render_step_scrubber
+from components.trace_cache import TRACES, trace_key
 
 try:
     from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, DataReturnMode
@@ -37,25 +42,6 @@ class BubbleSortVisualizer:
         df = df.reset_index(drop=True)
         return df
 
-    def _to_num_or_str(self, x):
-        try:
-            if isinstance(x, str) and "." in x:
-                return float(x)
-            return int(x)
-        except Exception:
-            try:
-                return float(x)
-            except Exception:
-                return str(x)
-
-    def _cmp(self, a, b):
-        aa = self._to_num_or_str(a)
-        bb = self._to_num_or_str(b)
-        if isinstance(aa, (int, float)) and isinstance(bb, (int, float)):
-            return -1 if aa < bb else (1 if aa > bb else 0)
-        sa, sb = str(aa), str(bb)
-        return -1 if sa < sb else (1 if sa > sb else 0)
-
     def _code_block(self, stage="compare", i=None, j=None, swapped=False):
         lines = [
             "for i in range(n - 1):",
@@ -103,110 +89,127 @@ class BubbleSortVisualizer:
 <div style="margin-top:0.5rem">{code}</div>
 </div>"""
 
-    def _push(self):
-        h = {
-            "A": copy.deepcopy(st.session_state[f"{self.ns}_A"]),
+    def _snapshot(self):
+        return {
+            "A": st.session_state[f"{self.ns}_A"],
             "i": st.session_state[f"{self.ns}_i"],
             "j": st.session_state[f"{self.ns}_j"],
             "swapped": st.session_state[f"{self.ns}_swapped"],
             "fin": st.session_state[f"{self.ns}_fin"],
             "step": st.session_state[f"{self.ns}_step"],
-            "exp": st.session_state[f"{self.ns}_exp"],
+            "ev": st.session_state[f"{self.ns}_ev"],
             "pair": st.session_state[f"{self.ns}_pair"],
         }
-        st.session_state[f"{self.ns}_hist"].append(h)
 
-    def _restore(self, s):
-        st.session_state[f"{self.ns}_A"] = copy.deepcopy(s["A"])
+    def _push(self):
+        st.session_state[f"{self.ns}_hist"].append(self._snapshot())
+
+    def _load(self, s):
+        st.session_state[f"{self.ns}_A"] = s["A"]
         st.session_state[f"{self.ns}_i"] = s["i"]
         st.session_state[f"{self.ns}_j"] = s["j"]
         st.session_state[f"{self.ns}_swapped"] = s["swapped"]
         st.session_state[f"{self.ns}_fin"] = s["fin"]
         st.session_state[f"{self.ns}_step"] = s["step"]
-        st.session_state[f"{self.ns}_exp"] = s["exp"]
+        st.session_state[f"{self.ns}_ev"] = s["ev"]
         st.session_state[f"{self.ns}_pair"] = s["pair"]
+
+    def _restore(self, s):
+        self._load(s)
         st.session_state[f"{self.ns}_array_df"] = pd.DataFrame({"Value": st.session_state[f"{self.ns}_A"]}, dtype=object)
 
+    def _goto(self, idx):
+        hist = st.session_state[f"{self.ns}_hist"]
+        idx = max(0, min(int(idx), len(hist) - 1))
+        self._restore(hist[idx])
+        st.session_state[f"{self.ns}_pos"] = idx
+
+    def _advance(self):
+        hist = st.session_state[f"{self.ns}_hist"]
+        if st.session_state[f"{self.ns}_pos"] < len(hist) - 1:
+            self._goto(st.session_state[f"{self.ns}_pos"] + 1)
+            return
+        self._bubble_step()
+        self._push()
+        st.session_state[f"{self.ns}_pos"] = len(hist) - 1
+
+    def _compile(self):
+        hist = st.session_state[f"{self.ns}_hist"]
+        if hist.peek("fin"):
+            return
+        pos = st.session_state[f"{self.ns}_pos"]
+        A = hist[0]["A"]
+        st.session_state[f"{self.ns}_hist"] = TRACES.trace(trace_key(self.ns, A), lambda: run_bubble(A))
+        self._goto(pos)
+
+    # Past the recorded history the engine runs in a tight loop on one working
+    # state; only the step landed on is restored and drawn. idx=None runs to
+    # the end.
+    def _seek(self, idx):
+        hist = st.session_state[f"{self.ns}_hist"]
+        if idx is None or idx >= len(hist):
+            self._goto(len(hist) - 1)
+            state = self._snapshot()
+            while (idx is None or len(hist) <= idx) and not state["fin"]:
+                step_bubble(state)
+                hist.append(state)
+            if idx is None:
+                idx = len(hist) - 1
+        self._goto(idx)
+
     def _ensure_state(self, A, gkey):
         tag = f"{self.ns}_inited"
         if (not st.session_state.get(tag)) or st.session_state.get(f"{self.ns}_gkey") != gkey:
-            st.session_state[f"{self.ns}_A"] = list(A)
-            st.session_state[f"{self.ns}_i"] = 0 if len(A) > 1 else None
-            st.session_state[f"{self.ns}_j"] = 0 if len(A) > 1 else None
-            st.session_state[f"{self.ns}_swapped"] = False
-            st.session_state[f"{self.ns}_step"] = 0
-            st.session_state[f"{self.ns}_fin"] = (len(A) <= 1)
-            st.session_state[f"{self.ns}_pair"] = (-1, -1)
-            st.session_state[f"{self.ns}_hist"] = []
-            st.session_state[f"{self.ns}_exp"] = self._exp_init(A)
+            self._load(init_bubble(A))
+            st.session_state[f"{self.ns}_hist"] = StepHistory()
             st.session_state[f"{self.ns}_gkey"] = gkey
             st.session_state[tag] = True
             self._push()
+            st.session_state[f"{self.ns}_pos"] = 0
 
     def _bubble_step(self):
-        if st.session_state[f"{self.ns}_fin"]:
-            return
+        state = self._snapshot()
+        step_bubble(state)
+        self._load(state)
+        if state["ev"][0] == "swap":
+            st.session_state[f"{self.ns}_array_df"] = pd.DataFrame({"Value": state["A"]}, dtype=object)
+
+    # Steps only record a small event; the HTML is built for the step on screen.
+    def _exp_html(self, ev):
+        kind = ev[0]
         A = st.session_state[f"{self.ns}_A"]
+        if kind == "init":
+            return self._exp_init(A)
         n = len(A)
-        i = st.session_state[f"{self.ns}_i"]
-        j = st.session_state[f"{self.ns}_j"]
-        swapped = st.session_state[f"{self.ns}_swapped"]
-        st.session_state[f"{self.ns}_step"] += 1
-
-        if i is None or j is None or i >= n - 1:
-            st.session_state[f"{self.ns}_fin"] = True
-            code = self._code_block(stage="done", i=i, j=j, swapped=swapped)
-            st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="completion">Sorted!</div>
-<div class="queue-display">Array: {', '.join(map(str,A))}</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-            return
-
-        if j > n - 2 - i:
-            if not swapped:
-                st.session_state[f"{self.ns}_fin"] = True
-                code = self._code_block(stage="end_pass", i=i, j=j, swapped=False)
-                st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
+        head = f'''<div class="step-content">
 <div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="completion">No swap in pass i={i} ⇒ array already sorted (early break)</div>
-<div class="queue-display">Array: {', '.join(map(str,A))}</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-                return
-            st.session_state[f"{self.ns}_i"] = i + 1
-            st.session_state[f"{self.ns}_j"] = 0
-            st.session_state[f"{self.ns}_swapped"] = False
+'''
+        arr = f"<div class=\"queue-display\">Array: {', '.join(map(str,A))}</div>"
+        if kind == "done":
+            _, i, j, swapped = ev
+            code = self._code_block(stage="done", i=i, j=j, swapped=swapped)
+            body = '<div class="completion">Sorted!</div>'
+        elif kind == "early":
+            _, i, j = ev
+            code = self._code_block(stage="end_pass", i=i, j=j, swapped=False)
+            body = f'<div class="completion">No swap in pass i={i} ⇒ array already sorted (early break)</div>'
+        elif kind == "pass":
+            i = ev[1]
             code = self._code_block(stage="end_pass", i=i+1, j=0, swapped=False)
-            st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">End of pass i={i}. Largest element fixed at index {n-1-i}.</div>
-<div class="action">Next pass ⇒ i ← <span class="vertex">{i+1}</span>, j ← <span class="vertex">0</span></div>
-<div class="queue-display">Array: {', '.join(map(str,A))}</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-            return
-
-        st.session_state[f"{self.ns}_pair"] = (j, j+1)
-        v1, v2 = A[j], A[j+1]
-        if self._cmp(v1, v2) > 0:
-            A[j], A[j+1] = A[j+1], A[j]
-            st.session_state[f"{self.ns}_swapped"] = True
-            st.session_state[f"{self.ns}_array_df"] = pd.DataFrame({"Value": A}, dtype=object)
+            body = f'''<div class="action">End of pass i={i}. Largest element fixed at index {n-1-i}.</div>
+<div class="action">Next pass ⇒ i ← <span class="vertex">{i+1}</span>, j ← <span class="vertex">0</span></div>'''
+        elif kind == "swap":
+            _, i, j, v1, v2 = ev
             code = self._code_block(stage="swap", i=i, j=j, swapped=True)
-            st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">Compare A[{j}]={v1} and A[{j+1}]={v2} ⇒ out of order ⇒ swap</div>
-<div class="action">A[{j}] ↔ A[{j+1}]</div>
-<div class="queue-display">Array: {', '.join(map(str,A))}</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
+            body = f'''<div class="action">Compare A[{j}]={v1} and A[{j+1}]={v2} ⇒ out of order ⇒ swap</div>
+<div class="action">A[{j}] ↔ A[{j+1}]</div>'''
         else:
-            code = self._code_block(stage="compare", i=i, j=j, swapped=st.session_state[f"{self.ns}_swapped"])
-            st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">Compare A[{j}]={v1} and A[{j+1}]={v2} ⇒ OK (no swap)</div>
-<div class="queue-display">Array: {', '.join(map(str,A))}</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-
-        st.session_state[f"{self.ns}_j"] = j + 1
+            _, i, j, v1, v2, swapped = ev
+            code = self._code_block(stage="compare", i=i, j=j, swapped=swapped)
+            body = f'<div class="action">Compare A[{j}]={v1} and A[{j+1}]={v2} ⇒ OK (no swap)</div>'
+        return f'''{head}{body}
+{arr}
+<div style="margin-top:0.5rem">{code}</div></div>'''
 
     def _ag_clean(self, original_df, ag_out):
         df_out = pd.DataFrame(ag_out.data if hasattr(ag_out, "data") else ag_out)
@@ -339,11 +342,27 @@ class BubbleSortVisualizer:
         ax2.text(0.02, 0.75, plain_text, fontsize=10, color="#e6ecff", va="top", family="monospace", wrap=True, linespacing=1.5)
         return fig
 
+    # Auto-play renders the next batch of frames, from the cursor on, once
+    # and lets the browser play them. The cursor stays put; it only moves
+    # when the player reports the step it reached (player_reached), and the
+    # rerun that follows sends the batch starting there.
+    def _autoplay(self, speed):
+        pos = st.session_state[f"{self.ns}_pos"]
+        self._seek(pos + PLAYER_BATCH - 1)
+        end = st.session_state[f"{self.ns}_pos"]
+        more = not st.session_state.get(f"{self.ns}_fin", False)
+        frames = []
+        for s in st.session_state[f"{self.ns}_hist"].states(pos, end + 1):
+            self._restore(s)
+            frames.append(figure_png(self._frame_figure(st.session_state[f"{self.ns}_A"], self._exp_html(s["ev"]))))
+        self._goto(pos)
+        render_player(frames, speed, self.ns, first_step=pos, more=more)
+
     def _export(self, fmt, fps, A):
         frames = []; saved = []
-        for s in st.session_state[f"{self.ns}_hist"]:
+        for s in st.session_state[f"{self.ns}_hist"].states(0, st.session_state[f"{self.ns}_pos"] + 1):
             self._restore(s)
-            fig = self._frame_figure(st.session_state[f"{self.ns}_A"], s["exp"])
+            fig = self._frame_figure(st.session_state[f"{self.ns}_A"], self._exp_html(s["ev"]))
             buf = io.BytesIO()
             fig.savefig(buf, format="png", dpi=140, facecolor=fig.get_facecolor())
             plt.close(fig)
@@ -352,9 +371,9 @@ class BubbleSortVisualizer:
         if fmt == "PDF":
             path = os.path.join(outdir, f"{self.ns}_run.pdf")
             with PdfPages(path) as pdf:
-                for s in st.session_state[f"{self.ns}_hist"]:
+                for s in st.session_state[f"{self.ns}_hist"].states(0, st.session_state[f"{self.ns}_pos"] + 1):
                     self._restore(s)
-                    fig = self._frame_figure(st.session_state[f"{self.ns}_A"], s["exp"])
+                    fig = self._frame_figure(st.session_state[f"{self.ns}_A"], self._exp_html(s["ev"]))
                     pdf.savefig(fig, facecolor=fig.get_facecolor()); plt.close(fig)
             saved.append(path)
         elif fmt in ("GIF","MP4"):
@@ -379,8 +398,11 @@ class BubbleSortVisualizer:
         src = s.get("sb_src", "Sample graph")
         sample = s.get("sb_sample", "Random Small")
         auto = s.get("sb_auto", False)
+        precompute = s.get("sb_precompute", False)
         speed = s.get("sb_speed", 0.8)
         next_clicked = s.get("sb_next", False)
+        ff_clicked = s.get("sb_ff", False)
+        end_clicked = s.get("sb_end", False)
         back_clicked = s.get("sb_back", False)
         reset_clicked = s.get("sb_reset", False)
         export_clicked = s.get("sb_export", False)
@@ -436,26 +458,43 @@ class BubbleSortVisualizer:
         with col2:
             st.markdown('<div class="frame-title">Bubble Sort State</div>', unsafe_allow_html=True)
             self._ensure_state(A, f"{src}::{sample or 'custom'}::A={','.join(map(str,A))}")
+            if precompute and A:
+                self._compile()
+            seek = st.session_state.pop(f"{self.ns}_seek", None)
+            if seek is None:
+                seek = player_reached(self.ns)
+            if seek is not None and A:
+                self._seek(seek)
             self._state_table(st.session_state[f"{self.ns}_A"])
 
-        col3, col4 = st.columns(2)
-        with col3:
-            st.markdown('<div class="frame-title">Visualization</div>', unsafe_allow_html=True)
-            self._draw(st.session_state[f"{self.ns}_A"])
-            st.markdown('<div class="legend"><span><i style="background:#f59e0b"></i>Compared</span><span><i style="background:#34d399"></i>Sorted suffix</span><span><i style="background:#3a3f55"></i>Unvisited</span></div>', unsafe_allow_html=True)
-        with col4:
-            st.markdown('<div class="frame-title">Step-by-Step Explanation</div>', unsafe_allow_html=True)
-            exp_html = st.session_state.get(f'{self.ns}_exp', '')
-            st.markdown(f'<div class="step-explanation">{exp_html}</div>', unsafe_allow_html=True)
-
-        manual = next_clicked or back_clicked or reset_clicked
+        manual = next_clicked or back_clicked or reset_clicked or ff_clicked or end_clicked
+        if auto and not manual and not st.session_state.get(f"{self.ns}_fin", False) and len(A) > 0:
+            self._autoplay(speed)
+        else:
+            col3, col4 = st.columns(2)
+            with col3:
+                st.markdown('<div class="frame-title">Visualization</div>', unsafe_allow_html=True)
+                self._draw(st.session_state[f"{self.ns}_A"])
+                st.markdown('<div class="legend"><span><i style="background:#f59e0b"></i>Compared</span><span><i style="background:#34d399"></i>Sorted suffix</span><span><i style="background:#3a3f55"></i>Unvisited</span></div>', unsafe_allow_html=True)
+            with col4:
+                st.markdown('<div class="frame-title">Step-by-Step Explanation</div>', unsafe_allow_html=True)
+                exp_html = self._exp_html(st.session_state[f'{self.ns}_ev'])
+                st.markdown(f'<div class="step-explanation">{exp_html}</div>', unsafe_allow_html=True)
+
+        render_step_scrubber(self.ns, len(st.session_state[f"{self.ns}_hist"]), st.session_state[f"{self.ns}_pos"])
+        render_debug_panel(self.ns)
+
         if next_clicked and not st.session_state.get(f"{self.ns}_fin", False) and len(A) > 0:
-            self._bubble_step()
-            self._push()
+            self._advance()
+            st.rerun()
+        if ff_clicked and not st.session_state.get(f"{self.ns}_fin", False) and len(A) > 0:
+            self._seek(st.session_state[f"{self.ns}_pos"] + int(s.get("sb_ff_n", 10)))
             st.rerun()
-        if back_clicked and len(st.session_state.get(f"{self.ns}_hist", [])) > 1:
-            st.session_state[f"{self.ns}_hist"].pop()
-            self._restore(st.session_state[f"{self.ns}_hist"][-1])
+        if end_clicked and not st.session_state.get(f"{self.ns}_fin", False) and len(A) > 0:
+            self._seek(None)
+            st.rerun()
+        if back_clicked and st.session_state.get(f"{self.ns}_pos", 0) > 0:
+            self._goto(st.session_state[f"{self.ns}_pos"] - 1)
             st.rerun()
         if reset_clicked:
             st.session_state[f"{self.ns}_inited"] = False
@@ -466,8 +505,3 @@ class BubbleSortVisualizer:
             for p in paths:
                 with open(p, "rb") as f:
                     st.sidebar.download_button("Download " + p.split("/")[-1], f, file_name=p.split("/")[-1], mime="application/octet-stream")
-        if auto and not st.session_state.get(f"{self.ns}_fin", False) and not manual and len(A) > 0:
-            self._bubble_step()
-            self._push()
-            time.sleep(speed)
-            st.rerun()
\ No newline at end of file
@@ -0,0 +1,394 @@
+# Headless step engines for the sorting visualizers. No Streamlit here: each
+# algorithm is an init_* that builds a plain state dict from the input list,
+# a step_* that advances it by one step in place, and a run_* generator over
+# both. The array being sorted lives in state["A"]; every state also carries
+# "step", "fin" and "ev", the event the visualizers turn into the step
+# explanation.
+#
+# run_* yields the same dict after every step; copy it to keep a step.
+
+
+def to_num_or_str(x):
+    try:
+        if isinstance(x, str) and "." in x:
+            return float(x)
+        return int(x)
+    except Exception:
+        try:
+            return float(x)
+        except Exception:
+            return str(x)
+
+
+def compare(a, b):
+    aa = to_num_or_str(a)
+    bb = to_num_or_str(b)
+    if isinstance(aa, (int, float)) and isinstance(bb, (int, float)):
+        return -1 if aa < bb else (1 if aa > bb else 0)
+    sa, sb = str(aa), str(bb)
+    return -1 if sa < sb else (1 if sa > sb else 0)
+
+
+def _run(state, step):
+    yield state
+    while not state["fin"]:
+        step(state)
+        yield state
+
+
+# ---------- Bubble Sort ----------
+def init_bubble(A):
+    return {
+        "A": list(A),
+        "i": 0 if len(A) > 1 else None,
+        "j": 0 if len(A) > 1 else None,
+        "swapped": False,
+        "fin": (len(A) <= 1),
+        "step": 0,
+        "ev": ("init",),
+        "pair": (-1, -1),
+    }
+
+
+def step_bubble(state):
+    if state["fin"]:
+        return
+    A = state["A"]
+    n = len(A)
+    i, j, swapped = state["i"], state["j"], state["swapped"]
+    state["step"] += 1
+
+    if i is None or j is None or i >= n - 1:
+        state["fin"] = True
+        state["ev"] = ("done", i, j, swapped)
+        return
+
+    if j > n - 2 - i:
+        if not swapped:
+            state["fin"] = True
+            state["ev"] = ("early", i, j)
+            return
+        state["i"] = i + 1
+        state["j"] = 0
+        state["swapped"] = False
+        state["ev"] = ("pass", i)
+        return
+
+    state["pair"] = (j, j+1)
+    v1, v2 = A[j], A[j+1]
+    if compare(v1, v2) > 0:
+        A[j], A[j+1] = A[j+1], A[j]
+        state["swapped"] = True
+        state["ev"] = ("swap", i, j, v1, v2)
+    else:
+        state["ev"] = ("ok", i, j, v1, v2, swapped)
+    state["j"] = j + 1
+
+
+def run_bubble(A):
+    return _run(init_bubble(A), step_bubble)
+
+
+# ---------- Insertion Sort ----------
+def init_insertion(A):
+    return {
+        "A": list(A),
+        "i": 1 if len(A) > 1 else None,
+        "j": (0 if len(A) > 1 else None),
+        "key": (A[1] if len(A) > 1 else None),
+        "phase": "pick" if len(A) > 1 else "done",
+        "fin": (len(A) <= 1),
+        "step": 0,
+        "moved_pair": (-1, -1),
+        "ev": ("init",),
+    }
+
+
+def step_insertion(state):
+    if state["fin"]:
+        return
+    A = state["A"]
+    i, j, key, phase = state["i"], state["j"], state["key"], state["phase"]
+    state["step"] += 1
+
+    if i is None:
+        state["fin"] = True
+        state["ev"] = ("done",)
+        return
+
+    if phase == "pick":
+        state["phase"] = "compare"
+        state["j"] = i - 1
+        state["ev"] = ("pick", i, key)
+        return
+
+    if phase in ("compare", "shift"):
+        if j is not None and j >= 0 and compare(A[j], key) > 0:
+            A[j+1] = A[j]
+            state["moved_pair"] = (j, j+1)
+            state["j"] = j - 1
+            state["phase"] = "shift"
+            state["ev"] = ("shift", i, j, key)
+            return
+        pos = (j + 1) if j is not None else 0
+        A[pos] = key
+        state["moved_pair"] = (pos, pos)
+        state["phase"] = "place_done"
+        state["ev"] = ("place", i, j, pos, key)
+        return
+
+    if phase == "place_done":
+        ni = i + 1
+        if ni >= len(A):
+            state["i"] = None
+            state["fin"] = True
+            state["phase"] = "done"
+            state["ev"] = ("done",)
+            return
+        state["i"] = ni
+        state["key"] = A[ni]
+        state["j"] = ni - 1
+        state["phase"] = "pick"
+        state["moved_pair"] = (-1, -1)
+        state["ev"] = ("next", ni, A[ni])
+
+
+def run_insertion(A):
+    return _run(init_insertion(A), step_insertion)
+
+
+# ---------- Merge Sort ----------
+# Work is an explicit task stack of "split" and "merge" frames so a single
+# step never recurses.
+def init_merge(A):
+    n = len(A)
+    return {
+        "A": list(A),
+        "tasks": ([{"kind":"split","l":0,"r":n-1}] if n>0 else []),
+        "cur": {"l":0,"m":(n-1)//2 if n>0 else None,"r":(n-1) if n>0 else None,"stage":"split"},
+        "tmp": [],
+        "i": None,
+        "j": None,
+        "k": None,
+        "step": 0,
+        "fin": (n==0),
+        "ev": ("init",),
+    }
+
+
+def step_merge(state):
+    if state["fin"]:
+        return
+    A = state["A"]
+    tasks = state["tasks"]
+    state["step"] += 1
+
+    if not tasks:
+        state["fin"] = True
+        state["cur"] = {"l":0,"m":None,"r":len(A)-1,"stage":"done"}
+        state["ev"] = ("done",)
+        return
+
+    t = tasks[-1]
+
+    if t["kind"] == "split":
+        l, r = t["l"], t["r"]
+        if l >= r:
+            tasks.pop()
+            state["cur"] = {"l":l,"m":l,"r":r,"stage":"base"}
+            state["ev"] = ("base", l, r)
+            return
+        m = (l + r) // 2
+        tasks.pop()
+        tasks.append({"kind":"merge","l":l,"m":m,"r":r,"stage":"compare","i":l,"j":m+1,"k":l,"tmp":[]})
+        tasks.append({"kind":"split","l":m+1,"r":r})
+        tasks.append({"kind":"split","l":l,"r":m})
+        state["cur"] = {"l":l,"m":m,"r":r,"stage":"split"}
+        state["ev"] = ("split", l, m, r)
+        return
+
+    if t["kind"] == "merge":
+        l, m, r = t["l"], t["m"], t["r"]
+        i, j, k = t["i"], t["j"], t["k"]
+        tmp = t["tmp"]
+        state["cur"] = {"l":l,"m":m,"r":r,"stage":t["stage"]}
+        state["i"], state["j"], state["k"] = i, j, k
+        state["tmp"] = list(tmp)
+
+        if t["stage"] == "compare":
+            if i <= m and j <= r:
+                if compare(A[i], A[j]) <= 0:
+                    tmp.append(A[i]); t["i"] = i + 1
+                    state["ev"] = ("cmp_left", l, m, r, i, j)
+                else:
+                    tmp.append(A[j]); t["j"] = j + 1
+                    state["ev"] = ("cmp_right", l, m, r, i, j)
+                state["tmp"] = list(tmp)
+                return
+            if i <= m and j > r:
+                t["stage"] = "drain_left"
+                state["ev"] = ("drain_left", l, m, r, i, j)
+                return
+            if j <= r and i > m:
+                t["stage"] = "drain_right"
+                state["ev"] = ("drain_right", l, m, r, i, j)
+                return
+            t["stage"] = "write"; t["k"] = l
+            state["ev"] = ("to_write", "compare", l, m, r)
+            return
+
+        if t["stage"] == "drain_left":
+            if i <= m:
+                tmp.append(A[i]); t["i"] = i + 1
+                state["tmp"] = list(tmp)
+                state["ev"] = ("push_left", l, m, r, i, j)
+                return
+            t["stage"] = "write"; t["k"] = l
+            state["ev"] = ("to_write", "left", l, m, r)
+            return
+
+        if t["stage"] == "drain_right":
+            if j <= r:
+                tmp.append(A[j]); t["j"] = j + 1
+                state["tmp"] = list(tmp)
+                state["ev"] = ("push_right", l, m, r, i, j)
+                return
+            t["stage"] = "write"; t["k"] = l
+            state["ev"] = ("to_write", "right", l, m, r)
+            return
+
+        if t["stage"] == "write":
+            if k <= r:
+                A[k] = tmp[k - l]
+                state["k"] = k + 1
+                t["k"] = k + 1
+                state["ev"] = ("write", l, m, r, k)
+                return
+            tasks.pop()
+            state["cur"] = {"l":l,"m":m,"r":r,"stage":"merged"}
+            state["i"] = state["j"] = state["k"] = None
+            state["tmp"] = []
+            state["ev"] = ("merged", l, r)
+            return
+
+
+def run_merge(A):
+    return _run(init_merge(A), step_merge)
+
+
+# ---------- Quick Sort ----------
+# Lomuto partition driven by a task stack of "sort", "part" and
+# "after_partition" frames.
+def init_quick(A):
+    n = len(A)
+    return {
+        "A": list(A),
+        "tasks": ([{"kind":"sort","l":0,"r":n-1}] if n>0 else []),
+        "cur": {"l":0,"r":(n-1 if n>0 else None),"stage":"start"},
+        "i": None,
+        "j": None,
+        "pivot_idx": None,
+        "swap_pair": (-1,-1),
+        "step": 0,
+        "fin": (n<=1),
+        "ev": ("init",),
+    }
+
+
+def step_quick(state):
+    if state["fin"]:
+        return
+    A = state["A"]
+    tasks = state["tasks"]
+    state["step"] += 1
+    state["swap_pair"] = (-1,-1)
+
+    if not tasks:
+        state["fin"] = True
+        state["cur"] = {"l":0,"r":len(A)-1,"stage":"done"}
+        state["ev"] = ("done",)
+        return
+
+    t = tasks[-1]
+
+    if t["kind"] == "sort":
+        l, r = t["l"], t["r"]
+        state["cur"] = {"l":l,"r":r,"stage":"sort"}
+        if l >= r:
+            tasks.pop()
+            state["ev"] = ("base", l, r)
+            return
+        tasks.pop()
+        tasks.append({"kind":"after_partition","l":l,"r":r,"p":None})
+        tasks.append({"kind":"part","l":l,"r":r,"stage":"pick","i":l-1,"j":l,"pivot_idx":r})
+        state["cur"] = {"l":l,"r":r,"stage":"pick"}
+        state["i"] = l-1
+        state["j"] = l
+        state["pivot_idx"] = r
+        state["ev"] = ("call", l, r, A[r])
+        return
+
+    if t["kind"] == "part":
+        l, r = t["l"], t["r"]
+        i, j, pv_idx = t["i"], t["j"], t["pivot_idx"]
+        pivot = A[pv_idx]
+        state["cur"] = {"l":l,"r":r,"stage":t["stage"]}
+        state["i"], state["j"], state["pivot_idx"] = i, j, pv_idx
+
+        if t["stage"] == "pick":
+            t["stage"] = "scan"
+            state["ev"] = ("pick", l, r, i, j, pv_idx, pivot)
+            return
+
+        if t["stage"] == "scan":
+            if j < r:
+                if compare(A[j], pivot) <= 0:
+                    t["stage"] = "swap_ij"
+                    t["i"] = i + 1
+                    state["i"] = i + 1
+                    state["ev"] = ("le", l, r, i, j, A[j], pivot)
+                else:
+                    t["j"] = j + 1
+                    state["j"] = j + 1
+                    state["ev"] = ("gt", l, r, i, j, A[j], pivot)
+                return
+            t["stage"] = "place"
+            state["ev"] = ("end_scan", l, r, i, j)
+            return
+
+        if t["stage"] == "swap_ij":
+            ai, aj = t["i"], t["j"]
+            if ai != aj:
+                A[ai], A[aj] = A[aj], A[ai]
+                state["swap_pair"] = (ai, aj)
+            t["j"] = aj + 1
+            t["stage"] = "scan"
+            state["j"] = aj + 1
+            state["ev"] = ("swap", l, r, ai, aj)
+            return
+
+        if t["stage"] == "place":
+            pi = i + 1
+            if pi != r:
+                A[pi], A[r] = A[r], A[pi]
+                state["swap_pair"] = (pi, r)
+            tasks.pop()
+            ap = tasks[-1] if tasks and tasks[-1]["kind"] == "after_partition" else None
+            if ap:
+                ap["p"] = pi
+            state["pivot_idx"] = pi
+            state["ev"] = ("placed", l, r, pi)
+            return
+
+    if t["kind"] == "after_partition":
+        l, r, p = t["l"], t["r"], t["p"]
+        tasks.pop()
+        tasks.append({"kind":"sort","l":p+1,"r":r})
+        tasks.append({"kind":"sort","l":l,"r":p-1})
+        state["cur"] = {"l":l,"r":r,"stage":"recurse"}
+        state["ev"] = ("recurse", l, r, p)
+        return
+
+
+def run_quick(A):
+    return _run(init_quick(A), step_quick)
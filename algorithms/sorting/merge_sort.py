@@ -2,9 +2,14 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-import time, copy, io, os, html
+import io, os, html
 from matplotlib.backends.backend_pdf import PdfPages
+from algorithms.sorting.engine import init_merge, run_merge, step_merge
 from components.graphStyle import COLORS, GRAPH_LAYOUT_CONFIG
+from components.history import StepHistory
+from components.player import PLAYER_BATCH, figure_png, player_reached, render_player
+from components.sidebar import render_debug_panel, render_step_scrubber
+from components.trace_cache import TRACES, trace_key
 
 try:
     from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, DataReturnMode
@@ -37,29 +42,6 @@ class MergeSortVisualizer:
         df = df.reset_index(drop=True)
         return df
 
-    def _to_num_or_str(self, x):
-        try:
-            if isinstance(x, str) and "." in x:
-                return float(x)
-            return int(x)
-        except Exception:
-            try:
-                return float(x)
-            except Exception:
-                return str(x)
-
-    def _cmp(self, a, b):
-        aa = self._to_num_or_str(a)
-        bb = self._to_num_or_str(b)
-        if isinstance(aa, (int, float)) and isinstance(bb, (int, float)):
-            if aa < bb: return -1
-            if aa > bb: return 1
-            return 0
-        sa, sb = str(aa), str(bb)
-        if sa < sb: return -1
-        if sa > sb: return 1
-        return 0
-
     def _code_block(self, stage="split", l=None, m=None, r=None, i=None, j=None, k=None):
         ms = [
             "def merge_sort(A, l, r):",
@@ -135,216 +117,159 @@ class MergeSortVisualizer:
 <div style="margin-top:0.5rem">{code}</div>
 </div>"""
 
-    def _push(self):
-        h = {
-            "A": copy.deepcopy(st.session_state[f"{self.ns}_A"]),
-            "tasks": copy.deepcopy(st.session_state[f"{self.ns}_tasks"]),
-            "cur": copy.deepcopy(st.session_state[f"{self.ns}_cur"]),
+    def _snapshot(self):
+        return {
+            "A": st.session_state[f"{self.ns}_A"],
+            "tasks": st.session_state[f"{self.ns}_tasks"],
+            "cur": st.session_state[f"{self.ns}_cur"],
             "tmp": list(st.session_state[f"{self.ns}_tmp"]),
             "i": st.session_state[f"{self.ns}_i"],
             "j": st.session_state[f"{self.ns}_j"],
             "k": st.session_state[f"{self.ns}_k"],
             "step": st.session_state[f"{self.ns}_step"],
             "fin": st.session_state[f"{self.ns}_fin"],
-            "exp": st.session_state[f"{self.ns}_exp"],
+            "ev": st.session_state[f"{self.ns}_ev"],
         }
-        st.session_state[f"{self.ns}_hist"].append(h)
 
-    def _restore(self, s):
-        st.session_state[f"{self.ns}_A"] = copy.deepcopy(s["A"])
-        st.session_state[f"{self.ns}_tasks"] = copy.deepcopy(s["tasks"])
-        st.session_state[f"{self.ns}_cur"] = copy.deepcopy(s["cur"])
+    def _push(self):
+        st.session_state[f"{self.ns}_hist"].append(self._snapshot())
+
+    def _load(self, s):
+        st.session_state[f"{self.ns}_A"] = s["A"]
+        st.session_state[f"{self.ns}_tasks"] = s["tasks"]
+        st.session_state[f"{self.ns}_cur"] = s["cur"]
         st.session_state[f"{self.ns}_tmp"] = list(s["tmp"])
         st.session_state[f"{self.ns}_i"] = s["i"]
         st.session_state[f"{self.ns}_j"] = s["j"]
         st.session_state[f"{self.ns}_k"] = s["k"]
         st.session_state[f"{self.ns}_step"] = s["step"]
         st.session_state[f"{self.ns}_fin"] = s["fin"]
-        st.session_state[f"{self.ns}_exp"] = s["exp"]
+        st.session_state[f"{self.ns}_ev"] = s["ev"]
+
+    def _restore(self, s):
+        self._load(s)
         st.session_state[f"{self.ns}_array_df"] = pd.DataFrame({"Value": st.session_state[f"{self.ns}_A"]}, dtype=object)
 
+    def _goto(self, idx):
+        hist = st.session_state[f"{self.ns}_hist"]
+        idx = max(0, min(int(idx), len(hist) - 1))
+        self._restore(hist[idx])
+        st.session_state[f"{self.ns}_pos"] = idx
+
+    def _advance(self):
+        hist = st.session_state[f"{self.ns}_hist"]
+        if st.session_state[f"{self.ns}_pos"] < len(hist) - 1:
+            self._goto(st.session_state[f"{self.ns}_pos"] + 1)
+            return
+        self._step()
+        self._push()
+        st.session_state[f"{self.ns}_pos"] = len(hist) - 1
+
+    def _compile(self):
+        hist = st.session_state[f"{self.ns}_hist"]
+        if hist.peek("fin"):
+            return
+        pos = st.session_state[f"{self.ns}_pos"]
+        A = hist[0]["A"]
+        st.session_state[f"{self.ns}_hist"] = TRACES.trace(trace_key(self.ns, A), lambda: run_merge(A))
+        self._goto(pos)
+
+    # Past the recorded history the engine runs in a tight loop on one working
+    # state; only the step landed on is restored and drawn. idx=None runs to
+    # the end.
+    def _seek(self, idx):
+        hist = st.session_state[f"{self.ns}_hist"]
+        if idx is None or idx >= len(hist):
+            self._goto(len(hist) - 1)
+            state = self._snapshot()
+            while (idx is None or len(hist) <= idx) and not state["fin"]:
+                step_merge(state)
+                hist.append(state)
+            if idx is None:
+                idx = len(hist) - 1
+        self._goto(idx)
+
     def _ensure_state(self, A, gkey):
         tag = f"{self.ns}_inited"
         if (not st.session_state.get(tag)) or st.session_state.get(f"{self.ns}_gkey") != gkey:
-            n = len(A)
-            st.session_state[f"{self.ns}_A"] = list(A)
-            st.session_state[f"{self.ns}_tasks"] = ([{"kind":"split","l":0,"r":n-1}] if n>0 else [])
-            st.session_state[f"{self.ns}_cur"] = {"l":0,"m":(n-1)//2 if n>0 else None,"r":(n-1) if n>0 else None,"stage":"split"}
-            st.session_state[f"{self.ns}_tmp"] = []
-            st.session_state[f"{self.ns}_i"] = None
-            st.session_state[f"{self.ns}_j"] = None
-            st.session_state[f"{self.ns}_k"] = None
-            st.session_state[f"{self.ns}_step"] = 0
-            st.session_state[f"{self.ns}_fin"] = (n==0)
-            st.session_state[f"{self.ns}_hist"] = []
-            st.session_state[f"{self.ns}_exp"] = self._exp_init(A)
+            self._load(init_merge(A))
+            st.session_state[f"{self.ns}_hist"] = StepHistory()
             st.session_state[f"{self.ns}_gkey"] = gkey
             st.session_state[tag] = True
             self._push()
+            st.session_state[f"{self.ns}_pos"] = 0
 
     def _step(self):
-        if st.session_state[f"{self.ns}_fin"]:
-            return
+        state = self._snapshot()
+        step_merge(state)
+        self._load(state)
+
+    # Steps only record a small event; the HTML is built for the step on screen.
+    # Values are read back from the restored A, which a merge step only
+    # changes at A[k] during write-back.
+    def _exp_html(self, ev):
+        kind = ev[0]
         A = st.session_state[f"{self.ns}_A"]
-        tasks = st.session_state[f"{self.ns}_tasks"]
-        st.session_state[f"{self.ns}_step"] += 1
-
-        if not tasks:
-            st.session_state[f"{self.ns}_fin"] = True
-            st.session_state[f"{self.ns}_cur"] = {"l":0,"m":None,"r":len(A)-1,"stage":"done"}
-            code = self._code_block(stage="merge_write", l=0, r=len(A)-1)
-            st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
+        if kind == "init":
+            return self._exp_init(A)
+        head = f'''<div class="step-content">
 <div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="completion">Sorted!</div>
-<div class="queue-display">Array: {', '.join(map(str,A))}</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-            return
-
-        t = tasks[-1]
-
-        if t["kind"] == "split":
-            l, r = t["l"], t["r"]
-            if l >= r:
-                tasks.pop()
-                st.session_state[f"{self}"] = None
-                code = self._code_block(stage="base", l=l, r=r)
-                st.session_state[f"{self.ns}_cur"] = {"l":l,"m":l,"r":r,"stage":"base"}
-                st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">Segment [{l}..{r}] length ≤ 1 ⇒ base case</div>
-<div class="queue-display">Array: {', '.join(map(str,A))}</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-                return
-            m = (l + r) // 2
-            tasks.pop()
-            tasks.append({"kind":"merge","l":l,"m":m,"r":r,"stage":"compare","i":l,"j":m+1,"k":l,"tmp":[]})
-            tasks.append({"kind":"split","l":m+1,"r":r})
-            tasks.append({"kind":"split","l":l,"r":m})
-            st.session_state[f"{self.ns}_cur"] = {"l":l,"m":m,"r":r,"stage":"split"}
+'''
+        arr = f"<div class=\"queue-display\">Array: {', '.join(map(str,A))}</div>"
+        temp = f"<div class=\"queue-display\">temp = [{', '.join(map(str,st.session_state[f'{self.ns}_tmp']))}]</div>"
+        if kind == "done":
+            body, shown = '<div class="completion">Sorted!</div>', arr
+            code = self._code_block(stage="merge_write", l=0, r=len(A)-1)
+        elif kind == "base":
+            _, l, r = ev
+            body, shown = f'<div class="action">Segment [{l}..{r}] length ≤ 1 ⇒ base case</div>', arr
+            code = self._code_block(stage="base", l=l, r=r)
+        elif kind == "split":
+            _, l, m, r = ev
+            body = f'''<div class="action">Split segment [{l}..{r}] at m = <span class="vertex">{m}</span></div>
+<div class="action">Next: process left half [{l}..{m}]</div>'''
+            shown = arr
             code = self._code_block(stage="split", l=l, r=r, m=m)
-            st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">Split segment [{l}..{r}] at m = <span class="vertex">{m}</span></div>
-<div class="action">Next: process left half [{l}..{m}]</div>
-<div class="queue-display">Array: {', '.join(map(str,A))}</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-            return
-
-        if t["kind"] == "merge":
-            l, m, r = t["l"], t["m"], t["r"]
-            i, j, k = t["i"], t["j"], t["k"]
-            tmp = t["tmp"]
-            st.session_state[f"{self.ns}_cur"] = {"l":l,"m":m,"r":r,"stage":t["stage"]}
-            st.session_state[f"{self.ns}_i"] = i
-            st.session_state[f"{self.ns}_j"] = j
-            st.session_state[f"{self.ns}_k"] = k
-            st.session_state[f"{self.ns}_tmp"] = list(tmp)
-
-            if t["stage"] == "compare":
-                if i <= m and j <= r:
-                    if self._cmp(A[i], A[j]) <= 0:
-                        tmp.append(A[i]); t["i"] = i + 1
-                        desc = f"A[{i}]={A[i]} ≤ A[{j}]={A[j]} ⇒ push {A[i]} ; i ← {i+1}"
-                    else:
-                        tmp.append(A[j]); t["j"] = j + 1
-                        desc = f"A[{i}]={A[i]} > A[{j}]={A[j]} ⇒ push {A[j]} ; j ← {j+1}"
-                    st.session_state[f"{self.ns}_tmp"] = list(tmp)
-                    code = self._code_block(stage="merge_compare", l=l, m=m, r=r, i=t["i"], j=t["j"])
-                    st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">{desc}</div>
-<div class="queue-display">temp = [{', '.join(map(str,tmp))}]</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-                    return
-                if i <= m and j > r:
-                    t["stage"] = "drain_left"
-                    code = self._code_block(stage="merge_drain_left", l=l, m=m, r=r, i=i, j=j)
-                    st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">Right half exhausted ⇒ drain left side</div>
-<div class="queue-display">temp = [{', '.join(map(str,tmp))}]</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-                    return
-                if j <= r and i > m:
-                    t["stage"] = "drain_right"
-                    code = self._code_block(stage="merge_drain_right", l=l, m=m, r=r, i=i, j=j)
-                    st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">Left half exhausted ⇒ drain right side</div>
-<div class="queue-display">temp = [{', '.join(map(str,tmp))}]</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-                    return
-                t["stage"] = "write"; t["k"] = l
-                code = self._code_block(stage="merge_write", l=l, m=m, r=r, k=l)
-                st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">Comparisons done ⇒ write back to A[{l}..{r}]</div>
-<div class="queue-display">temp = [{', '.join(map(str,tmp))}]</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-                return
-
-            if t["stage"] == "drain_left":
-                if i <= m:
-                    tmp.append(A[i]); t["i"] = i + 1
-                    st.session_state[f"{self.ns}_tmp"] = list(tmp)
-                    code = self._code_block(stage="merge_drain_left", l=l, m=m, r=r, i=t["i"], j=j)
-                    st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">Push remaining left: {A[i]} ; i ← {i+1}</div>
-<div class="queue-display">temp = [{', '.join(map(str,tmp))}]</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-                    return
-                t["stage"] = "write"; t["k"] = l
-                code = self._code_block(stage="merge_write", l=l, m=m, r=r, k=l)
-                st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">Left drained ⇒ write back</div>
-<div class="queue-display">temp = [{', '.join(map(str,tmp))}]</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-                return
-
-            if t["stage"] == "drain_right":
-                if j <= r:
-                    tmp.append(A[j]); t["j"] = j + 1
-                    st.session_state[f"{self.ns}_tmp"] = list(tmp)
-                    code = self._code_block(stage="merge_drain_right", l=l, m=m, r=r, i=i, j=t["j"])
-                    st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">Push remaining right: {A[j]} ; j ← {j+1}</div>
-<div class="queue-display">temp = [{', '.join(map(str,tmp))}]</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-                    return
-                t["stage"] = "write"; t["k"] = l
-                code = self._code_block(stage="merge_write", l=l, m=m, r=r, k=l)
-                st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">Right drained ⇒ write back</div>
-<div class="queue-display">temp = [{', '.join(map(str,tmp))}]</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-                return
-
-            if t["stage"] == "write":
-                if k <= r:
-                    A[k] = tmp[k - l]
-                    st.session_state[f"{self.ns}_k"] = k + 1
-                    t["k"] = k + 1
-                    st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">A[{k}] ← temp[{k-l}] = <span class="vertex">{A[k]}</span></div>
-<div class="queue-display">Array: {', '.join(map(str,A))}</div>
-<div style="margin-top:0.5rem">{self._code_block(stage="merge_write", l=l, m=m, r=r, k=k+1)}</div></div>"""
-                    return
-                tasks.pop()
-                st.session_state[f"{self.ns}_cur"] = {"l":l,"m":m,"r":r,"stage":"merged"}
-                st.session_state[f"{self.ns}_i"] = None
-                st.session_state[f"{self.ns}_j"] = None
-                st.session_state[f"{self.ns}_k"] = None
-                st.session_state[f"{self.ns}_tmp"] = []
-                st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="completion">Merged segment [{l}..{r}]</div>
-<div class="queue-display">Array: {', '.join(map(str,A))}</div></div>"""
-                return
+        elif kind == "cmp_left":
+            _, l, m, r, i, j = ev
+            body, shown = f'<div class="action">A[{i}]={A[i]} ≤ A[{j}]={A[j]} ⇒ push {A[i]} ; i ← {i+1}</div>', temp
+            code = self._code_block(stage="merge_compare", l=l, m=m, r=r, i=i+1, j=j)
+        elif kind == "cmp_right":
+            _, l, m, r, i, j = ev
+            body, shown = f'<div class="action">A[{i}]={A[i]} > A[{j}]={A[j]} ⇒ push {A[j]} ; j ← {j+1}</div>', temp
+            code = self._code_block(stage="merge_compare", l=l, m=m, r=r, i=i, j=j+1)
+        elif kind == "drain_left":
+            _, l, m, r, i, j = ev
+            body, shown = '<div class="action">Right half exhausted ⇒ drain left side</div>', temp
+            code = self._code_block(stage="merge_drain_left", l=l, m=m, r=r, i=i, j=j)
+        elif kind == "drain_right":
+            _, l, m, r, i, j = ev
+            body, shown = '<div class="action">Left half exhausted ⇒ drain right side</div>', temp
+            code = self._code_block(stage="merge_drain_right", l=l, m=m, r=r, i=i, j=j)
+        elif kind == "to_write":
+            _, why, l, m, r = ev
+            msg = {"compare": f"Comparisons done ⇒ write back to A[{l}..{r}]", "left": "Left drained ⇒ write back", "right": "Right drained ⇒ write back"}[why]
+            body, shown = f'<div class="action">{msg}</div>', temp
+            code = self._code_block(stage="merge_write", l=l, m=m, r=r, k=l)
+        elif kind == "push_left":
+            _, l, m, r, i, j = ev
+            body, shown = f'<div class="action">Push remaining left: {A[i]} ; i ← {i+1}</div>', temp
+            code = self._code_block(stage="merge_drain_left", l=l, m=m, r=r, i=i+1, j=j)
+        elif kind == "push_right":
+            _, l, m, r, i, j = ev
+            body, shown = f'<div class="action">Push remaining right: {A[j]} ; j ← {j+1}</div>', temp
+            code = self._code_block(stage="merge_drain_right", l=l, m=m, r=r, i=i, j=j+1)
+        elif kind == "write":
+            _, l, m, r, k = ev
+            body, shown = f'<div class="action">A[{k}] ← temp[{k-l}] = <span class="vertex">{A[k]}</span></div>', arr
+            code = self._code_block(stage="merge_write", l=l, m=m, r=r, k=k+1)
+        else:
+            _, l, r = ev
+            return f'''{head}<div class="completion">Merged segment [{l}..{r}]</div>
+{arr}</div>'''
+        return f'''{head}{body}
+{shown}
+<div style="margin-top:0.5rem">{code}</div></div>'''
 
     def _ag_clean(self, original_df, ag_out):
         df_out = pd.DataFrame(ag_out.data if hasattr(ag_out, "data") else ag_out)
@@ -523,20 +448,36 @@ class MergeSortVisualizer:
         ax2.text(0.02, 0.75, plain, fontsize=10, color="#e6ecff", va="top", family="monospace", wrap=True, linespacing=1.5)
         return fig
 
+    # Auto-play renders the next batch of frames, from the cursor on, once
+    # and lets the browser play them. The cursor stays put; it only moves
+    # when the player reports the step it reached (player_reached), and the
+    # rerun that follows sends the batch starting there.
+    def _autoplay(self, speed):
+        pos = st.session_state[f"{self.ns}_pos"]
+        self._seek(pos + PLAYER_BATCH - 1)
+        end = st.session_state[f"{self.ns}_pos"]
+        more = not st.session_state.get(f"{self.ns}_fin", False)
+        frames = []
+        for s in st.session_state[f"{self.ns}_hist"].states(pos, end + 1):
+            self._restore(s)
+            frames.append(figure_png(self._frame_figure(st.session_state[f"{self.ns}_A"], self._exp_html(s["ev"]))))
+        self._goto(pos)
+        render_player(frames, speed, self.ns, first_step=pos, more=more)
+
     def _export(self, fmt, fps, A):
         frames = []; saved = []
-        for s in st.session_state[f"{self.ns}_hist"]:
+        for s in st.session_state[f"{self.ns}_hist"].states(0, st.session_state[f"{self.ns}_pos"] + 1):
             self._restore(s)
-            fig = self._frame_figure(st.session_state[f"{self.ns}_A"], s["exp"])
+            fig = self._frame_figure(st.session_state[f"{self.ns}_A"], self._exp_html(s["ev"]))
             buf = io.BytesIO(); fig.savefig(buf, format="png", dpi=140, facecolor=fig.get_facecolor())
             plt.close(fig); buf.seek(0); frames.append(buf.read())
         outdir = "exports"; os.makedirs(outdir, exist_ok=True)
         if fmt == "PDF":
             path = os.path.join(outdir, f"{self.ns}_run.pdf")
             with PdfPages(path) as pdf:
-                for s in st.session_state[f"{self.ns}_hist"]:
+                for s in st.session_state[f"{self.ns}_hist"].states(0, st.session_state[f"{self.ns}_pos"] + 1):
                     self._restore(s)
-                    fig = self._frame_figure(st.session_state[f"{self.ns}_A"], s["exp"])
+                    fig = self._frame_figure(st.session_state[f"{self.ns}_A"], self._exp_html(s["ev"]))
                     pdf.savefig(fig, facecolor=fig.get_facecolor()); plt.close(fig)
             saved.append(path)
         elif fmt in ("GIF","MP4"):
@@ -559,8 +500,11 @@ class MergeSortVisualizer:
         src = s.get("sb_src", "Sample graph")
         sample = s.get("sb_sample", "Random Small")
         auto = s.get("sb_auto", False)
+        precompute = s.get("sb_precompute", False)
         speed = s.get("sb_speed", 0.8)
         next_clicked = s.get("sb_next", False)
+        ff_clicked = s.get("sb_ff", False)
+        end_clicked = s.get("sb_end", False)
         back_clicked = s.get("sb_back", False)
         reset_clicked = s.get("sb_reset", False)
         export_clicked = s.get("sb_export", False)
@@ -616,26 +560,43 @@ class MergeSortVisualizer:
         with col2:
             st.markdown('<div class="frame-title">Merge Sort State</div>', unsafe_allow_html=True)
             self._ensure_state(A, f"{src}::{sample or 'custom'}::A={','.join(map(str,A))}")
+            if precompute and A:
+                self._compile()
+            seek = st.session_state.pop(f"{self.ns}_seek", None)
+            if seek is None:
+                seek = player_reached(self.ns)
+            if seek is not None and A:
+                self._seek(seek)
             self._state_table(st.session_state[f"{self.ns}_A"])
 
-        col3, col4 = st.columns(2)
-        with col3:
-            st.markdown('<div class="frame-title">Visualization</div>', unsafe_allow_html=True)
-            self._draw(st.session_state[f"{self.ns}_A"])
-            st.markdown('<div class="legend"><span><i style="background:#34d399"></i>Written</span><span><i style="background:#f59e0b"></i>i / j (current)</span><span><i style="background:#3a3f55"></i>Unvisited</span></div>', unsafe_allow_html=True)
-        with col4:
-            st.markdown('<div class="frame-title">Step-by-Step Explanation</div>', unsafe_allow_html=True)
-            exp_html = st.session_state.get(f'{self.ns}_exp', '')
-            st.markdown(f'<div class="step-explanation">{exp_html}</div>', unsafe_allow_html=True)
-
-        manual = next_clicked or back_clicked or reset_clicked
+        manual = next_clicked or back_clicked or reset_clicked or ff_clicked or end_clicked
+        if auto and not manual and not st.session_state.get(f"{self.ns}_fin", False) and len(A) > 0:
+            self._autoplay(speed)
+        else:
+            col3, col4 = st.columns(2)
+            with col3:
+                st.markdown('<div class="frame-title">Visualization</div>', unsafe_allow_html=True)
+                self._draw(st.session_state[f"{self.ns}_A"])
+                st.markdown('<div class="legend"><span><i style="background:#34d399"></i>Written</span><span><i style="background:#f59e0b"></i>i / j (current)</span><span><i style="background:#3a3f55"></i>Unvisited</span></div>', unsafe_allow_html=True)
+            with col4:
+                st.markdown('<div class="frame-title">Step-by-Step Explanation</div>', unsafe_allow_html=True)
+                exp_html = self._exp_html(st.session_state[f'{self.ns}_ev'])
+                st.markdown(f'<div class="step-explanation">{exp_html}</div>', unsafe_allow_html=True)
+
+        render_step_scrubber(self.ns, len(st.session_state[f"{self.ns}_hist"]), st.session_state[f"{self.ns}_pos"])
+        render_debug_panel(self.ns)
+
         if next_clicked and not st.session_state.get(f"{self.ns}_fin", False) and len(A) > 0:
-            self._step()
-            self._push()
+            self._advance()
+            st.rerun()
+        if ff_clicked and not st.session_state.get(f"{self.ns}_fin", False) and len(A) > 0:
+            self._seek(st.session_state[f"{self.ns}_pos"] + int(s.get("sb_ff_n", 10)))
             st.rerun()
-        if back_clicked and len(st.session_state.get(f"{self.ns}_hist", [])) > 1:
-            st.session_state[f"{self.ns}_hist"].pop()
-            self._restore(st.session_state[f"{self.ns}_hist"][-1])
+        if end_clicked and not st.session_state.get(f"{self.ns}_fin", False) and len(A) > 0:
+            self._seek(None)
+            st.rerun()
+        if back_clicked and st.session_state.get(f"{self.ns}_pos", 0) > 0:
+            self._goto(st.session_state[f"{self.ns}_pos"] - 1)
             st.rerun()
         if reset_clicked:
             st.session_state[f"{self.ns}_inited"] = False
@@ -646,8 +607,3 @@ class MergeSortVisualizer:
             for p in paths:
                 with open(p, "rb") as f:
                     st.sidebar.download_button("Download " + p.split("/")[-1], f, file_name=p.split("/")[-1], mime="application/octet-stream")
-        if auto and not st.session_state.get(f"{self.ns}_fin", False) and not manual and len(A) > 0:
-            self._step()
-            self._push()
-            time.sleep(speed)
-            st.rerun()
\ No newline at end of file
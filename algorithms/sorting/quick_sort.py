@@ -2,9 +2,14 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-import time, copy, io, os, html
+import io, os, html
 from matplotlib.backends.backend_pdf import PdfPages
+from algorithms.sorting.engine import init_quick, run_quick, step_quick
 from components.graphStyle import COLORS, GRAPH_LAYOUT_CONFIG
+from components.history import StepHistory
+from components.player import PLAYER_BATCH, figure_png, player_reached, render_player
+from components.sidebar import render_debug_panel, render_step_scrubber
+from components.trace_cache import TRACES, trace_key
 
 try:
     from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, DataReturnMode
@@ -37,29 +42,6 @@ class QuickSortVisualizer:
         df = df.reset_index(drop=True)
         return df
 
-    def _to_num_or_str(self, x):
-        try:
-            if isinstance(x, str) and "." in x:
-                return float(x)
-            return int(x)
-        except Exception:
-            try:
-                return float(x)
-            except Exception:
-                return str(x)
-
-    def _cmp(self, a, b):
-        aa = self._to_num_or_str(a)
-        bb = self._to_num_or_str(b)
-        if isinstance(aa, (int, float)) and isinstance(bb, (int, float)):
-            if aa < bb: return -1
-            if aa > bb: return 1
-            return 0
-        sa, sb = str(aa), str(bb)
-        if sa < sb: return -1
-        if sa > sb: return 1
-        return 0
-
     def _code_block(self, stage="start", l=None, r=None, p=None, i=None, j=None):
         qs = [
             "def quick_sort(A, l, r):",
@@ -131,196 +113,151 @@ class QuickSortVisualizer:
 <div style="margin-top:0.5rem">{code}</div>
 </div>"""
 
-    def _push(self):
-        h = {
-            "A": copy.deepcopy(st.session_state[f"{self.ns}_A"]),
-            "tasks": copy.deepcopy(st.session_state[f"{self.ns}_tasks"]),
-            "cur": copy.deepcopy(st.session_state[f"{self.ns}_cur"]),
+    def _snapshot(self):
+        return {
+            "A": st.session_state[f"{self.ns}_A"],
+            "tasks": st.session_state[f"{self.ns}_tasks"],
+            "cur": st.session_state[f"{self.ns}_cur"],
             "i": st.session_state[f"{self.ns}_i"],
             "j": st.session_state[f"{self.ns}_j"],
             "pivot_idx": st.session_state[f"{self.ns}_pivot_idx"],
             "step": st.session_state[f"{self.ns}_step"],
             "fin": st.session_state[f"{self.ns}_fin"],
-            "exp": st.session_state[f"{self.ns}_exp"],
+            "ev": st.session_state[f"{self.ns}_ev"],
             "swap_pair": st.session_state[f"{self.ns}_swap_pair"],
         }
-        st.session_state[f"{self.ns}_hist"].append(h)
 
-    def _restore(self, s):
-        st.session_state[f"{self.ns}_A"] = copy.deepcopy(s["A"])
-        st.session_state[f"{self.ns}_tasks"] = copy.deepcopy(s["tasks"])
-        st.session_state[f"{self.ns}_cur"] = copy.deepcopy(s["cur"])
+    def _push(self):
+        st.session_state[f"{self.ns}_hist"].append(self._snapshot())
+
+    def _load(self, s):
+        st.session_state[f"{self.ns}_A"] = s["A"]
+        st.session_state[f"{self.ns}_tasks"] = s["tasks"]
+        st.session_state[f"{self.ns}_cur"] = s["cur"]
         st.session_state[f"{self.ns}_i"] = s["i"]
         st.session_state[f"{self.ns}_j"] = s["j"]
         st.session_state[f"{self.ns}_pivot_idx"] = s["pivot_idx"]
         st.session_state[f"{self.ns}_step"] = s["step"]
         st.session_state[f"{self.ns}_fin"] = s["fin"]
-        st.session_state[f"{self.ns}_exp"] = s["exp"]
+        st.session_state[f"{self.ns}_ev"] = s["ev"]
         st.session_state[f"{self.ns}_swap_pair"] = s["swap_pair"]
+
+    def _restore(self, s):
+        self._load(s)
         st.session_state[f"{self.ns}_array_df"] = pd.DataFrame({"Value": st.session_state[f"{self.ns}_A"]}, dtype=object)
 
+    def _goto(self, idx):
+        hist = st.session_state[f"{self.ns}_hist"]
+        idx = max(0, min(int(idx), len(hist) - 1))
+        self._restore(hist[idx])
+        st.session_state[f"{self.ns}_pos"] = idx
+
+    def _advance(self):
+        hist = st.session_state[f"{self.ns}_hist"]
+        if st.session_state[f"{self.ns}_pos"] < len(hist) - 1:
+            self._goto(st.session_state[f"{self.ns}_pos"] + 1)
+            return
+        self._step()
+        self._push()
+        st.session_state[f"{self.ns}_pos"] = len(hist) - 1
+
+    def _compile(self):
+        hist = st.session_state[f"{self.ns}_hist"]
+        if hist.peek("fin"):
+            return
+        pos = st.session_state[f"{self.ns}_pos"]
+        A = hist[0]["A"]
+        st.session_state[f"{self.ns}_hist"] = TRACES.trace(trace_key(self.ns, A), lambda: run_quick(A))
+        self._goto(pos)
+
+    # Past the recorded history the engine runs in a tight loop on one working
+    # state; only the step landed on is restored and drawn. idx=None runs to
+    # the end.
+    def _seek(self, idx):
+        hist = st.session_state[f"{self.ns}_hist"]
+        if idx is None or idx >= len(hist):
+            self._goto(len(hist) - 1)
+            state = self._snapshot()
+            while (idx is None or len(hist) <= idx) and not state["fin"]:
+                step_quick(state)
+                hist.append(state)
+            if idx is None:
+                idx = len(hist) - 1
+        self._goto(idx)
+
     def _ensure_state(self, A, gkey):
         tag = f"{self.ns}_inited"
         if (not st.session_state.get(tag)) or st.session_state.get(f"{self.ns}_gkey") != gkey:
-            n = len(A)
-            st.session_state[f"{self.ns}_A"] = list(A)
-            st.session_state[f"{self.ns}_tasks"] = ([{"kind":"sort","l":0,"r":n-1}] if n>0 else [])
-            st.session_state[f"{self.ns}_cur"] = {"l":0,"r":(n-1 if n>0 else None),"stage":"start"}
-            st.session_state[f"{self.ns}_i"] = None
-            st.session_state[f"{self.ns}_j"] = None
-            st.session_state[f"{self.ns}_pivot_idx"] = None
-            st.session_state[f"{self.ns}_swap_pair"] = (-1,-1)
-            st.session_state[f"{self.ns}_step"] = 0
-            st.session_state[f"{self.ns}_fin"] = (n<=1)
-            st.session_state[f"{self.ns}_hist"] = []
-            st.session_state[f"{self.ns}_exp"] = self._exp_init(A)
+            self._load(init_quick(A))
+            st.session_state[f"{self.ns}_hist"] = StepHistory()
             st.session_state[f"{self.ns}_gkey"] = gkey
             st.session_state[tag] = True
             self._push()
+            st.session_state[f"{self.ns}_pos"] = 0
 
     def _step(self):
-        if st.session_state[f"{self.ns}_fin"]:
-            return
-        A = st.session_state[f"{self.ns}_A"]
-        tasks = st.session_state[f"{self.ns}_tasks"]
-        st.session_state[f"{self.ns}_step"] += 1
-        st.session_state[f"{self.ns}_swap_pair"] = (-1,-1)
+        state = self._snapshot()
+        step_quick(state)
+        self._load(state)
 
-        if not tasks:
-            st.session_state[f"{self.ns}_fin"] = True
-            st.session_state[f"{self.ns}_cur"] = {"l":0,"r":len(A)-1,"stage":"done"}
-            code = self._code_block(stage="recurse_right", l=0, r=len(A)-1)
-            st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="completion">Sorted!</div>
-<div class="queue-display">Array: {', '.join(map(str,A))}</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-            return
-
-        t = tasks[-1]
-
-        if t["kind"] == "sort":
-            l, r = t["l"], t["r"]
-            st.session_state[f"{self.ns}_cur"] = {"l":l,"r":r,"stage":"sort"}
-            if l >= r:
-                tasks.pop()
-                code = self._code_block(stage="base", l=l, r=r)
-                st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
+    # Steps only record a small event; the HTML is built for the step on screen.
+    def _exp_html(self, ev):
+        kind = ev[0]
+        A = st.session_state[f"{self.ns}_A"]
+        if kind == "init":
+            return self._exp_init(A)
+        head = f'''<div class="step-content">
 <div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">Segment [{l}..{r}] length ≤ 1 ⇒ base case</div>
-<div class="queue-display">Array: {', '.join(map(str,A))}</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-                return
-            tasks.pop()
-            tasks.append({"kind":"after_partition","l":l,"r":r,"p":None})
-            tasks.append({"kind":"part","l":l,"r":r,"stage":"pick","i":l-1,"j":l,"pivot_idx":r})
-            st.session_state[f"{self.ns}_cur"] = {"l":l,"r":r,"stage":"pick"}
-            st.session_state[f"{self.ns}_i"] = l-1
-            st.session_state[f"{self.ns}_j"] = l
-            st.session_state[f"{self.ns}_pivot_idx"] = r
+'''
+        arr = f"<div class=\"queue-display\">Array: {', '.join(map(str,A))}</div>"
+        if kind == "done":
+            body = f'''<div class="completion">Sorted!</div>
+{arr}'''
+            code = self._code_block(stage="recurse_right", l=0, r=len(A)-1)
+        elif kind == "base":
+            _, l, r = ev
+            body = f'''<div class="action">Segment [{l}..{r}] length ≤ 1 ⇒ base case</div>
+{arr}'''
+            code = self._code_block(stage="base", l=l, r=r)
+        elif kind == "call":
+            _, l, r, pivot = ev
+            body = f'''<div class="action">Call partition on [{l}..{r}]</div>
+<div class="queue-display">pivot = A[{r}] = {pivot}</div>'''
             code = self._code_block(stage="call_partition", l=l, r=r)
-            st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">Call partition on [{l}..{r}]</div>
-<div class="queue-display">pivot = A[{r}] = {A[r]}</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-            return
-
-        if t["kind"] == "part":
-            l, r = t["l"], t["r"]
-            i, j, pv_idx = t["i"], t["j"], t["pivot_idx"]
-            pivot = A[pv_idx]
-            st.session_state[f"{self.ns}_cur"] = {"l":l,"r":r,"stage":t["stage"]}
-            st.session_state[f"{self.ns}_i"] = i
-            st.session_state[f"{self.ns}_j"] = j
-            st.session_state[f"{self.ns}_pivot_idx"] = pv_idx
-
-            if t["stage"] == "pick":
-                t["stage"] = "scan"
-                code = self._code_block(stage="pick_pivot", l=l, r=r, i=i, j=j)
-                st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">pivot = <span class="vertex">{pivot}</span> at index {pv_idx}</div>
-<div class="action">i = l - 1 = {l-1}, j = l = {l}</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-                return
-
-            if t["stage"] == "scan":
-                if j < r:
-                    if self._cmp(A[j], pivot) <= 0:
-                        t["stage"] = "swap_ij"
-                        t["i"] = i + 1
-                        st.session_state[f"{self.ns}_i"] = i + 1
-                        code = self._code_block(stage="scan", l=l, r=r, i=i+1, j=j)
-                        st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">A[{j}] = {A[j]} ≤ pivot {pivot} ⇒ i ← {i+1}, swap(A[i], A[j])</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-                        return
-                    else:
-                        t["j"] = j + 1
-                        st.session_state[f"{self.ns}_j"] = j + 1
-                        code = self._code_block(stage="scan", l=l, r=r, i=i, j=j+1)
-                        st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">A[{j}] = {A[j]} > pivot {pivot} ⇒ j ← {j+1}</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-                        return
-                t["stage"] = "place"
-                code = self._code_block(stage="place_pivot", l=l, r=r, i=i, j=j)
-                st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">End of scan ⇒ swap pivot into position i+1 = {i+1}</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-                return
-
-            if t["stage"] == "swap_ij":
-                ai, aj = t["i"], t["j"]
-                if ai != aj:
-                    A[ai], A[aj] = A[aj], A[ai]
-                    st.session_state[f"{self.ns}_swap_pair"] = (ai, aj)
-                t["j"] = aj + 1
-                t["stage"] = "scan"
-                st.session_state[f"{self.ns}_j"] = aj + 1
-                code = self._code_block(stage="swap_ij", l=l, r=r, i=ai, j=aj)
-                st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">swap(A[{ai}], A[{aj}]) ⇒ Array: {', '.join(map(str,A))}</div>
-<div class="action">j ← {aj+1}</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-                return
-
-            if t["stage"] == "place":
-                pi = i + 1
-                if pi != r:
-                    A[pi], A[r] = A[r], A[pi]
-                    st.session_state[f"{self.ns}_swap_pair"] = (pi, r)
-                tasks.pop()
-                ap = tasks[-1] if tasks and tasks[-1]["kind"] == "after_partition" else None
-                if ap:
-                    ap["p"] = pi
-                st.session_state[f"{self.ns}_pivot_idx"] = pi
-                code = self._code_block(stage="place_pivot", l=l, r=r, p=pi)
-                st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="completion">pivot placed at index <span class="vertex">{pi}</span></div>
-<div class="queue-display">Array: {', '.join(map(str,A))}</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-                return
-
-        if t["kind"] == "after_partition":
-            l, r, p = t["l"], t["r"], t["p"]
-            tasks.pop()
-            tasks.append({"kind":"sort","l":p+1,"r":r})
-            tasks.append({"kind":"sort","l":l,"r":p-1})
-            st.session_state[f"{self.ns}_cur"] = {"l":l,"r":r,"stage":"recurse"}
+        elif kind == "pick":
+            _, l, r, i, j, pv_idx, pivot = ev
+            body = f'''<div class="action">pivot = <span class="vertex">{pivot}</span> at index {pv_idx}</div>
+<div class="action">i = l - 1 = {l-1}, j = l = {l}</div>'''
+            code = self._code_block(stage="pick_pivot", l=l, r=r, i=i, j=j)
+        elif kind == "le":
+            _, l, r, i, j, aj, pivot = ev
+            body = f'<div class="action">A[{j}] = {aj} ≤ pivot {pivot} ⇒ i ← {i+1}, swap(A[i], A[j])</div>'
+            code = self._code_block(stage="scan", l=l, r=r, i=i+1, j=j)
+        elif kind == "gt":
+            _, l, r, i, j, aj, pivot = ev
+            body = f'<div class="action">A[{j}] = {aj} > pivot {pivot} ⇒ j ← {j+1}</div>'
+            code = self._code_block(stage="scan", l=l, r=r, i=i, j=j+1)
+        elif kind == "end_scan":
+            _, l, r, i, j = ev
+            body = f'<div class="action">End of scan ⇒ swap pivot into position i+1 = {i+1}</div>'
+            code = self._code_block(stage="place_pivot", l=l, r=r, i=i, j=j)
+        elif kind == "swap":
+            _, l, r, ai, aj = ev
+            body = f'''<div class="action">swap(A[{ai}], A[{aj}]) ⇒ Array: {', '.join(map(str,A))}</div>
+<div class="action">j ← {aj+1}</div>'''
+            code = self._code_block(stage="swap_ij", l=l, r=r, i=ai, j=aj)
+        elif kind == "placed":
+            _, l, r, pi = ev
+            body = f'''<div class="completion">pivot placed at index <span class="vertex">{pi}</span></div>
+{arr}'''
+            code = self._code_block(stage="place_pivot", l=l, r=r, p=pi)
+        else:
+            _, l, r, p = ev
+            body = f'''<div class="action">Recurse on left [{l}..{p-1}] and right [{p+1}..{r}]</div>
+{arr}'''
             code = self._code_block(stage="recurse_left", l=l, r=r, p=p)
-            st.session_state[f"{self.ns}_exp"] = f"""<div class="step-content">
-<div class="step-header">Step {st.session_state[f"{self.ns}_step"]}</div>
-<div class="action">Recurse on left [{l}..{p-1}] and right [{p+1}..{r}]</div>
-<div class="queue-display">Array: {', '.join(map(str,A))}</div>
-<div style="margin-top:0.5rem">{code}</div></div>"""
-            return
+        return f'''{head}{body}
+<div style="margin-top:0.5rem">{code}</div></div>'''
 
     def _ag_clean(self, original_df, ag_out):
         df_out = pd.DataFrame(ag_out.data if hasattr(ag_out, "data") else ag_out)
@@ -490,20 +427,36 @@ class QuickSortVisualizer:
         ax2.text(0.02, 0.75, plain, fontsize=10, color="#e6ecff", va="top", family="monospace", wrap=True, linespacing=1.5)
         return fig
 
+    # Auto-play renders the next batch of frames, from the cursor on, once
+    # and lets the browser play them. The cursor stays put; it only moves
+    # when the player reports the step it reached (player_reached), and the
+    # rerun that follows sends the batch starting there.
+    def _autoplay(self, speed):
+        pos = st.session_state[f"{self.ns}_pos"]
+        self._seek(pos + PLAYER_BATCH - 1)
+        end = st.session_state[f"{self.ns}_pos"]
+        more = not st.session_state.get(f"{self.ns}_fin", False)
+        frames = []
+        for s in st.session_state[f"{self.ns}_hist"].states(pos, end + 1):
+            self._restore(s)
+            frames.append(figure_png(self._frame_figure(st.session_state[f"{self.ns}_A"], self._exp_html(s["ev"]))))
+        self._goto(pos)
+        render_player(frames, speed, self.ns, first_step=pos, more=more)
+
     def _export(self, fmt, fps, A):
         frames = []; saved = []
-        for s in st.session_state[f"{self.ns}_hist"]:
+        for s in st.session_state[f"{self.ns}_hist"].states(0, st.session_state[f"{self.ns}_pos"] + 1):
             self._restore(s)
-            fig = self._frame_figure(st.session_state[f"{self.ns}_A"], s["exp"])
+            fig = self._frame_figure(st.session_state[f"{self.ns}_A"], self._exp_html(s["ev"]))
             buf = io.BytesIO(); fig.savefig(buf, format="png", dpi=140, facecolor=fig.get_facecolor())
             plt.close(fig); buf.seek(0); frames.append(buf.read())
         outdir = "exports"; os.makedirs(outdir, exist_ok=True)
         if fmt == "PDF":
             path = os.path.join(outdir, f"{self.ns}_run.pdf")
             with PdfPages(path) as pdf:
-                for s in st.session_state[f"{self.ns}_hist"]:
+                for s in st.session_state[f"{self.ns}_hist"].states(0, st.session_state[f"{self.ns}_pos"] + 1):
                     self._restore(s)
-                    fig = self._frame_figure(st.session_state[f"{self.ns}_A"], s["exp"])
+                    fig = self._frame_figure(st.session_state[f"{self.ns}_A"], self._exp_html(s["ev"]))
                     pdf.savefig(fig, facecolor=fig.get_facecolor()); plt.close(fig)
             saved.append(path)
         elif fmt in ("GIF","MP4"):
@@ -526,8 +479,11 @@ class QuickSortVisualizer:
         src = s.get("sb_src", "Sample graph")
         sample = s.get("sb_sample", "Random Small")
         auto = s.get("sb_auto", False)
+        precompute = s.get("sb_precompute", False)
         speed = s.get("sb_speed", 0.8)
         next_clicked = s.get("sb_next", False)
+        ff_clicked = s.get("sb_ff", False)
+        end_clicked = s.get("sb_end", False)
         back_clicked = s.get("sb_back", False)
         reset_clicked = s.get("sb_reset", False)
         export_clicked = s.get("sb_export", False)
@@ -583,26 +539,43 @@ class QuickSortVisualizer:
         with col2:
             st.markdown('<div class="frame-title">Quick Sort State</div>', unsafe_allow_html=True)
             self._ensure_state(A, f"{src}::{sample or 'custom'}::A={','.join(map(str,A))}")
+            if precompute and A:
+                self._compile()
+            seek = st.session_state.pop(f"{self.ns}_seek", None)
+            if seek is None:
+                seek = player_reached(self.ns)
+            if seek is not None and A:
+                self._seek(seek)
             self._state_table(st.session_state[f"{self.ns}_A"])
 
-        col3, col4 = st.columns(2)
-        with col3:
-            st.markdown('<div class="frame-title">Visualization</div>', unsafe_allow_html=True)
-            self._draw(st.session_state[f"{self.ns}_A"])
-            st.markdown('<div class="legend"><span><i style="background:#7c4dff"></i>Pivot</span><span><i style="background:#34d399"></i>≤ pivot region</span><span><i style="background:#f59e0b"></i>i / j / swap</span><span><i style="background:#3a3f55"></i>Unvisited</span></div>', unsafe_allow_html=True)
-        with col4:
-            st.markdown('<div class="frame-title">Step-by-Step Explanation</div>', unsafe_allow_html=True)
-            exp_html = st.session_state.get(f'{self.ns}_exp', '')
-            st.markdown(f'<div class="step-explanation">{exp_html}</div>', unsafe_allow_html=True)
-
-        manual = next_clicked or back_clicked or reset_clicked
+        manual = next_clicked or back_clicked or reset_clicked or ff_clicked or end_clicked
+        if auto and not manual and not st.session_state.get(f"{self.ns}_fin", False) and len(A) > 0:
+            self._autoplay(speed)
+        else:
+            col3, col4 = st.columns(2)
+            with col3:
+                st.markdown('<div class="frame-title">Visualization</div>', unsafe_allow_html=True)
+                self._draw(st.session_state[f"{self.ns}_A"])
+                st.markdown('<div class="legend"><span><i style="background:#7c4dff"></i>Pivot</span><span><i style="background:#34d399"></i>≤ pivot region</span><span><i style="background:#f59e0b"></i>i / j / swap</span><span><i style="background:#3a3f55"></i>Unvisited</span></div>', unsafe_allow_html=True)
+            with col4:
+                st.markdown('<div class="frame-title">Step-by-Step Explanation</div>', unsafe_allow_html=True)
+                exp_html = self._exp_html(st.session_state[f'{self.ns}_ev'])
+                st.markdown(f'<div class="step-explanation">{exp_html}</div>', unsafe_allow_html=True)
+
+        render_step_scrubber(self.ns, len(st.session_state[f"{self.ns}_hist"]), st.session_state[f"{self.ns}_pos"])
+        render_debug_panel(self.ns)
+
         if next_clicked and not st.session_state.get(f"{self.ns}_fin", False) and len(A) > 0:
-            self._step()
-            self._push()
+            self._advance()
+            st.rerun()
+        if ff_clicked and not st.session_state.get(f"{self.ns}_fin", False) and len(A) > 0:
+            self._seek(st.session_state[f"{self.ns}_pos"] + int(s.get("sb_ff_n", 10)))
             st.rerun()
-        if back_clicked and len(st.session_state.get(f"{self.ns}_hist", [])) > 1:
-            st.session_state[f"{self.ns}_hist"].pop()
-            self._restore(st.session_state[f"{self.ns}_hist"][-1])
+        if end_clicked and not st.session_state.get(f"{self.ns}_fin", False) and len(A) > 0:
+            self._seek(None)
+            st.rerun()
+        if back_clicked and st.session_state.get(f"{self.ns}_pos", 0) > 0:
+            self._goto(st.session_state[f"{self.ns}_pos"] - 1)
             st.rerun()
         if reset_clicked:
             st.session_state[f"{self.ns}_inited"] = False
@@ -613,8 +586,3 @@ class QuickSortVisualizer:
             for p in paths:
                 with open(p, "rb") as f:
                     st.sidebar.download_button("Download " + p.split("/")[-1], f, file_name=p.split("/")[-1], mime="application/octet-stream")
-        if auto and not st.session_state.get(f"{self.ns}_fin", False) and not manual and len(A) > 0:
-            self._step()
-            self._push()
-            time.sleep(speed)
-            st.rerun()
\ No newline at end of file
@@ -22,7 +22,7 @@ st.markdown('<p class="subtitle">Interactive visualization of algorithms with st
 category, algorithm, *_ = render_sidebar()
 
 def clear_algorithm_state():
-    prefixes = ("bfs_", "dfs_", "dijkstra_", "linear_", "binary_", "bubble_", "insertion_", "merge_", "quick_")
+    prefixes = ("bfs_", "dfs_", "dijkstra_", "astar_", "bidijkstra_", "unionfind_", "linear_", "binary_", "bubble_", "insertion_", "merge_", "quick_")
     for k in list(st.session_state.keys()):
         if any(k.startswith(p) for p in prefixes):
             del st.session_state[k]
@@ -36,6 +36,9 @@ routes = {
     ("Graph Algorithms", "BFS"): ("algorithms.graph.bfs", "BFSVisualizer"),
     ("Graph Algorithms", "DFS"): ("algorithms.graph.dfs", "DFSVisualizer"),
     ("Graph Algorithms", "Dijkstra"): ("algorithms.graph.dijkstra", "DijkstraVisualizer"),
+    ("Graph Algorithms", "A*"): ("algorithms.graph.astar", "AStarVisualizer"),
+    ("Graph Algorithms", "Bidirectional Dijkstra"): ("algorithms.graph.astar", "BidirectionalDijkstraVisualizer"),
+    ("Graph Algorithms", "Union-Find"): ("algorithms.graph.union_find", "UnionFindVisualizer"),
     ("Sorting Algorithms", "Bubble Sort"): ("algorithms.sorting.bubble_sort", "BubbleSortVisualizer"),
     ("Sorting Algorithms", "Insertion Sort"): ("algorithms.sorting.insertion_sort", "InsertionSortVisualizer"),
     ("Sorting Algorithms", "Merge Sort"): ("algorithms.sorting.merge_sort", "MergeSortVisualizer"),
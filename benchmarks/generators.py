@@ -0,0 +1,43 @@
+# Builds every synthetic graph kind and runs a full traversal over it:
+#   python benchmarks/generators.py                  # 1k .. 1M vertices
+#   python benchmarks/generators.py 50000 --degree 8 --seed 3
+# "gen" is the time to build the CSR graph, "levels" the level BFS from
+# vertex 0 and "reached" how many vertices it got to. The one-vertex-per-step
+# BFS is timed up to VERTEX_MAX vertices.
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from algorithms.graph.engine import run_bfs, run_bfs_levels
+from algorithms.graph.generators import KINDS, generate
+
+VERTEX_MAX = 100000
+
+
+def timed_run(run, g):
+    t = time.perf_counter()
+    for state in run(g, 0):
+        pass
+    return time.perf_counter() - t, state
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("sizes", nargs="*", type=int, default=[1000, 10000, 100000, 1000000])
+    ap.add_argument("--degree", type=float, default=4.0)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    print(f"{'kind':>17} {'n':>8} {'edges':>9} {'gen':>8} {'level bfs':>10} {'levels':>7} {'reached':>8} {'bfs':>8}")
+    for n in args.sizes:
+        for kind in KINDS:
+            _, g, report = generate(kind, n, args.degree, args.seed)
+            tl, state = timed_run(run_bfs_levels, g)
+            tb = f"{timed_run(run_bfs, g)[0]:.3f}s" if n <= VERTEX_MAX else "-"
+            print(f"{kind:>17} {n:>8} {report['edges']:>9} {report['seconds']:>7.3f}s {tl:>9.3f}s "
+                  f"{len(state['levels']):>7} {len(state['order']):>8} {tb:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# Times force_layout on grids and random sparse graphs:
+#   python benchmarks/layout.py              # 2.5k .. 20k vertices
+#   python benchmarks/layout.py 50000 100000
+# "edge/pair" is the mean edge length over the mean distance between random
+# vertex pairs; lower means neighbours are drawn closer together.
+import argparse
+import sys
+import time
+from pathlib import Path
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from algorithms.graph.csr import CSRGraph
+from algorithms.graph.layout import force_layout
+
+
+def grid_graph(n):
+    w = max(1, int(np.sqrt(n)))
+    i = np.arange(w * w)
+    right, down = i[i % w < w - 1], i[i // w < w - 1]
+    a = np.concatenate([right, down])
+    b = np.concatenate([right + 1, down + w])
+    return CSRGraph.from_edges(w * w, np.concatenate([a, b]), np.concatenate([b, a]))
+
+
+def random_graph(n, degree, seed):
+    rng = np.random.default_rng(seed)
+    m = n * degree // 2
+    a, b = rng.integers(0, n, m), rng.integers(0, n, m)
+    keep = a != b
+    a, b = a[keep], b[keep]
+    return CSRGraph.from_edges(n, np.concatenate([a, b]), np.concatenate([b, a]))
+
+
+def edge_ratio(g, P, seed=1):
+    src, dst, _ = g.edge_pairs()
+    rng = np.random.default_rng(seed)
+    i, j = rng.integers(0, len(g), 5000), rng.integers(0, len(g), 5000)
+    return np.linalg.norm(P[src] - P[dst], axis=1).mean() / np.linalg.norm(P[i] - P[j], axis=1).mean()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("sizes", nargs="*", type=int, default=[2500, 10000, 20000])
+    ap.add_argument("--degree", type=int, default=3)
+    args = ap.parse_args()
+    print(f"{'graph':>7} {'n':>7} {'edges':>8} {'time':>9} {'edge/pair':>10}")
+    for n in args.sizes:
+        for name, g in (("grid", grid_graph(n)), ("random", random_graph(n, args.degree, n))):
+            t = time.perf_counter()
+            P = force_layout(g)
+            dt = time.perf_counter() - t
+            print(f"{name:>7} {len(g):>7} {g.n_edges // 2:>8} {dt:>8.2f}s {edge_ratio(g, P):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
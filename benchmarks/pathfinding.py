@@ -0,0 +1,48 @@
+# Plain Dijkstra, A* and bidirectional Dijkstra from one point to another on
+# generated grid and random geometric graphs:
+#   python benchmarks/pathfinding.py                  # 10k and 100k vertices
+#   python benchmarks/pathfinding.py 250000 --weights Uniform --heuristic Euclidean
+# The query runs from the vertex nearest a quarter of the way across the
+# graph's coordinates to the one nearest three quarters, so the searches do
+# not start or end on the boundary. "ops" is heap pushes plus pops.
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from algorithms.graph.engine import HEURISTICS, compare_searches, heuristic
+from algorithms.graph.generators import WEIGHTS, generate
+
+KINDS = ["Grid", "Random geometric"]
+
+
+def nearest(P, at):
+    lo, hi = P.min(0), P.max(0)
+    return int(np.argmin(((P - (lo + (hi - lo) * at)) ** 2).sum(1)))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("sizes", nargs="*", type=int, default=[10000, 100000])
+    ap.add_argument("--degree", type=float, default=4.0)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--weights", choices=WEIGHTS, default="Constant")
+    ap.add_argument("--heuristic", choices=HEURISTICS, default="Manhattan")
+    args = ap.parse_args()
+    print(f"{'kind':>17} {'n':>8} {'search':>14} {'expanded':>9} {'relaxed':>9} {'ops':>9} {'dist':>9} {'time':>8}")
+    for n in args.sizes:
+        for kind in KINDS:
+            degree = args.degree if kind == "Grid" else max(args.degree, 8.0)
+            _, g, report = generate(kind, n, degree, args.seed, args.weights, 1.0, 10.0)
+            P = report["coords"]
+            start, goal = nearest(P, 0.25), nearest(P, 0.75)
+            res = compare_searches(g, start, goal, heuristic(P, goal, args.heuristic, g))
+            for name, r in res.items():
+                print(f"{kind:>17} {n:>8} {name:>14} {r['expanded']:>9} {r['relaxed']:>9} "
+                      f"{r['pushes'] + r['pops']:>9} {r['dist']:>9.2f} {r['seconds']:>7.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# Times matrix sanitization on random n x n inputs:
+#   python benchmarks/sanitize.py                    # 500 .. 10000
+#   python benchmarks/sanitize.py 1000 3000 --legacy # also time the old pandas path
+# The legacy path is the stack/unstack + diagonal loop version the
+# visualizers used before algorithms/graph/matrix.py; it is slow and memory
+# hungry, so it is only run up to 3000 vertices.
+import argparse
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from algorithms.graph.matrix import sanitize_adjacency, sanitize_weights
+
+LEGACY_MAX = 3000
+
+
+def legacy_adjacency(df):
+    df = pd.DataFrame(df).copy()
+    cols = [c for c in df.columns if not str(c).startswith("::")]
+    df = df.loc[:, cols]
+    idx = df.index.astype(str).tolist()
+    cols = pd.Index(df.columns).astype(str).tolist()
+    V = sorted(set(idx) | set(cols))
+    if len(V) == 0:
+        return pd.DataFrame(0, index=[], columns=[])
+    df.index = pd.Index(df.index).astype(str)
+    df.columns = pd.Index(df.columns).astype(str)
+    M = df.reindex(index=V, columns=V)
+    M = pd.to_numeric(M.stack(), errors="coerce").unstack()
+    M = M.replace([np.inf, -np.inf], 0).fillna(0.0)
+    M = (M > 0.5).astype(int)
+    for i, v in enumerate(V):
+        M.iloc[i, i] = 0
+    M = ((M + M.T) > 0).astype(int)
+    return M
+
+
+def random_matrix(n, density, seed):
+    rng = np.random.default_rng(seed)
+    V = [f"v{i:05d}" for i in range(n)]
+    X = (rng.random((n, n)) < density) * rng.integers(1, 10, (n, n)).astype(float)
+    return pd.DataFrame(X, index=V, columns=V)
+
+
+def timed(fn, df):
+    t = time.perf_counter()
+    out = fn(df)
+    return time.perf_counter() - t, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("sizes", nargs="*", type=int, default=[500, 1000, 3000, 10000])
+    ap.add_argument("--density", type=float, default=0.01)
+    ap.add_argument("--legacy", action="store_true")
+    args = ap.parse_args()
+    print(f"{'n':>6} {'adjacency':>11} {'weights':>11} {'legacy adj':>11}")
+    for n in args.sizes:
+        df = random_matrix(n, args.density, n)
+        ta, A = timed(sanitize_adjacency, df)
+        tw, _ = timed(sanitize_weights, df)
+        tl = "-"
+        if args.legacy and n <= LEGACY_MAX:
+            t, L = timed(legacy_adjacency, df)
+            assert np.array_equal(L.to_numpy(), A.to_numpy())
+            tl = f"{t:.3f}s"
+        print(f"{n:>6} {ta:>10.3f}s {tw:>10.3f}s {tl:>11}")
+        del df, A
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# Times full BFS and DFS runs, and the level-synchronous BFS, on random
+# sparse graphs:
+#   python benchmarks/traversal.py                     # 25k .. 200k vertices
+#   python benchmarks/traversal.py 10000 20000 --legacy # also time the old list frontier
+# The legacy path is the list queue/stack with `v not in queue` checks the
+# engines used before the membership arrays; it is quadratic in the frontier
+# size, so it is only run up to 20000 vertices. Time per vertex should stay
+# flat as n grows for the current engines. "levels" is the number of steps
+# the level BFS takes. "recorded" runs BFS to the end through StepHistory
+# the way the visualizer's trace cache does, so it includes the per-step
+# diffing and copies; its time per vertex should stay flat too.
+import argparse
+import sys
+import time
+from pathlib import Path
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from algorithms.graph.csr import CSRGraph
+from algorithms.graph.engine import TAILS, run_bfs, run_bfs_levels, run_dfs
+from components.history import StepHistory
+
+LEGACY_MAX = 20000
+
+
+def legacy_bfs(g, start):
+    visited = np.zeros(len(g), dtype=bool)
+    queue, order = [start], []
+    while queue:
+        u = queue.pop(0)
+        if visited[u]:
+            continue
+        visited[u] = True
+        order.append(u)
+        for v in g.neighbors(u):
+            if not visited[v] and v not in queue:
+                queue.append(v)
+    return order
+
+
+def legacy_dfs(g, start):
+    visited = np.zeros(len(g), dtype=bool)
+    stack, order = [start], []
+    while stack:
+        u = stack.pop()
+        if visited[u]:
+            continue
+        visited[u] = True
+        order.append(u)
+        for v in reversed(g.neighbors(u)):
+            if not visited[v] and v not in stack:
+                stack.append(v)
+    return order
+
+
+# Undirected graph with about n * degree / 2 edges, plus a chain so that
+# every vertex is reachable from 0.
+def random_graph(n, degree, seed):
+    rng = np.random.default_rng(seed)
+    m = n * degree // 2
+    a = np.concatenate([rng.integers(0, n, m), np.arange(n - 1)])
+    b = np.concatenate([rng.integers(0, n, m), np.arange(1, n)])
+    keep = a != b
+    a, b = a[keep], b[keep]
+    return CSRGraph.from_edges(n, np.concatenate([a, b]), np.concatenate([b, a]))
+
+
+def timed_run(run, g):
+    t = time.perf_counter()
+    for state in run(g, 0):
+        pass
+    return time.perf_counter() - t, state["order"]
+
+
+def timed_record(run, g):
+    t = time.perf_counter()
+    hist = StepHistory(budget=None, tails=TAILS)
+    for state in run(g, 0):
+        hist.append(state)
+    return time.perf_counter() - t, hist
+
+
+def timed(fn, g):
+    t = time.perf_counter()
+    out = fn(g, 0)
+    return time.perf_counter() - t, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("sizes", nargs="*", type=int, default=[25000, 50000, 100000, 200000])
+    ap.add_argument("--degree", type=int, default=4)
+    ap.add_argument("--legacy", action="store_true")
+    args = ap.parse_args()
+    print(f"{'n':>7} {'edges':>8} {'bfs':>9} {'us/v':>6} {'dfs':>9} {'us/v':>6} {'level bfs':>10} {'levels':>6} {'recorded':>9} {'us/v':>6} {'legacy bfs':>11} {'legacy dfs':>11}")
+    for n in args.sizes:
+        g = random_graph(n, args.degree, n)
+        tb, ob = timed_run(run_bfs, g)
+        td, od = timed_run(run_dfs, g)
+        t = time.perf_counter()
+        for state in run_bfs_levels(g, 0):
+            pass
+        tl = time.perf_counter() - t
+        assert sorted(state["order"]) == sorted(ob)
+        tr, hist = timed_record(run_bfs, g)
+        assert hist[len(hist) - 1]["order"] == ob
+        lb = ld = "-"
+        if args.legacy and n <= LEGACY_MAX:
+            t, o = timed(legacy_bfs, g)
+            assert o == ob
+            lb = f"{t:.3f}s"
+            t, o = timed(legacy_dfs, g)
+            assert o == od
+            ld = f"{t:.3f}s"
+        print(f"{n:>7} {g.n_edges // 2:>8} {tb:>8.3f}s {tb / n * 1e6:>6.2f} {td:>8.3f}s {td / n * 1e6:>6.2f} {tl:>9.3f}s {len(state['levels']):>6} {tr:>8.3f}s {tr / n * 1e6:>6.0f} {lb:>11} {ld:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# Unions every edge of generated graphs under each mix of path compression
+# and union rule, counting pointer hops per find:
+#   python benchmarks/union_find.py                   # 10k .. 1M vertices
+#   python benchmarks/union_find.py 200000 --kind Grid --order graph
+# "hops/find" is the amortized cost; the run without either option stops
+# after --budget hops, marked with "*".
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from algorithms.graph.engine import compare_union_find
+from algorithms.graph.generators import KINDS, generate
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("sizes", nargs="*", type=int, default=[10000, 100000, 1000000])
+    ap.add_argument("--kind", choices=KINDS, default="Erdős–Rényi")
+    ap.add_argument("--degree", type=float, default=4.0)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--order", choices=["shuffled", "graph"], default="shuffled")
+    ap.add_argument("--budget", type=int, default=20_000_000)
+    args = ap.parse_args()
+    print(f"{'n':>8} {'edges':>9} {'options':>24} {'hops/find':>10} {'longest':>8} {'sets':>8} {'time':>8}")
+    for n in args.sizes:
+        _, g, report = generate(args.kind, n, args.degree, args.seed)
+        src, dst, _ = g.edge_pairs()
+        if args.order == "shuffled":
+            perm = np.random.default_rng(args.seed).permutation(len(src))
+            src, dst = src[perm], dst[perm]
+        for name, r in compare_union_find(n, src, dst, args.budget).items():
+            mark = "" if r["complete"] else "*"
+            print(f"{n:>8} {report['edges']:>9} {name:>24} {r['hops'] / max(r['finds'], 1):>9.3f}{mark:1} "
+                  f"{r['max_hops']:>8} {r['sets']:>8} {r['seconds']:>7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
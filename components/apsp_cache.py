@@ -0,0 +1,30 @@
+import os
+from components.lru import LRUCache
+from components.trace_cache import trace_key
+
+APSP_CACHE_SIZE = int(os.environ.get("APSP_CACHE_SIZE", "4"))
+APSP_CACHE_BYTES = int(float(os.environ.get("APSP_CACHE_MB", "256")) * 2**20)
+
+
+# Hash of the weighted CSR graph and the method asked for; Floyd-Warshall
+# and Dijkstra can pick different predecessors on ties.
+def apsp_key(G, method):
+    return trace_key("apsp", method, G.offsets, G.indices, G.weights)
+
+
+class APSPCache(LRUCache):
+    # (dist, pred, info) results shared by every session in the process,
+    # with the matrices read-only. They are V x V (about 192 MB at 4000
+    # vertices), so the cache is bounded by their size as well as by count;
+    # the least recently used ones are dropped first.
+    def __init__(self, max_entries=APSP_CACHE_SIZE, max_bytes=APSP_CACHE_BYTES):
+        super().__init__(max_entries, max_bytes, lambda res: res[0].nbytes + res[1].nbytes)
+
+    def put(self, key, res):
+        dist, pred, info = res
+        dist.setflags(write=False)
+        pred.setflags(write=False)
+        return super().put(key, (dist, pred, info))
+
+
+APSP = APSPCache()
@@ -29,5 +29,11 @@ GRAPH_LAYOUT_CONFIG = {
     "edge_width_path": 4.5,
     "edge_color_regular": "#3a3f55",
     "edge_color_highlight": "#fbbf24",
-    "edge_color_path": "#34d399"
+    "edge_color_path": "#34d399",
+    "max_draw_vertices": 50000,
+    "max_edge_labels": 300,
+    "lod_vertices": 1000,
+    "raster_edges": 50000,
+    "raster_size": 400,
+    "lod_max_markers": 5000
 }
\ No newline at end of file
@@ -0,0 +1,204 @@
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba_array
+from components.graphStyle import COLORS, GRAPH_LAYOUT_CONFIG
+from components.lru import LRUCache
+from components.trace_cache import trace_key
+
+# Batched graph drawing for the graph visualizers. All edges go into one
+# LineCollection and all vertices into one scatter (a PathCollection), with
+# per-item colour and width arrays, so the number of artists per frame does
+# not grow with the edge count. Vertices are CSR ids and P holds their
+# positions in id order; edges are the (src, dst) arrays of edge_pairs().
+#
+# Above lod_vertices the level-of-detail drawing takes over: no labels,
+# small nodes, faded edges away from the search, and the frontier and
+# current vertex drawn on top. With the density view (or above
+# raster_edges edges) the graph itself becomes a raster_size^2 image built
+# with NumPy and cached per layout, so a frame's cost no longer depends on
+# the size of the graph.
+
+# base density images, keyed by layout and edges
+_RASTERS = LRUCache(max_entries=8, sizeof=lambda img: img.nbytes)
+
+
+# RGBA per vertex: start, then current, then visited, else unvisited.
+def vertex_colors(visited, current=None, start=None):
+    palette = to_rgba_array([COLORS["unvisited"], COLORS["visited"], COLORS["current"], COLORS["source"]])
+    code = np.asarray(visited, dtype=np.int8).copy()
+    if current is not None:
+        code[current] = 2
+    if start is not None:
+        code[start] = 3
+    return palette[code]
+
+
+# True for the edges listed in pairs, (u, v) ids in either direction. Keys
+# are int64: edge_pairs gives int32 ids, and u * n overflows past ~46k.
+def _highlight_mask(n, src, dst, pairs):
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    a, b = pairs[:, 0], pairs[:, 1]
+    return np.isin(np.asarray(src, dtype=np.int64) * n + dst, np.concatenate([a * n + b, b * n + a]))
+
+
+# RGBA and width per edge, with the edges in pairs highlighted.
+def edge_styles(n, src, dst, pairs):
+    hi = _highlight_mask(n, src, dst, pairs).astype(np.int8)
+    palette = to_rgba_array([GRAPH_LAYOUT_CONFIG["edge_color_regular"], GRAPH_LAYOUT_CONFIG["edge_color_highlight"]])
+    widths = np.array([GRAPH_LAYOUT_CONFIG["edge_width_regular"], GRAPH_LAYOUT_CONFIG["edge_width_highlight"]])
+    return palette[hi], widths[hi]
+
+
+# Step text for the frame's text panel, cut to a fixed number of lines
+# and columns: wrapping thousands of vertex names dominates a frame's cost
+# on large graphs.
+def clip_text(text, lines=14, width=110):
+    rows = text.splitlines()
+    out = [r if len(r) <= width else r[:width - 1] + "…" for r in rows[:lines]]
+    if len(rows) > lines:
+        out.append(f"… {len(rows) - lines} more lines")
+    return "\n".join(out)
+
+
+def _weight_text(w):
+    return f"{w:.0f}" if abs(w - round(w)) < 1e-9 else f"{w:.2f}"
+
+
+# style overrides GRAPH_LAYOUT_CONFIG keys (node_size, font_size, ...) plus
+# edge_label_size. Weight labels are skipped above max_edge_labels edges.
+def draw_graph(ax, P, src, dst, node_color, edge_color, edge_width, labels=None, weights=None, **style):
+    cfg = {**GRAPH_LAYOUT_CONFIG, **style}
+    P = np.asarray(P, dtype=np.float64)
+    ax.add_collection(LineCollection(
+        np.stack([P[src], P[dst]], 1), colors=edge_color, linewidths=edge_width, zorder=1,
+    ))
+    ax.scatter(
+        P[:, 0], P[:, 1], s=cfg["node_size"], c=node_color, zorder=2,
+        edgecolors=cfg["node_border_color"], linewidths=cfg["node_border_width"],
+    )
+    if labels is not None:
+        for (x, y), t in zip(P.tolist(), labels):
+            ax.text(x, y, str(t), ha="center", va="center", zorder=3, clip_on=True,
+                    fontsize=cfg["font_size"], fontweight=cfg["font_weight"], color=cfg["font_color"])
+    if weights is not None and len(src) <= cfg["max_edge_labels"]:
+        mid = (P[src] + P[dst]) / 2
+        for (x, y), w in zip(mid.tolist(), np.asarray(weights).tolist()):
+            ax.text(x, y, _weight_text(w), ha="center", va="center", zorder=3, clip_on=True,
+                    fontsize=cfg.get("edge_label_size", cfg["font_size"]), color="#ff6b6b",
+                    bbox=dict(boxstyle="round", ec="white", fc="white"))
+    ax.margins(0.1)
+    ax.autoscale_view()
+
+
+# Lod roles per vertex: 0 unvisited, 1 visited, 2 frontier, 3 current, 4 start.
+def _roles(visited, frontier, current, start):
+    code = np.asarray(visited, dtype=np.int8).copy()
+    code[np.asarray(frontier, dtype=bool)] = 2
+    if current is not None:
+        code[current] = 3
+    if start is not None:
+        code[start] = 4
+    return code
+
+
+# pairs are the edges of the current step, in highlight colour; tree edges
+# (Dijkstra's shortest-path tree) are drawn brighter than other visited
+# edges, and left to the visited layer in the density view.
+def draw_graph_lod(ax, P, src, dst, visited, frontier, current=None, start=None, pairs=(), tree=(), density=False):
+    cfg = GRAPH_LAYOUT_CONFIG
+    P = np.asarray(P, dtype=np.float64)
+    n = len(P)
+    code = _roles(visited, frontier, current, start)
+    if density or len(src) > cfg["raster_edges"]:
+        _draw_density(ax, P, src, dst, code, pairs)
+    else:
+        seen = (code[src] > 0) | (code[dst] > 0)
+        rgba = np.where(seen[:, None], to_rgba_array([COLORS["visited"]]), to_rgba_array([cfg["edge_color_regular"]]))
+        rgba[:, 3] = np.where(seen, 0.45, 0.15)
+        width = np.where(seen, 0.7, 0.4)
+        on_tree = _highlight_mask(n, src, dst, tree)
+        rgba[on_tree, 3] = 0.9
+        width[on_tree] = 1.0
+        hi = _highlight_mask(n, src, dst, pairs)
+        rgba[hi] = to_rgba_array([cfg["edge_color_highlight"]])
+        width[hi] = 1.6
+        ax.add_collection(LineCollection(np.stack([P[src], P[dst]], 1), colors=rgba, linewidths=width, zorder=1))
+        palette = to_rgba_array([COLORS["unvisited"], COLORS["visited"], COLORS["active"], COLORS["current"], COLORS["source"]])
+        sizes = np.array([4.0, 9.0, 22.0, 90.0, 90.0])
+        ax.scatter(P[:, 0], P[:, 1], s=sizes[code], c=palette[code], linewidths=0, zorder=2)
+    _draw_markers(ax, P, code)
+    ax.margins(0.03)
+    ax.autoscale_view()
+
+
+# Frontier (up to lod_max_markers), current and start vertices as markers
+# over whatever the graph was drawn as.
+def _draw_markers(ax, P, code):
+    front = np.flatnonzero(code == 2)
+    if 0 < len(front) <= GRAPH_LAYOUT_CONFIG["lod_max_markers"]:
+        ax.scatter(P[front, 0], P[front, 1], s=26, c=COLORS["active"], edgecolors="white", linewidths=0.4, zorder=3)
+    for role, color in ((4, COLORS["source"]), (3, COLORS["current"])):
+        at = np.flatnonzero(code == role)
+        if len(at):
+            ax.scatter(P[at, 0], P[at, 1], s=140, c=color, edgecolors="white", linewidths=1.5, zorder=4)
+
+
+def _pixels(Q, size):
+    q = np.clip(np.round(Q).astype(np.int64), 0, size - 1)
+    return q[:, 1] * size + q[:, 0]
+
+
+# log edge and vertex density on a size x size grid; Q is in pixel units.
+# Each edge is sampled about once per pixel of its length.
+def _edge_density(Q, src, dst, size):
+    L = np.ceil(np.sqrt(((Q[dst] - Q[src]) ** 2).sum(1))).clip(1, 64).astype(np.int64)
+    budget = 4_000_000
+    if L.sum() > budget:
+        L = np.maximum(1, L * budget // L.sum())
+    e = np.repeat(np.arange(len(src)), L)
+    t = (np.arange(int(L.sum())) - np.repeat(np.cumsum(L) - L, L)) / np.repeat(L, L)
+    pts = Q[src[e]] + (Q[dst[e]] - Q[src[e]]) * t[:, None]
+    img = np.bincount(_pixels(pts, size), minlength=size * size)
+    img += np.bincount(_pixels(Q, size), minlength=size * size)
+    return np.log1p(img.reshape(size, size))
+
+
+# 3 x 3 maximum, so single-pixel vertices stay visible.
+def _dilate(img):
+    pad = np.pad(img, 1)
+    h, w = img.shape
+    return np.max([pad[i:i + h, j:j + w] for i in range(3) for j in range(3)], axis=0)
+
+
+def _layer(mask_count, color, alpha):
+    rgba = np.zeros(mask_count.shape + (4,))
+    rgba[..., :3] = to_rgba_array([color])[0, :3]
+    c = mask_count.astype(np.float64)
+    rgba[..., 3] = np.where(c > 0, alpha[0] + (alpha[1] - alpha[0]) * c / max(c.max(), 1.0), 0.0)
+    return rgba
+
+
+def _draw_density(ax, P, src, dst, code, pairs):
+    size = GRAPH_LAYOUT_CONFIG["raster_size"]
+    lo = P.min(0)
+    span = max(float((P.max(0) - lo).max()), 1e-9)
+    Q = (P - lo) / span * (size - 1)
+    extent = (lo[0] - 0.5 * span / size, lo[0] + span * (1 + 0.5 / size),
+              lo[1] - 0.5 * span / size, lo[1] + span * (1 + 0.5 / size))
+    base = _RASTERS.cached(trace_key("raster", size, P, src, dst), lambda: _edge_density(Q, src, dst, size))
+    ax.imshow(_layer(base, COLORS["text_tertiary"], (0.06, 0.5)), origin="lower",
+              extent=extent, interpolation="nearest", aspect="auto", zorder=0)
+    seen = _dilate(np.bincount(_pixels(Q[code > 0], size), minlength=size * size).reshape(size, size))
+    ax.imshow(_layer(seen, COLORS["visited"], (0.55, 1.0)), origin="lower",
+              extent=extent, interpolation="nearest", aspect="auto", zorder=1)
+    front = code == 2
+    if front.sum() > GRAPH_LAYOUT_CONFIG["lod_max_markers"]:
+        f = _dilate(np.bincount(_pixels(Q[front], size), minlength=size * size).reshape(size, size))
+        ax.imshow(_layer(f, COLORS["active"], (0.9, 1.0)), origin="lower",
+                  extent=extent, interpolation="nearest", aspect="auto", zorder=2)
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    if len(pairs):
+        ax.add_collection(LineCollection(
+            np.stack([P[pairs[:, 0]], P[pairs[:, 1]]], 1),
+            colors=GRAPH_LAYOUT_CONFIG["edge_color_highlight"], linewidths=1.2, zorder=2,
+        ))
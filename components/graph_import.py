@@ -0,0 +1,79 @@
+import streamlit as st
+from algorithms.graph.generators import GeneratorError, generate
+from algorithms.graph.importer import GraphImportError, guess_format, read_graph
+
+
+# Reads the file chosen in the sidebar once per (file, format, weighted) and
+# keeps (names, CSRGraph, report) in session state; None until a file has
+# been imported successfully.
+def load_imported_graph(ns, weighted):
+    f = st.session_state.get("sb_import_file")
+    if f is None:
+        return None
+    fmt = st.session_state.get("sb_import_fmt", "Auto")
+    if fmt == "Auto":
+        fmt = guess_format(f.name)
+    key = (f.file_id, fmt, bool(weighted))
+    cached = st.session_state.get(f"{ns}_import")
+    if cached is not None and cached[0] == key:
+        if cached[2]:
+            st.error(f"Import failed: {cached[2]}")
+        return cached[1]
+
+    bar = st.progress(0.0, text=f"Reading {f.name} as {fmt}")
+
+    def progress(done, total, edges):
+        frac = min(1.0, done / total) if done is not None and total else 0.0
+        bar.progress(frac, text=f"Reading {f.name} as {fmt}: {edges:,} edges")
+
+    try:
+        f.seek(0)
+        result, err = read_graph(f, fmt, weighted=weighted, progress=progress), None
+    except GraphImportError as e:
+        result, err = None, str(e)
+    bar.empty()
+    st.session_state[f"{ns}_import"] = (key, result, err)
+    if err:
+        st.error(f"Import failed: {err}")
+    return result
+
+
+def render_import_report(report):
+    st.caption(
+        f"{report['vertices']:,} vertices · {report['edges']:,} edges "
+        f"({report['rows']:,} rows, {report['duplicates']:,} duplicates merged, "
+        f"{report['self_loops']:,} self-loops dropped, {report['invalid']:,} invalid)"
+    )
+    if report["warnings"]:
+        with st.expander(f"Skipped rows ({report['invalid']:,})"):
+            for w in report["warnings"]:
+                st.caption(w)
+
+
+# Same as load_imported_graph for the sidebar's Generate source: the graph
+# is rebuilt only when a generator setting changes. Weighted callers get
+# the chosen weight distribution, the others an unweighted graph.
+def load_generated_graph(ns, weighted):
+    s = st.session_state
+    kind = s.get("sb_gen_kind", "Grid")
+    low, high = s.get("sb_gen_range", (1.0, 10.0))
+    weights = s.get("sb_gen_weights", "Uniform") if weighted else None
+    key = (kind, int(s.get("sb_gen_n", 1000)), float(s.get("sb_gen_degree", 4.0)), int(s.get("sb_gen_seed", 0)), weights, low, high)
+    cached = s.get(f"{ns}_generated")
+    if cached is None or cached[0] != key:
+        try:
+            with st.spinner(f"Generating {kind} graph with {key[1]:,} vertices"):
+                result, err = generate(kind, key[1], key[2], key[3], weights, low, high), None
+        except GeneratorError as e:
+            result, err = None, str(e)
+        cached = s[f"{ns}_generated"] = (key, result, err)
+    if cached[2]:
+        st.error(f"Generation failed: {cached[2]}")
+    return cached[1]
+
+
+def render_generate_report(report):
+    st.caption(
+        f"{report['kind']} · seed {report['seed']} · {report['vertices']:,} vertices · "
+        f"{report['edges']:,} edges (mean degree {report['mean_degree']:.2f}) · built in {report['seconds']:.2f}s"
+    )
@@ -0,0 +1,421 @@
+import bisect
+import copy
+import os
+import pickle
+import sqlite3
+import tempfile
+import weakref
+from collections import deque
+from itertools import islice
+import numpy as np
+
+KEYFRAME_EVERY = 32
+KEYFRAME_MAX = 4096
+HISTORY_BUDGET = int(float(os.environ.get("HISTORY_BUDGET_MB", "32")) * 2**20)
+
+_MISSING = object()
+
+
+# ---------- Deltas ----------
+# A step is stored as {key: op} for every top-level state key that changed.
+#   ("v", value)          replace the whole value
+#   ("d", changed, gone)  dict: set changed keys, drop removed keys
+#   ("i", {idx: value})   list of equal length: patch individual slots
+#   ("t", keep, tail)     list: keep the common prefix, replace the tail
+#   ("a", idx, values)    ndarray of equal shape/dtype: write changed slots
+#   ("q", drop, tail)     deque: pop `drop` items on the left, append tail
+# Ops may share objects with the new state; append stores a pickled copy.
+def _same(a, b):
+    if type(a) is np.ndarray or type(b) is np.ndarray:
+        return type(a) is type(b) and a.shape == b.shape and a.dtype == b.dtype and np.array_equal(a, b)
+    return type(a) is type(b) and a == b
+
+
+def _diff(old, new):
+    if old is _MISSING:
+        return ("v", new)
+    if type(new) is np.ndarray:
+        if type(old) is np.ndarray and old.shape == new.shape and old.dtype == new.dtype:
+            idx = np.flatnonzero(old.ravel() != new.ravel())
+            if idx.size == 0:
+                return None
+            return ("a", idx, new.ravel()[idx])
+        return ("v", new)
+    if type(old) is dict and type(new) is dict:
+        changed = {k: v for k, v in new.items() if k not in old or not _same(old[k], v)}
+        gone = [k for k in old if k not in new]
+        if not changed and not gone:
+            return None
+        return ("d", changed, gone)
+    if type(old) is list and type(new) is list:
+        if old == new:
+            return None
+        if len(old) == len(new):
+            slots = []
+            _changed_slots(old, new, 0, len(new), slots)
+            return ("i", {i: new[i] for i in slots})
+        keep = _common_prefix(old, new)
+        return ("t", keep, new[keep:])
+    if type(old) is deque and type(new) is deque:
+        if old == new:
+            return None
+        return _diff_queue(old, new)
+    if _same(old, new):
+        return None
+    return ("v", new)
+
+
+# List slices are compared in C (identity first, then ==), and only the
+# halves that differ are looked into, so a step that swaps two slots or
+# appends to a long list costs a few passes in C rather than a Python loop
+# over every item.
+def _changed_slots(old, new, lo, hi, out):
+    if old[lo:hi] == new[lo:hi]:
+        return
+    if hi - lo <= 16:
+        out.extend(i for i in range(lo, hi) if not _same(old[i], new[i]))
+        return
+    mid = (lo + hi) // 2
+    _changed_slots(old, new, lo, mid, out)
+    _changed_slots(old, new, mid, hi, out)
+
+
+# Length of the common prefix; a list that only grew matches in one pass.
+def _common_prefix(old, new):
+    n = min(len(old), len(new))
+    if (old if n == len(old) else old[:n]) == (new if n == len(new) else new[:n]):
+        return n
+    lo, hi = 0, n
+    while hi - lo > 16:
+        mid = (lo + hi) // 2
+        if old[lo:mid] == new[lo:mid]:
+            lo = mid
+        else:
+            hi = mid
+    while lo < hi and _same(old[lo], new[lo]):
+        lo += 1
+    return lo
+
+
+# For lists that only change at the end and never get an item back in a slot
+# it left: everything below the last slot that still matches is untouched,
+# so an append costs O(1) and a stack step O(items popped).
+def _diff_tail(old, new):
+    keep = min(len(old), len(new))
+    while keep and not _same(old[keep - 1], new[keep - 1]):
+        keep -= 1
+    if keep == len(old) == len(new):
+        return None
+    return ("t", keep, new[keep:])
+
+
+# A FIFO step pops from the left and appends on the right, so the drop is
+# where the new head sits in the old queue. Queues are only used FIFO and
+# hold each item at most once (the BFS queue is guarded by inq), so the
+# guess is checked against the head, the last old item and the length
+# rather than item by item; when that fails, each drop that lines up with
+# the new head is checked with one C-level list compare.
+def _diff_queue(old, new):
+    n = len(old)
+    if not new:
+        return ("q", n, [])
+    head = new[0]
+    for k in range(min(n, 4)):
+        if old[k] == head:
+            pushed = len(new) - (n - k)
+            if pushed >= 0 and old[-1] == new[n - k - 1]:
+                return ("q", k, list(islice(reversed(new), pushed))[::-1])
+            break
+    o, w = list(old), list(new)
+    for k in range(max(0, n - len(w)), n):
+        if o[k] == head and o[k:] == w[:n - k]:
+            return ("q", k, w[n - k:])
+    return ("q", n, w)
+
+
+def _apply(value, op):
+    kind = op[0]
+    if kind == "v":
+        return copy.deepcopy(op[1])
+    if kind == "d":
+        for k in op[2]:
+            value.pop(k, None)
+        value.update(copy.deepcopy(op[1]))
+        return value
+    if kind == "i":
+        for i, v in op[1].items():
+            value[i] = copy.deepcopy(v)
+        return value
+    if kind == "t":
+        del value[op[1]:]
+        value.extend(copy.deepcopy(op[2]))
+        return value
+    if kind == "a":
+        np.put(value, op[1], op[2])
+        return value
+    if kind == "q":
+        for _ in range(op[1]):
+            value.popleft()
+        value.extend(copy.deepcopy(op[2]))
+        return value
+    raise ValueError(f"unknown history op {kind!r}")
+
+
+# ---------- Spill store ----------
+# Sealed history segments (a keyframe plus the deltas up to the next one)
+# that no longer fit the memory budget, pickled into a private SQLite file.
+class _SpillStore:
+    def __init__(self):
+        fd, self.path = tempfile.mkstemp(prefix="hist_", suffix=".sqlite")
+        os.close(fd)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("CREATE TABLE seg (k INTEGER PRIMARY KEY, data BLOB)")
+        self._done = weakref.finalize(self, _SpillStore._drop, self._db, self.path)
+
+    @staticmethod
+    def _drop(db, path):
+        db.close()
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def put(self, k, blob):
+        self._db.execute("INSERT OR REPLACE INTO seg VALUES (?, ?)", (k, blob))
+
+    def get(self, k):
+        return self._db.execute("SELECT data FROM seg WHERE k = ?", (k,)).fetchone()[0]
+
+    def delete(self, k):
+        self._db.execute("DELETE FROM seg WHERE k = ?", (k,))
+
+
+# ---------- History ----------
+class StepHistory:
+    # Stores full snapshots (keyframes) and per-key deltas in between, so
+    # memory grows with what changed rather than with the size of the state.
+    # A new keyframe is taken once the deltas since the last one add up to
+    # its size, at least `keyframe_every` and at most KEYFRAME_MAX steps
+    # apart: keyframes then take about as much memory as the deltas, and a
+    # read replays about one keyframe's worth of deltas. Reads return
+    # independent copies.
+    #
+    # With a byte budget, the oldest sealed segments beyond it are spilled to
+    # disk and paged back in (one segment at a time) when Back or a seek
+    # lands in them. budget=None keeps everything in memory.
+    #
+    # tails names state keys whose lists only change at the end (see TAILS in
+    # the graph engine); those are diffed from the end with _diff_tail.
+    def __init__(self, keyframe_every=KEYFRAME_EVERY, budget=HISTORY_BUDGET, tails=()):
+        self.keyframe_every = max(1, int(keyframe_every))
+        self.budget = budget
+        self.tails = frozenset(tails)
+        self._kf_idx = []
+        self._kf = {}
+        self._deltas = []
+        self._sizes = []
+        self._tip = None
+        self._cursor = None
+        self._spilled = {}
+        self._store = None
+        self._paged = None
+        self._mem = 0
+        self._kf_bytes = 0
+        self._since = 0
+
+    def __len__(self):
+        return len(self._deltas)
+
+    def __bool__(self):
+        return bool(self._deltas)
+
+    def _keyframe_due(self, i):
+        gap = i - self._kf_idx[-1]
+        return gap >= KEYFRAME_MAX or (gap >= self.keyframe_every and self._since >= self._kf_bytes)
+
+    def append(self, state):
+        i = len(self._deltas)
+        if self._tip is None or self._keyframe_due(i):
+            # One pickle gives the size and both copies, faster than deepcopy.
+            blob = pickle.dumps(state, pickle.HIGHEST_PROTOCOL)
+            self._kf[i] = pickle.loads(blob)
+            bisect.insort(self._kf_idx, i)
+            self._deltas.append(None)
+            self._tip = pickle.loads(blob)
+            self._kf_bytes = self._account(self._kf[i], len(blob))
+            self._since = 0
+            self._enforce_budget()
+            return
+        delta = {}
+        for k, v in state.items():
+            old = self._tip.get(k, _MISSING)
+            if k in self.tails and type(old) is list and type(v) is list:
+                op = _diff_tail(old, v)
+            else:
+                op = _diff(old, v)
+            if op is not None:
+                delta[k] = op
+        blob = pickle.dumps(delta, pickle.HIGHEST_PROTOCOL)
+        self._deltas.append(pickle.loads(blob))
+        self._since += self._account(delta, len(blob))
+        for k, op in delta.items():
+            self._tip[k] = _apply(self._tip.get(k), op)
+
+    # A copy that shares the recorded keyframes and deltas (never modified
+    # in place) but has its own tip and read cursor, so several sessions can
+    # read and extend the same trace independently.
+    def fork(self):
+        other = StepHistory(self.keyframe_every, self.budget, self.tails)
+        other._kf_idx = list(self._kf_idx)
+        other._kf = dict(self._kf)
+        other._deltas = list(self._deltas)
+        other._sizes = list(self._sizes)
+        other._mem = sum(self._sizes)
+        for k in self._spilled:
+            kf, deltas = self._load(k)
+            other._kf[k] = kf
+            other._deltas[k:k + len(deltas)] = deltas
+        other._tip = copy.deepcopy(self._tip)
+        other._kf_bytes, other._since = self._kf_bytes, self._since
+        other._enforce_budget()
+        return other
+
+    def pop(self):
+        if not self._deltas:
+            raise IndexError("pop from empty history")
+        self.truncate(len(self._deltas) - 1)
+
+    # Drops every step from n on, so step n - 1 becomes the tip.
+    def truncate(self, n):
+        n = max(0, min(int(n), len(self._deltas)))
+        if n == len(self._deltas):
+            return
+        if n > 0 and self._segment_of(n - 1) in self._spilled:
+            self._page_in(self._segment_of(n - 1))
+        # spilled segments past the cut are not counted in _mem
+        self._mem -= sum(self._sizes[n:])
+        for k in [k for k in self._spilled if k >= n]:
+            self._mem += self._spilled.pop(k)[0]
+            self._store.delete(k)
+        j = bisect.bisect_left(self._kf_idx, n)
+        for k in self._kf_idx[j:]:
+            self._kf.pop(k, None)
+        del self._kf_idx[j:]
+        del self._deltas[n:]
+        del self._sizes[n:]
+        self._paged = None
+        if self._cursor is not None and self._cursor[0] >= n:
+            self._cursor = None
+        self._tip = copy.deepcopy(self._state_at(n - 1)) if n > 0 else None
+        self._rebalance()
+
+    # ---------- memory budget ----------
+    def _account(self, entry, n=None):
+        if n is None:
+            n = len(pickle.dumps(entry, pickle.HIGHEST_PROTOCOL))
+        self._sizes.append(n)
+        self._mem += n
+        return n
+
+    # Bytes of the last keyframe and of the deltas after it.
+    def _rebalance(self):
+        k = self._kf_idx[-1] if self._kf_idx else 0
+        self._kf_bytes = self._sizes[k] if self._sizes else 0
+        self._since = sum(self._sizes[k + 1:])
+
+    def _segment_of(self, i):
+        return self._kf_idx[bisect.bisect_right(self._kf_idx, i) - 1]
+
+    def _segment_end(self, k):
+        j = bisect.bisect_right(self._kf_idx, k)
+        return self._kf_idx[j] if j < len(self._kf_idx) else len(self._deltas)
+
+    def _enforce_budget(self):
+        if self.budget is None:
+            return
+        # the segment holding the tip stays in memory
+        for k in self._kf_idx[:-1]:
+            if self._mem <= self.budget:
+                break
+            if k not in self._spilled:
+                self._spill(k)
+
+    def _spill(self, k):
+        end = self._segment_end(k)
+        blob = pickle.dumps((self._kf[k], self._deltas[k:end]), pickle.HIGHEST_PROTOCOL)
+        if self._store is None:
+            self._store = _SpillStore()
+        self._store.put(k, blob)
+        del self._kf[k]
+        self._deltas[k:end] = [None] * (end - k)
+        size = sum(self._sizes[k:end])
+        self._spilled[k] = (size, len(blob))
+        self._mem -= size
+
+    def _load(self, k):
+        if self._paged is None or self._paged[0] != k:
+            self._paged = (k,) + pickle.loads(self._store.get(k))
+        return self._paged[1], self._paged[2]
+
+    def _page_in(self, k):
+        kf, deltas = self._load(k)
+        self._kf[k] = kf
+        self._deltas[k:k + len(deltas)] = deltas
+        self._mem += self._spilled.pop(k)[0]
+        self._store.delete(k)
+        self._paged = None
+
+    def stats(self):
+        return {
+            "steps": len(self._deltas),
+            "keyframes": len(self._kf_idx),
+            "memory_bytes": self._mem,
+            "budget_bytes": self.budget,
+            "spilled_segments": len(self._spilled),
+            "spilled_bytes": sum(b for _, b in self._spilled.values()),
+            "spill_path": self._store.path if self._store is not None else None,
+        }
+
+    # ---------- reads ----------
+    def _index(self, i):
+        n = len(self._deltas)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("history index out of range")
+        return i
+
+    def _state_at(self, i):
+        kf = self._segment_of(i)
+        if kf in self._spilled:
+            base, deltas = self._load(kf)
+            off = kf
+        else:
+            base, deltas, off = self._kf[kf], self._deltas, 0
+        cur = self._cursor
+        if cur is not None and kf <= cur[0] <= i:
+            start, work = cur
+        else:
+            start, work = kf, copy.deepcopy(base)
+        for j in range(start + 1, i + 1):
+            for k, op in deltas[j - off].items():
+                work[k] = _apply(work.get(k), op)
+        self._cursor = (i, work)
+        return work
+
+    def peek(self, key):
+        return self._tip[key]
+
+    def __getitem__(self, i):
+        i = self._index(i)
+        if i == len(self._deltas) - 1:
+            return copy.deepcopy(self._tip)
+        return copy.deepcopy(self._state_at(i))
+
+    def states(self, start=0, stop=None):
+        stop = len(self._deltas) if stop is None else min(stop, len(self._deltas))
+        for i in range(start, stop):
+            yield self[i]
+
+    def __iter__(self):
+        return self.states()
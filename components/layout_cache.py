@@ -0,0 +1,33 @@
+import os
+import numpy as np
+from components.lru import LRUCache
+from components.trace_cache import trace_key
+
+LAYOUT_CACHE_SIZE = int(os.environ.get("LAYOUT_CACHE_SIZE", "32"))
+
+
+# Hash of the vertex names and the CSR structure. Weights are left out:
+# the force layout ignores them, so editing a weight keeps the drawing.
+def layout_key(V, G):
+    return trace_key("layout", list(V), G.offsets, G.indices)
+
+
+class LayoutCache(LRUCache):
+    # Vertex positions shared by every session in the process, as read-only
+    # (n, 2) arrays in vertex order. The least recently used layout is
+    # dropped once max_entries is exceeded.
+    def __init__(self, max_entries=LAYOUT_CACHE_SIZE):
+        super().__init__(max_entries, sizeof=lambda P: P.nbytes)
+
+    def put(self, key, P):
+        P = np.array(P, dtype=np.float64)
+        P.setflags(write=False)
+        return super().put(key, P)
+
+    # Cached positions for key, or compute() them (an (n, 2) array-like)
+    # and cache the result.
+    def layout(self, key, compute):
+        return self.cached(key, compute)
+
+
+LAYOUTS = LayoutCache()
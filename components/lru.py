@@ -0,0 +1,74 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    # Least-recently-used cache shared by every session in the process.
+    # Entries are dropped, oldest first, once there are more than
+    # max_entries of them or their sizes add up to more than max_bytes
+    # (None: no limit). sizeof(value) gives an entry's size in bytes; an
+    # entry larger than max_bytes on its own is not kept.
+    def __init__(self, max_entries=None, max_bytes=None, sizeof=None):
+        self.max_entries = None if max_entries is None else max(0, int(max_entries))
+        self.max_bytes = None if max_bytes is None else max(0, int(max_bytes))
+        self.sizeof = sizeof or (lambda value: 0)
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+        return item[0]
+
+    def put(self, key, value):
+        size = int(self.sizeof(value))
+        if self.max_entries == 0 or (self.max_bytes is not None and size > self.max_bytes):
+            return value
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._items[key] = (value, size)
+            self._bytes += size
+            while (self.max_entries is not None and len(self._items) > self.max_entries) or \
+                    (self.max_bytes is not None and self._bytes > self.max_bytes):
+                _, (_, n) = self._items.popitem(last=False)
+                self._bytes -= n
+                self.evictions += 1
+        return value
+
+    # Cached value for key, or compute() it and cache the result.
+    def cached(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, compute())
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._items),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,92 @@
+import bisect
+import numpy as np
+import pandas as pd
+import streamlit as st
+from algorithms.graph.csr import CSRGraph
+from algorithms.graph.matrix import MatrixError, edge_edits, sanitize_adjacency, sanitize_weights
+
+# Incremental edits for the adjacency / weight matrix editors. The sanitized
+# matrix stays in {ns}_matrix_df and its CSR graph in {ns}_csr. An edited
+# cell, Add Vertex or Delete Vertex patches both, instead of re-sanitizing
+# the V x V matrix and rebuilding the graph from it, and moves the drawn
+# layout in {ns}_layout over to the new ids together with the vertices to
+# re-settle (see update_layout). Only a grid whose rows no longer match the
+# matrix (rows added in the fallback data editor) is sanitized in full. A
+# grid the sanitizers reject (an infinite cell) is reported and the stored
+# matrix kept.
+
+
+# CSR graph of the editor matrix W, built once per matrix object.
+def editor_graph(ns, W, weighted):
+    cached = st.session_state.get(f"{ns}_csr")
+    if cached is None or cached[0] is not W:
+        cached = st.session_state[f"{ns}_csr"] = (W, CSRGraph.from_matrix(W.to_numpy(), weighted=weighted))
+    return cached[1]
+
+
+# new_id[old] for every old vertex id (-1 when deleted); moved are new ids.
+def _patch_layout(ns, g_old, V, g, new_id, moved):
+    prev = st.session_state.get(f"{ns}_layout")
+    if prev is None or prev[1] is not g_old:
+        return
+    P = np.full((len(g), 2), np.nan)
+    kept = new_id >= 0
+    P[new_id[kept]] = np.asarray(prev[2])[kept]
+    if len(prev) > 3:
+        old = new_id[prev[3]]
+        moved = np.concatenate([old[old >= 0], moved])
+    st.session_state[f"{ns}_layout"] = (list(V), g, P, np.unique(np.asarray(moved, dtype=np.int64)))
+
+
+def _store(ns, W, g):
+    st.session_state[f"{ns}_matrix_df"] = W
+    st.session_state[f"{ns}_csr"] = (W, g)
+    return W, g
+
+
+# The editor's matrix X applied to W; returns (W, graph).
+def apply_grid_edits(ns, W, X, weighted):
+    g = editor_graph(ns, W, weighted)
+    X = pd.DataFrame(X)
+    try:
+        if list(X.index) != list(W.index) or list(X.columns) != list(W.columns):
+            W = sanitize_weights(X) if weighted else sanitize_adjacency(X)
+            return _store(ns, W, CSRGraph.from_matrix(W.to_numpy(), weighted=weighted))
+        u, v, w = edge_edits(W.to_numpy(), X.to_numpy(), weighted, list(W.index))
+    except MatrixError as e:
+        st.error(f"Matrix edit ignored: {e}")
+        return _store(ns, W, g)
+    if len(u) == 0:
+        return _store(ns, W, g)
+    for a, b, x in zip(u.tolist(), v.tolist(), (w if weighted else w.astype(int)).tolist()):
+        W.iat[a, b] = x
+        W.iat[b, a] = x
+    g2 = g.with_edges(u, v, w)
+    _patch_layout(ns, g, list(W.index), g2, np.arange(len(W)), np.concatenate([u, v]))
+    return _store(ns, W, g2)
+
+
+def add_vertex(ns, W, name, weighted):
+    g = editor_graph(ns, W, weighted)
+    V = list(W.index)
+    at = bisect.bisect_left(V, name)
+    M = np.insert(np.insert(W.to_numpy(), at, 0, axis=0), at, 0, axis=1)
+    V2 = V[:at] + [name] + V[at:]
+    g2 = g.with_vertex(at)
+    new_id = np.arange(len(V)) + (np.arange(len(V)) >= at)
+    _patch_layout(ns, g, V2, g2, new_id, [at])
+    return _store(ns, pd.DataFrame(M, index=V2, columns=V2), g2)
+
+
+def delete_vertex(ns, W, name, weighted):
+    g = editor_graph(ns, W, weighted)
+    V = list(W.index)
+    at = V.index(name)
+    nb = g.indices[g.offsets[at]:g.offsets[at + 1]].astype(np.int64)
+    M = np.delete(np.delete(W.to_numpy(), at, axis=0), at, axis=1)
+    V2 = V[:at] + V[at + 1:]
+    g2 = g.without_vertex(at)
+    new_id = np.arange(len(V)) - (np.arange(len(V)) > at)
+    new_id[at] = -1
+    _patch_layout(ns, g, V2, g2, new_id, nb - (nb > at))
+    return _store(ns, pd.DataFrame(M, index=V2, columns=V2), g2)
@@ -0,0 +1,43 @@
+import base64
+import io
+import os
+import matplotlib.pyplot as plt
+import streamlit as st
+import streamlit.components.v1 as components
+
+PLAYER_BATCH = 16
+PLAYER_DPI = 80
+
+_player = components.declare_component(
+    "step_player", path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "player_frontend"))
+
+
+def figure_png(fig):
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=PLAYER_DPI, facecolor=fig.get_facecolor())
+    plt.close(fig)
+    return buf.getvalue()
+
+
+# The player is a bidirectional component (player_frontend/index.html): it
+# flips through the frames with a JS timer, so the server does no work
+# between frames, and reports the step it is showing halfway through each
+# batch, on Pause and at the end. The report reruns the script; callers
+# move their cursor with player_reached and send the batch from there, so
+# the cursor never runs ahead of what the browser has shown. more=False
+# marks the batch that ends the run.
+def render_player(frames, speed, ns, first_step=0, more=False, height=700):
+    if not frames:
+        return
+    srcs = ["data:image/png;base64," + base64.b64encode(b).decode("ascii") for b in frames]
+    _player(frames=srcs, first=int(first_step), more=bool(more), delay=int(max(0.05, float(speed)) * 1000),
+            height=height, key=f"{ns}_player", default=None)
+
+
+# Step the player last reported for ns, once per report, else None.
+def player_reached(ns):
+    rep = st.session_state.get(f"{ns}_player")
+    if not rep or rep.get("id") == st.session_state.get(f"{ns}_player_ack"):
+        return None
+    st.session_state[f"{ns}_player_ack"] = rep["id"]
+    return int(rep["pos"])
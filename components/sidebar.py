@@ -1,4 +1,9 @@
 import streamlit as st
+from algorithms.graph.generators import KINDS, MAX_VERTICES, WEIGHTS
+from algorithms.graph.importer import FORMATS
+from components.apsp_cache import APSP
+from components.layout_cache import LAYOUTS
+from components.trace_cache import TRACES
 
 GRAPH_SAMPLES = ["Straight Chain","Simple Branch","Small Cycle","Mini Tree","Cross Path"]
 DIJKSTRA_SAMPLES = ["Tiny Weighted","Triangle 3","Grid 4x4","Random 6"]
@@ -24,7 +29,7 @@ def render_sidebar():
         )
 
         algo_map = {
-            "Graph Algorithms": ["BFS","DFS","Dijkstra"],
+            "Graph Algorithms": ["BFS","DFS","Dijkstra","A*","Bidirectional Dijkstra","Union-Find"],
             "Sorting Algorithms": ["Bubble Sort","Insertion Sort","Merge Sort","Quick Sort"],
             "Searching Algorithms": ["Linear Search","Binary Search"],
         }
@@ -39,9 +44,12 @@ def render_sidebar():
         source_title = "Graph source" if is_graph else "Array source"
         st.markdown(f'<div class="sb-sec">{source_title}</div>', unsafe_allow_html=True)
 
+        sources = ["Sample graph","Build your own"] + (["Import file", "Generate"] if is_graph else [])
+        if st.session_state.get("sb_src") not in sources:
+            st.session_state["sb_src"] = sources[0]
         source = st.radio(
             "Source",
-            ["Sample graph","Build your own"],         
+            sources,
             key="sb_src", horizontal=False, label_visibility="collapsed"
         )
 
@@ -49,6 +57,9 @@ def render_sidebar():
             ("Graph Algorithms","BFS"): GRAPH_SAMPLES,
             ("Graph Algorithms","DFS"): GRAPH_SAMPLES,
             ("Graph Algorithms","Dijkstra"): DIJKSTRA_SAMPLES,
+            ("Graph Algorithms","A*"): DIJKSTRA_SAMPLES,
+            ("Graph Algorithms","Bidirectional Dijkstra"): DIJKSTRA_SAMPLES,
+            ("Graph Algorithms","Union-Find"): DIJKSTRA_SAMPLES,
             ("Searching Algorithms","Linear Search"): ARRAY_SAMPLES,
             ("Searching Algorithms","Binary Search"): BINARY_SAMPLES,
             ("Sorting Algorithms","Bubble Sort"): SORT_SAMPLES,
@@ -70,10 +81,33 @@ def render_sidebar():
                 )
             else:
                 st.session_state["sb_sample"] = ""
+        elif source == "Import file":
+            st.session_state["sb_sample"] = ""
+            st.file_uploader(
+                "Graph file", type=["txt","edges","el","tsv","csv","mtx","mm","graphml","xml"],
+                key="sb_import_file", label_visibility="collapsed"
+            )
+            st.selectbox("File format", ["Auto"] + FORMATS, key="sb_import_fmt")
+        elif source == "Generate":
+            st.session_state["sb_sample"] = ""
+            st.selectbox("Graph kind", KINDS, key="sb_gen_kind")
+            g1, g2 = st.columns(2)
+            g1.number_input("Vertices", min_value=2, max_value=MAX_VERTICES, value=st.session_state.get("sb_gen_n", 1000), step=1000, key="sb_gen_n")
+            g2.number_input("Mean degree", min_value=0.0, max_value=50.0, value=st.session_state.get("sb_gen_degree", 4.0), step=0.5, key="sb_gen_degree")
+            if algorithm in ("Dijkstra", "A*", "Bidirectional Dijkstra"):
+                st.selectbox("Weights", WEIGHTS, key="sb_gen_weights")
+                st.slider("Weight range", 1.0, 100.0, st.session_state.get("sb_gen_range", (1.0, 10.0)), 0.5, key="sb_gen_range")
+            st.number_input("Seed", min_value=0, value=st.session_state.get("sb_gen_seed", 0), step=1, key="sb_gen_seed")
         else:
             st.session_state["sb_sample"] = ""
 
         auto = st.checkbox("Auto-Play", value=st.session_state.get("sb_auto", False), key="sb_auto")
+        precompute = st.checkbox("Precompute run", value=st.session_state.get("sb_precompute", False), key="sb_precompute")
+        if precompute:
+            cs = TRACES.stats()
+            st.caption(f"Trace cache: {cs['hits']} hits · {cs['misses']} misses · {cs['size']}/{cs['max_entries']} runs")
+        if is_graph:
+            st.checkbox("Density view for large graphs", value=st.session_state.get("sb_density", False), key="sb_density")
         speed = st.slider("Speed (sec/step)", 0.2, 2.5, st.session_state.get("sb_speed", 0.8), 0.1, key="sb_speed")
 
         st.markdown('<div class="sb-sec">Algorithm Controls</div>', unsafe_allow_html=True)
@@ -81,6 +115,10 @@ def render_sidebar():
         next_clicked = c1.button("Next", key="sb_next", use_container_width=True)
         back_clicked = c2.button("Back", key="sb_back", use_container_width=True)
         reset_clicked = c3.button("Reset", key="sb_reset", use_container_width=True)
+        c4, c5 = st.columns([1, 2])
+        c4.number_input("Steps", min_value=1, value=st.session_state.get("sb_ff_n", 10), step=1, key="sb_ff_n", label_visibility="collapsed")
+        c5.button("Fast-forward N", key="sb_ff", use_container_width=True)
+        st.button("Run to end", key="sb_end", use_container_width=True)
 
         st.markdown('<div class="sb-sec">Export</div>', unsafe_allow_html=True)
         fmt = st.selectbox(
@@ -94,4 +132,41 @@ def render_sidebar():
         return (
             category, algorithm, source, st.session_state.get("sb_sample",""),
             fmt, fps, next_clicked, back_clicked, reset_clicked, export_clicked
-        )
\ No newline at end of file
+        )
+
+def _on_scrub(ns):
+    st.session_state[f"{ns}_seek"] = int(st.session_state[f"{ns}_scrub"])
+
+def _on_goto(ns):
+    st.session_state[f"{ns}_seek"] = int(st.session_state[f"{ns}_goto_step"])
+
+def render_step_scrubber(ns, total, pos):
+    with st.sidebar:
+        st.markdown('<div class="sb-sec">Step Scrubber</div>', unsafe_allow_html=True)
+        if total > 1:
+            # widget follows the cursor unless the user just dragged it
+            st.session_state[f"{ns}_scrub"] = min(pos, total - 1)
+            st.slider("Step", 0, total - 1, key=f"{ns}_scrub", on_change=_on_scrub, args=(ns,))
+        c1, c2 = st.columns([2, 1])
+        c1.number_input("Go to step", min_value=0, step=1, key=f"{ns}_goto_step", label_visibility="collapsed")
+        c2.button("Go", key=f"{ns}_btn_goto", on_click=_on_goto, args=(ns,), use_container_width=True)
+
+def _kb(n):
+    return f"{n / 1024:,.1f} KB"
+
+def render_debug_panel(ns):
+    hist = st.session_state.get(f"{ns}_hist")
+    if hist is None:
+        return
+    hs = hist.stats()
+    cs = TRACES.stats()
+    ls = LAYOUTS.stats()
+    ps = APSP.stats()
+    budget = "unlimited (shared trace)" if hs["budget_bytes"] is None else _kb(hs["budget_bytes"])
+    with st.sidebar.expander("Debug"):
+        st.caption(f"History: {hs['steps']} steps, {hs['keyframes']} keyframes")
+        st.caption(f"In memory: {_kb(hs['memory_bytes'])} of {budget}")
+        st.caption(f"Spilled to disk: {hs['spilled_segments']} segments, {_kb(hs['spilled_bytes'])}")
+        st.caption(f"Trace cache: {cs['size']}/{cs['max_entries']} runs ({_kb(cs['bytes'])} of {_kb(cs['max_bytes'])}), {cs['hits']} hits, {cs['misses']} misses, {cs['evictions']} evicted")
+        st.caption(f"Layout cache: {ls['size']}/{ls['max_entries']} graphs ({_kb(ls['bytes'])}), {ls['hits']} hits, {ls['misses']} misses, {ls['evictions']} evicted")
+        st.caption(f"All-pairs cache: {ps['size']}/{ps['max_entries']} graphs ({_kb(ps['bytes'])} of {_kb(ps['max_bytes'])}), {ps['hits']} hits, {ps['misses']} misses, {ps['evictions']} evicted")
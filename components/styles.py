@@ -181,6 +181,60 @@ def load_custom_css():
         margin-top:1.25rem;
       }
       
+      .heap-panel{
+        margin-top:0.75rem;
+        padding:0.75rem;
+        background:rgba(99,102,241,.05);
+        border:1px solid rgba(99,102,241,.2);
+        border-radius:12px;
+      }
+
+      .heap-level{
+        display:flex;
+        justify-content:center;
+        flex-wrap:wrap;
+        gap:0.5rem;
+        margin-bottom:0.5rem;
+      }
+
+      .heap-node{
+        display:inline-flex;
+        flex-direction:column;
+        align-items:center;
+        min-width:3rem;
+        padding:0.3rem 0.5rem;
+        border-radius:8px;
+        background:rgba(99,102,241,.15);
+        border:1px solid rgba(99,102,241,.35);
+        font-size:0.75rem;
+        color:var(--text-secondary);
+      }
+
+      .heap-node b{
+        font-size:0.95rem;
+        color:var(--text-primary);
+      }
+
+      .apsp-path{
+        display:flex;
+        flex-wrap:wrap;
+        align-items:center;
+        gap:0.35rem;
+        margin-top:0.5rem;
+        padding:0.6rem 0.75rem;
+        background:rgba(52,211,153,.06);
+        border:1px solid rgba(52,211,153,.25);
+        border-radius:12px;
+        color:var(--text-secondary);
+      }
+
+      .apsp-path b{
+        padding:0.15rem 0.45rem;
+        border-radius:6px;
+        background:rgba(52,211,153,.15);
+        color:var(--text-primary);
+      }
+
       .pill{
         background:linear-gradient(135deg,rgba(99,102,241,.12) 0%,rgba(139,92,246,.08) 100%);
         border:1px solid rgba(99,102,241,.3);
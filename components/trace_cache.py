@@ -0,0 +1,54 @@
+import hashlib
+import os
+import numpy as np
+from components.history import StepHistory
+from components.lru import LRUCache
+
+TRACE_CACHE_SIZE = int(os.environ.get("TRACE_CACHE_SIZE", "64"))
+TRACE_CACHE_BYTES = int(float(os.environ.get("TRACE_CACHE_MB", "256")) * 2**20)
+
+
+# Content hash of an algorithm name and its sanitized input. Arrays hash by
+# dtype, shape and bytes; everything else by repr, so "1" and 1 differ.
+def trace_key(*parts):
+    h = hashlib.sha256()
+    for p in parts:
+        if isinstance(p, np.ndarray):
+            h.update(f"{p.dtype.str}{p.shape}".encode())
+            h.update(np.ascontiguousarray(p).tobytes())
+        else:
+            h.update(repr(p).encode())
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class TraceCache(LRUCache):
+    # Finished step histories shared by every session in the process. Traces
+    # are recorded without a spill budget, so the cache is bounded by their
+    # recorded size (StepHistory's memory_bytes) as well as by count; the
+    # least recently used ones are dropped first. Callers always get a fork,
+    # never the stored history itself.
+    def __init__(self, max_entries=TRACE_CACHE_SIZE, max_bytes=TRACE_CACHE_BYTES):
+        super().__init__(max_entries, max_bytes, lambda hist: hist.stats()["memory_bytes"])
+
+    def get(self, key):
+        hist = super().get(key)
+        return None if hist is None else hist.fork()
+
+    def put(self, key, hist):
+        return super().put(key, hist.fork())
+
+    # Cached history for key, or record every state yielded by run() (an
+    # engine run_* generator) into a new one and cache that. tails is passed
+    # on to StepHistory.
+    def trace(self, key, run, tails=()):
+        hist = self.get(key)
+        if hist is None:
+            hist = StepHistory(budget=None, tails=tails)
+            for state in run():
+                hist.append(state)
+            self.put(key, hist)
+        return hist
+
+
+TRACES = TraceCache()